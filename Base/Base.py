@@ -1,6 +1,6 @@
 import os
-import threading
 import traceback
+from types import MappingProxyType
 
 import rapidjson as json
 from rich import print
@@ -8,6 +8,7 @@ from PyQt5.QtCore import Qt
 from qfluentwidgets import InfoBar
 from qfluentwidgets import InfoBarPosition
 
+from Base.ConfigStore import ConfigStore
 from Base.EventManager import EventManager
 
 # 事件列表
@@ -44,6 +45,7 @@ class Event():
 
     TERM_EXTRACTION_START = 830                  # 术语提取开始
     TERM_EXTRACTION_DONE = 831                     
+    TERM_EXTRACTION_UPDATE = 834                 # 术语提取进度更新
 
     TERM_TRANSLATE_SAVE_START = 832              # 实体提取开始
     TERM_TRANSLATE_SAVE_DONE = 833 
@@ -75,12 +77,12 @@ class Base():
     # 状态列表
     STATUS = Status()
 
+    # 高频事件，送往界面前合并为一次更新
+    COALESCED_EVENTS = frozenset({Event.TASK_UPDATE, Event.TERM_EXTRACTION_UPDATE})
+
     # 配置文件路径
     CONFIG_PATH = os.path.join(".", "Resource", "config.json")
 
-    # 类线程锁
-    CONFIG_FILE_LOCK = threading.Lock()
-
     # 多语言界面配置信息 (类变量)
     multilingual_interface_dict = {}
 
@@ -107,9 +109,6 @@ class Base():
         # 默认配置
         self.default = {}
 
-        # 获取事件管理器单例
-        self.event_manager_singleton = EventManager()
-
         # 类变量
         Base.work_status = Base.STATUS.IDLE if not hasattr(Base, "work_status") else Base.work_status
 
@@ -232,48 +231,31 @@ class Base():
             isClosable = True,
         )
 
-    # 载入配置文件
+    # 载入配置文件，返回可修改的副本
     def load_config(self) -> dict:
-        config = {}
+        return self.load_config_with_version()[0]
 
-        with Base.CONFIG_FILE_LOCK:
-            if os.path.exists(Base.CONFIG_PATH):
-                with open(Base.CONFIG_PATH, "r", encoding = "utf-8") as reader:
-                    config = json.load(reader)
-            else:
-                self.warning("配置文件不存在 ...")
+    # 载入配置文件，返回可修改的副本与其对应的配置版本号
+    def load_config_with_version(self) -> tuple[dict, int]:
+        store = ConfigStore.get(Base.CONFIG_PATH)
+        config, version = store.load_with_version()
+        if not store.exists():
+            self.warning("配置文件不存在 ...")
+            return {}, version
 
-        return config
+        return config, version
 
-    # 保存配置文件
-    def save_config(self, new: dict) -> None:
-        old = {}
-
-        # 读取配置文件
-        with Base.CONFIG_FILE_LOCK:
-            if os.path.exists(Base.CONFIG_PATH):
-                with open(Base.CONFIG_PATH, "r", encoding = "utf-8") as reader:
-                    old = json.load(reader)
-
-        # 对比新旧数据是否一致，一致则跳过后续步骤
-        # 当字典中包含子字典或子列表时，使用 == 运算符仍然可以进行比较
-        # Python 会递归地比较所有嵌套的结构，确保每个层次的键值对都相等
-        if old == new:
-            return old
-
-        # 更新配置数据
-        for k, v in new.items():
-            if k not in old.keys():
-                old[k] = v
-            else:
-                old[k] = new[k]
+    # 获取配置的只读快照，不读取磁盘，适合只读取配置项的高频路径
+    def get_config_snapshot(self) -> MappingProxyType:
+        return ConfigStore.get(Base.CONFIG_PATH).get_snapshot()
 
-        # 写入配置文件
-        with Base.CONFIG_FILE_LOCK:
-            with open(Base.CONFIG_PATH, "w", encoding = "utf-8") as writer:
-                writer.write(json.dumps(old, indent = 4, ensure_ascii = False))
+    # 获取配置的版本号，配置变化后递增，可用于判断依赖配置的缓存是否失效
+    def get_config_version(self) -> int:
+        return ConfigStore.get(Base.CONFIG_PATH).get_version()
 
-        return old
+    # 保存配置文件
+    def save_config(self, new: dict) -> dict:
+        return ConfigStore.get(Base.CONFIG_PATH).save(new)
 
     # 更新合并配置
     def fill_config(self, old: dict, new: dict) -> dict:
@@ -311,11 +293,11 @@ class Base():
 
     # 触发事件
     def emit(self, event: int, data: dict) -> None:
-        EventManager.get_singleton().emit(event, data)
+        EventManager.get_singleton().emit(event, data, event in Base.COALESCED_EVENTS)
 
-    # 订阅事件
-    def subscribe(self, event: int, hanlder: callable) -> None:
-        EventManager.get_singleton().subscribe(event, hanlder)
+    # 订阅事件，默认在 Qt 主线程中处理，不涉及界面的订阅者可以指定 EventManager.DISPATCH_SYNC 或 DISPATCH_WORKER
+    def subscribe(self, event: int, hanlder: callable, dispatch: str = EventManager.DISPATCH_QT) -> None:
+        EventManager.get_singleton().subscribe(event, hanlder, dispatch)
 
     # 取消订阅事件
     def unsubscribe(self, event: int, hanlder: callable) -> None:
@@ -0,0 +1,145 @@
+import os
+import time
+import threading
+from types import MappingProxyType
+
+import rapidjson as json
+
+
+class ConfigStore:
+    """
+    配置文件的内存快照
+    只在文件的修改时间或大小变化、或者通过本类保存后才重新解析，读取快照不需要加锁
+    检查文件状态有最小间隔，间隔内的读取直接返回快照，载入与保存时总是检查
+    每次快照内容变化时版本号加一，依赖配置的缓存可以通过版本号判断是否需要重建
+    """
+
+    # 每个配置文件路径对应一个实例
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    # 两次检查文件状态的最小间隔（s）
+    REFRESH_INTERVAL = 1.0
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+
+        # 当前快照对应的文件状态 (修改时间, 大小)，文件不存在时为 None
+        self.stat_key = None
+        self.text = "{}"
+        self.snapshot = MappingProxyType({})
+        self.version = 0
+
+        # 上次检查文件状态的时间
+        self.checked_at = None
+
+    # 获取路径对应的实例
+    def get(path: str) -> "ConfigStore":
+        store = ConfigStore._instances.get(path)
+        if store is None:
+            with ConfigStore._instances_lock:
+                store = ConfigStore._instances.setdefault(path, ConfigStore(path))
+        return store
+
+    # 文件当前状态，不存在时返回 None
+    def get_stat_key(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    # 递归转换为只读结构
+    def freeze(self, value):
+        if isinstance(value, dict):
+            return MappingProxyType({k: self.freeze(v) for k, v in value.items()})
+        elif isinstance(value, list):
+            return tuple(self.freeze(v) for v in value)
+        else:
+            return value
+
+    # 更新快照，调用时需持有锁
+    def update_snapshot(self, text: str, data: dict, stat_key: tuple[int, int] | None) -> None:
+        self.text = text
+        self.snapshot = self.freeze(data)
+        self.stat_key = stat_key
+        self.version = self.version + 1
+
+    # 文件在外部被修改时重新读取，force 为 False 时距上次检查不足最小间隔则跳过
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and self.checked_at is not None and now - self.checked_at < self.REFRESH_INTERVAL:
+            return
+        self.checked_at = now
+
+        stat_key = self.get_stat_key()
+        if stat_key == self.stat_key:
+            return
+
+        with self.lock:
+            stat_key = self.get_stat_key()
+            if stat_key == self.stat_key:
+                return
+
+            if stat_key is None:
+                self.update_snapshot("{}", {}, None)
+            else:
+                with open(self.path, "r", encoding = "utf-8") as reader:
+                    text = reader.read()
+                self.update_snapshot(text, json.loads(text), stat_key)
+
+    # 配置文件是否存在
+    def exists(self) -> bool:
+        self.refresh()
+        return self.stat_key is not None
+
+    # 获取只读快照
+    def get_snapshot(self) -> MappingProxyType:
+        self.refresh()
+        return self.snapshot
+
+    # 获取快照版本号
+    def get_version(self) -> int:
+        self.refresh()
+        return self.version
+
+    # 获取可修改的配置副本
+    def load(self) -> dict:
+        return self.load_with_version()[0]
+
+    # 获取可修改的配置副本与其对应的版本号
+    def load_with_version(self) -> tuple[dict, int]:
+        self.refresh(force = True)
+        with self.lock:
+            return json.loads(self.text), self.version
+
+    # 合并并保存配置，写入临时文件后替换，避免写入中断时损坏配置文件
+    def save(self, new: dict) -> dict:
+        self.refresh(force = True)
+
+        with self.lock:
+            old = json.loads(self.text)
+
+            # 对比新旧数据是否一致，一致则跳过后续步骤
+            if old == new:
+                return old
+
+            # 更新配置数据
+            old.update(new)
+
+            text = json.dumps(old, indent = 4, ensure_ascii = False)
+            temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "w", encoding = "utf-8") as writer:
+                    writer.write(text)
+                    writer.flush()
+                    os.fsync(writer.fileno())
+                os.replace(temp_path, self.path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+            self.update_snapshot(text, json.loads(text), self.get_stat_key())
+
+        return old
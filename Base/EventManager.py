@@ -1,47 +1,138 @@
+import queue
+import threading
+
 from PyQt5.QtCore import Qt
 from PyQt5.QtCore import QObject
+from PyQt5.QtCore import QCoreApplication
 from PyQt5.QtCore import pyqtSignal
 
 class EventManager(QObject):
+    """
+    进程内唯一的事件总线
+    界面订阅者经由排队连接在 Qt 主线程中处理，核心模块的订阅者可以选择在触发事件的线程中同步处理或交给后台线程处理，不经过 Qt 事件循环
+    高频事件在送往 Qt 主线程前合并，同一事件最多只有一次排队中的派发，派发时使用合并后的数据
+    """
+
+    # 派发方式
+    DISPATCH_QT = "qt"              # 在 Qt 主线程中处理，适用于界面
+    DISPATCH_SYNC = "sync"          # 在触发事件的线程中立即处理
+    DISPATCH_WORKER = "worker"      # 在后台线程中按顺序处理
 
     # 单一实例
     _singleton = None
+    _singleton_lock = threading.Lock()
 
     # 自定义信号
     # 字典类型或者其他复杂对象应该使用 object 作为信号参数类型，这样可以传递任意 Python 对象，包括 dict
     signal = pyqtSignal(int, object)
 
-    # 事件列表
-    event_callbacks = {}
+    # 合并事件的占位数据，Qt 主线程收到后再取出合并后的数据
+    _COALESCED = object()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.signal.connect(self.process_event, Qt.QueuedConnection)
 
+        # 事件列表，元素为 (处理函数, 派发方式)
+        self.event_callbacks = {}
+        self.lock = threading.Lock()
+
+        # 等待送往 Qt 主线程的合并数据
+        self.pending_data = {}
+
+        # 后台派发线程，首次使用时启动
+        self.worker_queue = None
+
     # 获取单例
     def get_singleton():
-        if EventManager._singleton == None:
-            EventManager._singleton = EventManager()
+        if EventManager._singleton is None:
+            with EventManager._singleton_lock:
+                if EventManager._singleton is None:
+                    singleton = EventManager()
+
+                    # 在子线程中首次创建时，需要移动到主线程，排队连接才能在主线程中处理
+                    app = QCoreApplication.instance()
+                    if app is not None and singleton.thread() != app.thread():
+                        singleton.moveToThread(app.thread())
+
+                    EventManager._singleton = singleton
 
         return EventManager._singleton
 
-    # 处理事件
+    # 获取事件的订阅者
+    def get_callbacks(self, event: int) -> list[tuple[callable, str]]:
+        with self.lock:
+            return list(self.event_callbacks.get(event, ()))
+
+    # 处理事件，在 Qt 主线程中执行
     def process_event(self, event: int, data: dict):
-        if event in self.event_callbacks:
-            for hanlder in self.event_callbacks[event]:
+        if data is EventManager._COALESCED:
+            with self.lock:
+                data = self.pending_data.pop(event, {})
+
+        for hanlder, dispatch in self.get_callbacks(event):
+            if dispatch == EventManager.DISPATCH_QT:
+                hanlder(event, data)
+
+    # 触发事件，coalesce 为真时，尚未送达 Qt 主线程的同一事件会合并为一次派发
+    def emit(self, event: int, data: dict, coalesce: bool = False):
+        has_qt_callbacks = False
+        for hanlder, dispatch in self.get_callbacks(event):
+            if dispatch == EventManager.DISPATCH_SYNC:
                 hanlder(event, data)
+            elif dispatch == EventManager.DISPATCH_WORKER:
+                self.get_worker_queue().put((hanlder, event, data))
+            else:
+                has_qt_callbacks = True
+
+        # 没有界面订阅者时不经过 Qt 事件循环
+        if not has_qt_callbacks:
+            return
 
-    # 触发事件
-    def emit(self, event: int, data: dict):
-        self.signal.emit(event, data)
+        if coalesce:
+            with self.lock:
+                pending = self.pending_data.get(event)
+                if pending is not None:
+                    pending.update(data)
+                    return
+                self.pending_data[event] = dict(data)
+            self.signal.emit(event, EventManager._COALESCED)
+        else:
+            self.signal.emit(event, data)
 
     # 订阅事件
-    def subscribe(self, event: int, hanlder: callable):
-        if event not in self.event_callbacks:
-            self.event_callbacks[event] = []
-        self.event_callbacks[event].append(hanlder)
+    def subscribe(self, event: int, hanlder: callable, dispatch: str = DISPATCH_QT):
+        with self.lock:
+            if event not in self.event_callbacks:
+                self.event_callbacks[event] = []
+            self.event_callbacks[event].append((hanlder, dispatch))
 
     # 取消订阅事件
     def unsubscribe(self, event: int, hanlder: callable):
-        if event in self.event_callbacks:
-            self.event_callbacks[event].remove(hanlder)
+        with self.lock:
+            callbacks = self.event_callbacks.get(event)
+            if callbacks is None:
+                return
+            for i, (callback, _) in enumerate(callbacks):
+                if callback == hanlder:
+                    del callbacks[i]
+                    break
+
+    # 获取后台派发队列
+    def get_worker_queue(self) -> queue.SimpleQueue:
+        if self.worker_queue is None:
+            with self.lock:
+                if self.worker_queue is None:
+                    worker_queue = queue.SimpleQueue()
+                    threading.Thread(target = self.worker_loop, args = (worker_queue,), daemon = True).start()
+                    self.worker_queue = worker_queue
+        return self.worker_queue
+
+    # 后台派发线程
+    def worker_loop(self, worker_queue: queue.SimpleQueue):
+        while True:
+            hanlder, event, data = worker_queue.get()
+            try:
+                hanlder(event, data)
+            except Exception as e:
+                print(f"[EventManager] 事件 {event} 处理失败: {e}")
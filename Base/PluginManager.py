@@ -5,11 +5,17 @@ from PluginScripts.PluginBase import PluginBase
 
 class PluginManager:
 
+    # 支持将各插件的逐条目过滤合并为一次遍历的事件
+    ITEM_FILTER_EVENTS = frozenset({"text_filter"})
+
     def __init__(self):
 
         # 使用字典来存储每个事件对应的插件列表
         self.event_plugins = {}
 
+        # 按优先级排好序的插件列表，加载插件时失效
+        self.sorted_event_plugins = {}
+
         # 记录每个插件的启用状态
         self.plugins_enable = {}
 
@@ -17,32 +23,80 @@ class PluginManager:
         plugin_instance = plugin_class()
         plugin_instance.load()
 
-        # 注册插件到所有它感兴趣的事件，但不进行排序
+        # 注册插件到所有它感兴趣的事件，排序在首次触发事件时进行并缓存
         for event_info in plugin_instance.events:
             event_name = event_info['event']
             if event_name not in self.event_plugins:
                 self.event_plugins[event_name] = []
             self.event_plugins[event_name].append(plugin_instance)
+            self.sorted_event_plugins.pop(event_name, None)
 
     def unload_plugin(self, plugin_instance):
         pass
 
-    def broadcast_event(self, event_name, config=None, event_data=None):
-        # 只触发注册了该事件的插件，并在调用前进行排序
-        if event_name in self.event_plugins:
-            # 根据优先级进行排序
+    # 获取按优先级排序的插件列表
+    def get_sorted_plugins(self, event_name) -> list:
+        sorted_plugins = self.sorted_event_plugins.get(event_name)
+        if sorted_plugins is None:
             sorted_plugins = sorted(
-                self.event_plugins[event_name],
+                self.event_plugins.get(event_name, []),
                 key=lambda x: next((event['priority'] for event in x.events if event['event'] == event_name), 0),
                 reverse=True
             )
+            self.sorted_event_plugins[event_name] = sorted_plugins
+        return sorted_plugins
 
+    def broadcast_event(self, event_name, config=None, event_data=None):
+        # 只触发注册了该事件的插件
+        if event_name in self.event_plugins:
             # 根据启用状态进行过滤，默认为启用
-            sorted_plugins = [plugin for plugin in sorted_plugins if self.plugins_enable.get(plugin.name, True)]
+            sorted_plugins = [plugin for plugin in self.get_sorted_plugins(event_name) if self.plugins_enable.get(plugin.name, True)]
 
             #print(sorted_plugins) #bug用
-            for plugin in sorted_plugins:
+            if event_name in self.ITEM_FILTER_EVENTS:
+                self.run_item_filters(event_name, config, event_data, sorted_plugins)
+            else:
+                for plugin in sorted_plugins:
+                    plugin.on_event(event_name, config, event_data)
+
+    # 按优先级执行插件，相邻的提供逐条目过滤函数的插件合并为一次遍历
+    def run_item_filters(self, event_name, config, event_data, sorted_plugins):
+        pending = []
+        for plugin in sorted_plugins:
+            item_filter = plugin.get_item_filter(event_name, config, event_data)
+            if item_filter is not None:
+                pending.append((plugin, item_filter))
+            else:
+                # 不支持逐条目过滤的插件需要等前面的过滤全部完成后再执行
+                self.run_fused_item_filters(event_name, config, event_data, pending)
+                pending = []
                 plugin.on_event(event_name, config, event_data)
+        self.run_fused_item_filters(event_name, config, event_data, pending)
+
+    # 一次遍历所有条目，每个条目按插件优先级依次经过各插件的过滤函数
+    def run_fused_item_filters(self, event_name, config, event_data, pending):
+        if not pending:
+            return
+
+        for file in event_data.files.values():
+            file_filters = [
+                file_filter for file_filter in (item_filter(file) for _, item_filter in pending)
+                if file_filter is not None
+            ]
+            if not file_filters:
+                continue
+
+            if len(file_filters) == 1:
+                file_filter = file_filters[0]
+                for item in file.items:
+                    file_filter(item)
+            else:
+                for item in file.items:
+                    for file_filter in file_filters:
+                        file_filter(item)
+
+        for plugin, _ in pending:
+            plugin.on_item_filter_finished(event_name, config, event_data)
 
     def load_plugins_from_directory(self, directory):
         directory_path = Path(directory)
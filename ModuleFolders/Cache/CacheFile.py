@@ -1,10 +1,12 @@
 import os
+import weakref
+from collections import Counter
 from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any
 
 from ModuleFolders.Cache.BaseCache import ExtraMixin, ThreadSafeCache
-from ModuleFolders.Cache.CacheItem import CacheItem
+from ModuleFolders.Cache.CacheItem import STATUS_COUNT_LOCK, CacheItem
 
 
 @dataclass(repr=False)
@@ -44,7 +46,20 @@ class CacheFile(ThreadSafeCache, ExtraMixin):
         with self._lock:
             if hasattr(self, "items_dict"):
                 del self.items_dict
-            self.items.append(item)
+            with STATUS_COUNT_LOCK:
+                self.items.append(item)
+                # 计数有效时增量更新，避免下次查询时重建
+                if self.__dict__.get("_status_counts_items") is self.items and self._status_counts_size == len(self.items) - 1:
+                    item._status_owner = weakref.ref(self)
+                    self._status_counts[item.translation_status] += 1
+                    self._status_counts_size += 1
+
+    def __getstate__(self) -> dict:
+        # 状态计数依赖条目指向本文件的引用，副本的条目不再指向原文件，由副本在首次查询时重建计数
+        state = self.__dict__.copy()
+        for name in ("_status_counts", "_status_counts_items", "_status_counts_size"):
+            state.pop(name, None)
+        return state
 
     def get_item(self, text_index: int) -> CacheItem:
         """线程安全获取缓存项"""
@@ -59,5 +74,47 @@ class CacheFile(ThreadSafeCache, ExtraMixin):
     def index_of(self, text_index):
         return self.items_index_dict[text_index]
 
+    def count_items(self, status=None) -> int:
+        """获取条目数量，按状态获取时使用状态计数，不再遍历条目"""
+        if status is None:
+            return len(self.items)
+        with STATUS_COUNT_LOCK:
+            return self._get_status_counts()[status]
+
+    def on_item_status_changed(self, old, new) -> None:
+        """由条目的状态描述符调用，调用时已持有状态计数锁"""
+        counts = self.__dict__.get("_status_counts")
+        if counts is None:
+            return
+        counts[old] -= 1
+        counts[new] += 1
+
+    def check_status_counts(self) -> bool:
+        """将状态计数与完整遍历的结果对比，不一致时重建计数并返回 False"""
+        with STATUS_COUNT_LOCK:
+            counts = +self._get_status_counts()
+            actual = Counter(item.translation_status for item in self.items)
+            if counts == actual:
+                return True
+            self._build_status_counts()
+            return False
+
+    def _get_status_counts(self) -> Counter:
+        # items 列表被整体替换或直接增删过条目时重建计数
+        items = self.items
+        if self.__dict__.get("_status_counts_items") is not items or self.__dict__.get("_status_counts_size") != len(items):
+            self._build_status_counts()
+        return self._status_counts
+
+    def _build_status_counts(self) -> None:
+        owner_ref = weakref.ref(self)
+        counts = Counter()
+        for item in self.items:
+            item._status_owner = owner_ref
+            counts[item.translation_status] += 1
+        self._status_counts = counts
+        self._status_counts_items = self.items
+        self._status_counts_size = len(self.items)
+
     def _extra(self) -> dict[str, Any]:
         return self.extra
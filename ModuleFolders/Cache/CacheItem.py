@@ -1,10 +1,9 @@
+import threading
 from dataclasses import dataclass, field
-from functools import cache
 from typing import Any
 
-import tiktoken
-
 from ModuleFolders.Cache.BaseCache import ExtraMixin, ThreadSafeCache
+from ModuleFolders.RequestLimiter import TokenCounter
 
 
 class TranslationStatus:
@@ -14,10 +13,38 @@ class TranslationStatus:
     EXCLUDED = 7  # 已排除
 
 
+# 状态计数锁，状态写入与所属文件计数的更新在同一个锁内完成
+STATUS_COUNT_LOCK = threading.Lock()
+
+
+class TranslationStatusField:
+    """translation_status 描述符，状态变化时同步更新所属文件的状态计数"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            # dataclass 通过此处获取字段默认值
+            return TranslationStatus.UNTRANSLATED
+        return obj.__dict__.get(self.name, TranslationStatus.UNTRANSLATED)
+
+    def __set__(self, obj, value):
+        with STATUS_COUNT_LOCK:
+            attrs = obj.__dict__
+            old = attrs.get(self.name)
+            attrs[self.name] = value
+            owner_ref = attrs.get("_status_owner")
+            if owner_ref is not None and old != value:
+                owner = owner_ref()
+                if owner is not None:
+                    owner.on_item_status_changed(old, value)
+
+
 @dataclass(repr=False)
 class CacheItem(ThreadSafeCache, ExtraMixin):
     text_index: int = 0
-    translation_status: int = 0
+    translation_status: int = TranslationStatusField()
     model: str = ''
     source_text: str = ''
     translated_text: str = None
@@ -41,6 +68,12 @@ class CacheItem(ThreadSafeCache, ExtraMixin):
             self.polished_text = ""
 
 
+    def __getstate__(self) -> dict:
+        # 所属文件的引用不参与复制与序列化，副本修改状态时不会影响原文件的计数
+        state = self.__dict__.copy()
+        state.pop("_status_owner", None)
+        return state
+
     @property
     def final_text(self) -> str:
         """
@@ -53,13 +86,27 @@ class CacheItem(ThreadSafeCache, ExtraMixin):
         return self.polished_text or self.translated_text or self.source_text
     
     @property
-    def token_count(self):
-        return self.get_token_count(self.source_text)
+    def token_count(self) -> int:
+        """原文的 Token 数量，只计算一次，原文变化后自动重新计算"""
+        attrs = self.__dict__
+        if attrs.get("_token_count_text") is not self.source_text:
+            self.compute_token_counts([self])
+        return attrs["_token_count"]
 
     @classmethod
-    @cache
     def get_token_count(cls, text) -> int:
-        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+        return TokenCounter.count_tokens(text)
+
+    @classmethod
+    def compute_token_counts(cls, items: list["CacheItem"]) -> None:
+        """批量计算条目原文的 Token 数量，已计算且原文未变化的条目会被跳过"""
+        pending = [item for item in items if item.__dict__.get("_token_count_text") is not item.source_text]
+        if not pending:
+            return
+        texts = [item.source_text for item in pending]
+        for item, text, tokens in zip(pending, texts, TokenCounter.count_tokens_batch(texts)):
+            item._token_count = tokens
+            item._token_count_text = text
 
     def get_lang_code(self, default_lang=None):
         """获取语言代码，可选择使用默认值"""
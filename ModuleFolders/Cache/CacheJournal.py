@@ -0,0 +1,83 @@
+import os
+import threading
+
+import msgspec
+
+from ModuleFolders.Cache.CacheItem import CacheItem
+
+
+class CacheJournal:
+    """
+    缓存增量日志（追加写入）
+    每行为一条条目变更记录，全量快照之后的变更只追加到日志中，
+    定期或任务结束时再合并（压缩）回 AinieeCacheData.json
+    """
+
+    JOURNAL_NAME = "AinieeCacheData.journal"
+
+    # 日志中记录的条目字段
+    ITEM_FIELDS = ("translation_status", "translated_text", "polished_text", "model")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entry_count = 0
+
+    @classmethod
+    def get_journal_path(cls, cache_path: str) -> str:
+        """根据快照文件路径获取对应的日志路径"""
+        return os.path.join(os.path.dirname(cache_path), cls.JOURNAL_NAME)
+
+    @classmethod
+    def encode_item(cls, item: CacheItem) -> bytes:
+        with item.atomic_scope():
+            entry = {"text_index": item.text_index}
+            for name in cls.ITEM_FIELDS:
+                entry[name] = getattr(item, name)
+        return msgspec.json.encode(entry) + b"\n"
+
+    def append(self, journal_path: str, items: list[CacheItem]) -> int:
+        """追加条目变更，返回写入的记录数"""
+        if not items:
+            return 0
+        content_bytes = b"".join(self.encode_item(item) for item in items)
+        with self.lock:
+            with open(journal_path, "ab") as writer:
+                writer.write(content_bytes)
+                writer.flush()
+                os.fsync(writer.fileno())
+            self.entry_count += len(items)
+        return len(items)
+
+    def truncate(self, journal_path: str) -> None:
+        """全量快照写入完成后清空日志"""
+        with self.lock:
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+            self.entry_count = 0
+
+    @classmethod
+    def replay(cls, journal_path: str, items_by_index: dict[int, CacheItem]) -> int:
+        """将日志中的变更重放到条目上，返回成功应用的记录数"""
+        if not os.path.isfile(journal_path):
+            return 0
+
+        applied = 0
+        with open(journal_path, "rb") as reader:
+            for line in reader:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = msgspec.json.decode(line)
+                except msgspec.DecodeError:
+                    # 崩溃时最后一行可能只写入了一半，直接跳过
+                    continue
+                item = items_by_index.get(entry.get("text_index"))
+                if item is None:
+                    continue
+                with item.atomic_scope():
+                    for name in cls.ITEM_FIELDS:
+                        if name in entry:
+                            setattr(item, name, entry[name])
+                applied += 1
+        return applied
@@ -1,18 +1,23 @@
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+import itertools
 import os
 import re
 import threading
 import time
 from dataclasses import fields
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Tuple
 
 import msgspec
 import rapidjson as json
 
 from Base.Base import Base
+from Base.EventManager import EventManager
 from ModuleFolders.TaskConfig.TaskType import TaskType
 from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.Cache.CacheJournal import CacheJournal
+from ModuleFolders.Cache.CacheSearchIndex import CacheSearchIndex
+from ModuleFolders.Cache.CacheStore import SqliteCacheStore
 from ModuleFolders.Cache.CacheProject import (
     CacheProject,
     CacheProjectStatistics
@@ -21,6 +26,8 @@ from ModuleFolders.Cache.CacheProject import (
 
 class CacheManager(Base):
     SAVE_INTERVAL = 8  # 缓存保存间隔（秒）
+    JOURNAL_COMPACT_THRESHOLD = 50000  # 增量日志记录数超过该值时合并为全量快照
+    SEARCH_BATCH_SIZE = 2000  # 搜索时每检查该数量的条目，返回一批结果并检查是否取消
 
     def __init__(self) -> None:
         super().__init__()
@@ -28,18 +35,30 @@ class CacheManager(Base):
         # 线程锁
         self.file_lock = threading.Lock()
         
-        # 简单的翻译缓存字典
-        self.translation_cache = {}
+        # 简单的翻译缓存字典（LRU）
+        self.translation_cache = OrderedDict()
+
+        # 增量日志，以及等待写入日志的变更条目
+        self.journal = CacheJournal()
+        self.journal_lock = threading.Lock()
+        self.journal_items = {}
+        self.journal_snapshot_path = None  # 本次运行写入过的全量快照路径，之后的变更才能只写日志
+
+        # SQLite 存储后端，仅在开启对应配置时使用
+        self.store = None
+        self.store_synced = False  # 数据库内容是否与内存中的项目一致，一致时查询走数据库索引
+
+        # 全文搜索索引，首次搜索时在后台建立
+        self.search_index = CacheSearchIndex()
 
         # 注册事件
         self.subscribe(Base.EVENT.TASK_START, self.start_interval_saving)
-        self.subscribe(Base.EVENT.APP_SHUT_DOWN, self.app_shut_down)
+        self.subscribe(Base.EVENT.APP_SHUT_DOWN, self.app_shut_down, EventManager.DISPATCH_SYNC)  # 关闭时事件循环可能已退出
 
     def start_interval_saving(self, event: int, data: dict):
                 # 如果是继续任务，则在开始前保存并重载缓存
         if data.get("continue_status") is True:
-            config = self.load_config()
-            output_path = config.get("label_output_path", "./output")
+            output_path = self.get_config_snapshot().get("label_output_path", "./output")
             if output_path and os.path.isdir(output_path):
                 # 强制保存当前内存中的缓存状态到磁盘，以包含编排表的修改
                if hasattr(self, "project"): #判断内容是否变化                
@@ -49,6 +68,10 @@ class CacheManager(Base):
                 # 从磁盘重载缓存，确保后续任务基于最新的状态
                 self.load_from_file(output_path)
         
+        # 新任务开始后先写一次全量快照，以包含插件等对缓存的批量修改
+        self.journal_snapshot_path = None
+        self.store_synced = False
+
         # 定时器
         self.save_to_file_stop_flag = False
         threading.Thread(target=self.save_to_file_tick, daemon=True).start()
@@ -77,51 +100,166 @@ class CacheManager(Base):
             }
         }
         """
+        if self.is_sqlite_backend():
+            self.save_to_store()
+            return
+
         cache_dir = os.path.join(self.save_to_file_require_path, "cache")
         path = os.path.join(cache_dir, "AinieeCacheData.json")
+
+        with self.file_lock:
+            # 全量快照会包含此前所有的变更，在编码前取出，之后产生的变更留给下一次日志写入
+            self.take_journal_items()
+            self.write_json_snapshot(path)
+            self.journal_snapshot_path = path
+
+            # 写入项目整体翻译状态文件
+            self.save_statistics_to_file(cache_dir)
+
+    # 将整个项目写入 json 缓存文件，调用时需持有文件锁
+    def write_json_snapshot(self, path: str) -> None:
         # 定义临时文件路径，确保在同一文件系统下以支持原子性替换
         tmp_path = path + f".{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            content_bytes = msgspec.json.encode(self.project)
+
+            # 先将完整内容写入临时文件
+            with open(tmp_path, "wb") as writer:
+                writer.write(content_bytes)
+
+            # 使用原子操作替换旧文件。这能保证其他进程/线程
+            # 要么读到旧的完整文件，要么读到新的完整文件，绝不会读到一半。
+            os.replace(tmp_path, path)
+
+            # 快照已包含日志中的全部变更，清空日志
+            self.journal.truncate(CacheJournal.get_journal_path(path))
+        finally:
+            # 确保临时文件在任何情况下（包括异常）都会被清理
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # 全量写入项目到 SQLite 存储
+    def save_to_store(self) -> None:
+        cache_dir = os.path.join(self.save_to_file_require_path, "cache")
+        db_path = SqliteCacheStore.get_db_path(self.save_to_file_require_path)
 
         with self.file_lock:
+            self.take_journal_items()
+            store = self.get_store(db_path)
+            store.write_project(self.project)
+            self.store_synced = True
+            self.journal_snapshot_path = db_path
+            self.save_statistics_to_file(cache_dir)
+
+    # 获取（必要时打开）SQLite 存储
+    def get_store(self, db_path: str) -> SqliteCacheStore:
+        if self.store is None or self.store.db_path != db_path:
+            if self.store is not None:
+                self.store.close()
+            self.store = SqliteCacheStore(db_path)
+        return self.store
+
+    # 是否使用 SQLite 存储后端
+    def is_sqlite_backend(self) -> bool:
+        return self.get_config_snapshot().get("cache_storage_sqlite_switch", False)
+
+    # 获取与内存项目一致的存储，查询前先写入尚未保存的变更
+    def get_synced_store(self) -> SqliteCacheStore | None:
+        if self.store is None or not self.store_synced:
+            return None
+        self.store.update_items(self.take_journal_items())
+        return self.store
+
+    # 写入项目整体翻译状态文件
+    def save_statistics_to_file(self, cache_dir: str) -> None:
+        if self.project and self.project.stats_data:
+            total_line = self.project.stats_data.total_line # 获取需翻译总行数
+            line = self.project.stats_data.line # 获取已翻译行数
+            project_name = self.project.project_name # 获取项目名字
+            json_data = {"total_line": total_line, "line": line, "project_name": project_name}
+
+            json_path = os.path.join(cache_dir, "ProjectStatistics.json")
+            json_tmp_path = json_path + f".{os.getpid()}.tmp"
             try:
-                os.makedirs(cache_dir, exist_ok=True)
-                content_bytes = msgspec.json.encode(self.project)
-
-                # 先将完整内容写入临时文件
-                with open(tmp_path, "wb") as writer:
-                    writer.write(content_bytes)
-
-                # 使用原子操作替换旧文件。这能保证其他进程/线程
-                # 要么读到旧的完整文件，要么读到新的完整文件，绝不会读到一半。
-                os.replace(tmp_path, path)
-
-                # 写入项目整体翻译状态文件
-                if self.project and self.project.stats_data:
-                    total_line = self.project.stats_data.total_line # 获取需翻译总行数
-                    line = self.project.stats_data.line # 获取已翻译行数
-                    project_name = self.project.project_name # 获取项目名字
-                    json_data = {"total_line": total_line, "line": line, "project_name": project_name}
-
-                    json_path = os.path.join(cache_dir, "ProjectStatistics.json")
-                    json_tmp_path = json_path + f".{os.getpid()}.tmp"
-                    try:
-                        with open(json_tmp_path, "w", encoding="utf-8") as writer:
-                            json.dump(json_data, writer, ensure_ascii=False, indent=4)
-                        os.replace(json_tmp_path, json_path)
-                    finally:
-                        if os.path.exists(json_tmp_path):
-                            try:
-                                os.remove(json_tmp_path)
-                            except OSError:
-                                pass
-                else:
-                    # 如果stats_data不存在，则调用 Base 类中的 warning 方法打印警告并跳过
-                    self.warning(f"CacheManager: self.project.stats_data is None. Skipping ProjectStatistics.json update.")
+                with open(json_tmp_path, "w", encoding="utf-8") as writer:
+                    json.dump(json_data, writer, ensure_ascii=False, indent=4)
+                os.replace(json_tmp_path, json_path)
             finally:
-                # 确保临时文件在任何情况下（包括异常）都会被清理
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
+                if os.path.exists(json_tmp_path):
+                    try:
+                        os.remove(json_tmp_path)
+                    except OSError:
+                        pass
+        else:
+            # 如果stats_data不存在，则调用 Base 类中的 warning 方法打印警告并跳过
+            self.warning(f"CacheManager: self.project.stats_data is None. Skipping ProjectStatistics.json update.")
+
+    # 保存变更到文件，优先追加增量日志，必要时合并为全量快照
+    def save_changes_to_file(self) -> None:
+        cache_dir = os.path.join(self.save_to_file_require_path, "cache")
+        path = os.path.join(cache_dir, "AinieeCacheData.json")
+
+        # SQLite 存储只需更新发生变更的行
+        if self.is_sqlite_backend():
+            db_path = SqliteCacheStore.get_db_path(self.save_to_file_require_path)
+            if self.journal_snapshot_path != db_path or not self.store_synced:
+                self.save_to_store()
+                return
+            with self.file_lock:
+                self.store.update_items(self.take_journal_items())
+                self.save_statistics_to_file(cache_dir)
+            return
+
+        if self.journal_snapshot_path != path or self.journal.entry_count >= self.JOURNAL_COMPACT_THRESHOLD:
+            self.save_to_file()
+            return
+
+        with self.file_lock:
+            items = self.take_journal_items()
+            if not items:
+                return
+            try:
+                self.journal.append(CacheJournal.get_journal_path(path), items)
+            except OSError as e:
+                # 日志写入失败时退回全量保存，保证变更不丢失
+                self.warning(f"CacheManager: 增量日志写入失败，改为全量保存 ... {e}")
+                self.journal_snapshot_path = None
+            else:
+                self.save_statistics_to_file(cache_dir)
+                return
+
+        self.save_to_file()
+
+    # 记录发生变更的条目，等待写入增量日志
+    # 直接修改条目文本或状态后必须调用本方法，否则增量日志与搜索索引都不会得知该变更
+    # 插件等对整个项目的批量修改可改为在修改完成后调用 search_index.invalidate()，并由之后的全量保存写入缓存
+    def record_item_changes(self, items: list[CacheItem]) -> None:
+        with self.journal_lock:
+            for item in items:
+                self.journal_items[item.text_index] = item
+        self.search_index.mark_changed(items)
+
+    # 取出全部等待写入日志的条目
+    def take_journal_items(self) -> list[CacheItem]:
+        with self.journal_lock:
+            items = list(self.journal_items.values())
+            self.journal_items = {}
+        return items
+
+    # 任务结束时将增量日志合并为全量快照
+    def compact_to_file(self, output_path: str) -> None:
+        self.save_to_file_require_path = output_path
+        self.save_to_file_require_flag = False
 
+        # 使用 SQLite 存储时同样写出 json 缓存文件，供以缓存文件为输入的项目（Ainiee_cache）读取
+        # 先写 json 再写数据库，使数据库的写入时间不早于 json 缓存，下次加载时仍读取数据库
+        if self.is_sqlite_backend():
+            path = os.path.join(output_path, "cache", "AinieeCacheData.json")
+            with self.file_lock:
+                self.write_json_snapshot(path)
+
+        self.save_to_file()
 
     # 保存缓存到文件的定时任务
     def save_to_file_tick(self) -> None:
@@ -129,8 +267,8 @@ class CacheManager(Base):
         while not self.save_to_file_stop_flag:
             time.sleep(self.SAVE_INTERVAL)
             if getattr(self, "save_to_file_require_flag", False):
-                self.save_to_file()
                 self.save_to_file_require_flag = False
+                self.save_changes_to_file()
 
     # 请求保存缓存到文件
     def require_save_to_file(self, output_path: str) -> None:
@@ -141,14 +279,43 @@ class CacheManager(Base):
     # 从项目中加载
     def load_from_project(self, data: CacheProject):
         self.project = data
+        self.take_journal_items()
+        self.journal_snapshot_path = None
+        self.store_synced = False
 
     # 从缓存文件读取数据
     def load_from_file(self, output_path: str) -> None:
         """从文件加载数据"""
         path = os.path.join(output_path, "cache", "AinieeCacheData.json")
+        db_path = SqliteCacheStore.get_db_path(output_path)
+        use_store = self.is_sqlite_backend() and os.path.isfile(db_path)
         with self.file_lock:
+            # 关闭 SQLite 存储期间只会更新 json 缓存，数据库比 json 缓存旧时改为读取 json，之后的保存会重建数据库
+            if use_store and self.get_store(db_path).get_saved_time() < self.get_json_saved_time(path):
+                self.info("SQLite 缓存早于 json 缓存文件，改为读取 json 缓存文件 ...")
+                use_store = False
+            if use_store:
+                project = self.get_store(db_path).read_project()
+                if project is not None:
+                    self.project = project
+                    self.take_journal_items()
+                    self.journal_snapshot_path = db_path
+                    self.store_synced = True
+                    return
             if os.path.isfile(path):
                 self.project = self.read_from_file(path)
+                self.take_journal_items()
+                self.journal_snapshot_path = None
+                self.store_synced = False
+
+    # json 缓存最近一次写入的时间，包含之后追加的增量日志，不存在时返回 0
+    @staticmethod
+    def get_json_saved_time(cache_path: str) -> float:
+        saved_time = 0.0
+        for path in (cache_path, CacheJournal.get_journal_path(cache_path)):
+            if os.path.isfile(path):
+                saved_time = max(saved_time, os.path.getmtime(path))
+        return saved_time
 
     @classmethod
     def read_from_file(cls, cache_path) -> CacheProject:
@@ -156,13 +323,19 @@ class CacheManager(Base):
             content_bytes = reader.read()
         try:
             # 反序列化严格按照dataclass定义，如source_text这种非optional类型不能为None，否则反序列化失败
-            return msgspec.json.decode(content_bytes, type=CacheProject)
+            project = msgspec.json.decode(content_bytes, type=CacheProject)
         except msgspec.ValidationError:
             content = json.loads(content_bytes.decode('utf-8'))
             if isinstance(content, dict):
-                return CacheProject.from_dict(content)
+                project = CacheProject.from_dict(content)
             else:
-                return cls._read_from_old_content(content)
+                project = cls._read_from_old_content(content)
+
+        # 重放快照之后追加的增量日志
+        journal_path = CacheJournal.get_journal_path(cache_path)
+        if os.path.isfile(journal_path):
+            CacheJournal.replay(journal_path, {item.text_index: item for item in project.items_iter()})
+        return project
 
     @classmethod
     def _read_from_old_content(cls, content: list) -> CacheProject:
@@ -216,26 +389,29 @@ class CacheManager(Base):
     # 获取缓存内全部文本对数量
     def get_item_count(self) -> int:
         """获取总缓存项数量"""
+        store = self.get_synced_store()
+        if store is not None:
+            return store.count_items()
         return self.project.count_items()
 
     # 获取某翻译状态的条目数量
     def get_item_count_by_status(self, status: int) -> int:
+        store = self.get_synced_store()
+        if store is not None:
+            return store.count_items(status)
         return self.project.count_items(status)
 
     # 检测是否存在需要翻译的条目
     def get_continue_status(self) -> bool:
         """检查是否存在可继续翻译的状态"""
-        has_translated = False
-        has_untranslated = False
-        for item in self.project.items_iter():
-            status = item.translation_status
-            if status == TranslationStatus.TRANSLATED:
-                has_translated = True
-            elif status == TranslationStatus.UNTRANSLATED:
-                has_untranslated = True
-            if has_translated and has_untranslated:
-                return True
-        return has_translated and has_untranslated
+        store = self.get_synced_store()
+        if store is not None:
+            return store.has_status(TranslationStatus.TRANSLATED) and store.has_status(TranslationStatus.UNTRANSLATED)
+
+        return (
+            self.project.count_items(TranslationStatus.TRANSLATED) > 0
+            and self.project.count_items(TranslationStatus.UNTRANSLATED) > 0
+        )
 
     # 生成上文数据条目片段
     def generate_previous_chunks(self, all_items: list[CacheItem], previous_item_count: int, start_idx: int) -> List[CacheItem]:
@@ -260,29 +436,51 @@ class CacheManager(Base):
         return collected
 
     # 生成待翻译片段
-    def generate_item_chunks(self, limit_type: str, limit_count: int, previous_line_count: int, task_mode) -> \
+    def generate_item_chunks(self, limit_type: str, limit_count: int, previous_line_count: int, task_mode,
+                             item_filter: Callable[[List[CacheItem]], List[CacheItem]] = None) -> \
             Tuple[List[List[CacheItem]], List[List[CacheItem]], List[str]]:
         chunks, previous_chunks, file_paths = [], [], []
+        for chunk, previous_chunk, file_path in self.iter_item_chunks(limit_type, limit_count, previous_line_count, task_mode, item_filter):
+            chunks.append(chunk)
+            previous_chunks.append(previous_chunk)
+            file_paths.append(file_path)
+        return chunks, previous_chunks, file_paths
 
-        for file in self.project.files.values():
-            # 1. 筛选出当前任务需要的条目
-            if task_mode == TaskType.TRANSLATION:
-                items = [item for item in file.items if item.translation_status == TranslationStatus.UNTRANSLATED]
-            elif task_mode == TaskType.POLISH:
-                items = [item for item in file.items if item.translation_status == TranslationStatus.TRANSLATED]
-            else:
-                items = []
+    # 逐个生成待翻译片段，供执行器在线程空闲时按需取用
+    def iter_item_chunks(self, limit_type: str, limit_count: int, previous_line_count: int, task_mode,
+                         item_filter: Callable[[List[CacheItem]], List[CacheItem]] = None) -> \
+            Iterator[Tuple[List[CacheItem], List[CacheItem], str]]:
+        """
+        按文件逐个产出 (原文片段, 上文片段, 文件路径)，不会预先生成全部片段
+        item_filter 不为空时，在切分前对每个文件的条目进行过滤（如翻译记忆预填与去重），只切分返回的条目
+        """
+
+        # 1. 筛选出当前任务需要的条目
+        if task_mode == TaskType.TRANSLATION:
+            status = TranslationStatus.UNTRANSLATED
+        elif task_mode == TaskType.POLISH:
+            status = TranslationStatus.TRANSLATED
+        else:
+            return
+
+        for file, items in self.filter_items_by_status(status):
+            if items and item_filter is not None:
+                items = item_filter(items)
 
             if not items:
                 continue
 
+            # 按文件批量计算 Token 数量，已计算过的条目会被跳过
+            if limit_type == "token":
+                CacheItem.compute_token_counts(items)
+
             current_chunk, current_length = [], 0
             # 2. 记录当前 chunk 在 `items` 这个筛选后列表中的起始索引
             chunk_start_idx_in_filtered_list = 0
 
             # 3. 使用 enumerate 同时获取筛选后列表的索引 `i` 和条目 `item`
             for i, item in enumerate(items):
-                item_length = item.get_token_count(item.source_text) if limit_type == "token" else 1
+                item_length = item.token_count if limit_type == "token" else 1
 
                 # 当一个新 chunk 开始时，记录它的起始索引 `i`
                 if not current_chunk:
@@ -290,12 +488,12 @@ class CacheManager(Base):
 
                 # 如果当前 chunk 满了，提交它
                 if current_chunk and (current_length + item_length > limit_count):
-                    chunks.append(current_chunk)
                     # 4. 使用记录的、相对于 `items` 列表的正确索引来获取上文
-                    previous_chunks.append(
-                        self.generate_previous_chunks(items, previous_line_count, chunk_start_idx_in_filtered_list)
+                    yield (
+                        current_chunk,
+                        self.generate_previous_chunks(items, previous_line_count, chunk_start_idx_in_filtered_list),
+                        file.storage_path,
                     )
-                    file_paths.append(file.storage_path)
 
                     # 重置，为下一个 chunk 做准备
                     current_chunk, current_length = [], 0
@@ -308,15 +506,26 @@ class CacheManager(Base):
 
             # 处理循环结束后剩余的最后一个 chunk
             if current_chunk:
-                chunks.append(current_chunk)
                 # 同样使用记录的正确索引
-                previous_chunks.append(
-                    self.generate_previous_chunks(items, previous_line_count, chunk_start_idx_in_filtered_list)
+                yield (
+                    current_chunk,
+                    self.generate_previous_chunks(items, previous_line_count, chunk_start_idx_in_filtered_list),
+                    file.storage_path,
                 )
-                file_paths.append(file.storage_path)
 
-        return chunks, previous_chunks, file_paths
 
+    # 按文件筛选出某状态的条目
+    def filter_items_by_status(self, status: int):
+        store = self.get_synced_store()
+        if store is None:
+            for file in self.project.files.values():
+                yield file, [item for item in file.items if item.translation_status == status]
+            return
+
+        # 由数据库索引给出条目位置，再从内存中取出对应条目
+        for storage_path, rows in itertools.groupby(store.iter_positions_by_status(status), key=lambda row: row[0]):
+            file = self.project.get_file(storage_path)
+            yield file, [file.items[position] for _, position in rows]
 
     # 获取文件层级结构
     def get_file_hierarchy(self) -> Dict[str, List[str]]:
@@ -382,6 +591,8 @@ class CacheManager(Base):
                 else:
                     item_to_update.translation_status = TranslationStatus.POLISHED
 
+            self.record_item_changes([item_to_update])
+
     # 缓存重编排方法
     def reformat_and_splice_cache(self, file_path: str, formatted_data: dict, selected_item_indices: list[int]) -> list[CacheItem] | None:
         """
@@ -448,19 +659,28 @@ class CacheManager(Base):
             cache_file.items = final_items
             if hasattr(cache_file, "items_index_dict"):
                 del cache_file.items_index_dict # 清除旧缓存，以便重新计算
+            self.search_index.invalidate()
+
+            # 条目结构发生变化，增量日志无法表示，下次保存时写入全量快照
+            self.journal_snapshot_path = None
+            self.store_synced = False
 
             return final_items
 
     # 缓存全搜索方法
-    def search_items(self, query: str, scope: str, is_regex: bool, search_flagged: bool) -> list:
+    def search_items(self, query: str, scope: str, is_regex: bool, search_flagged: bool,
+                     cancel_event: threading.Event = None, on_results: Callable[[list], None] = None) -> list:
         """
         在整个项目中搜索条目。
+        长度足够的纯文本查询先通过 n-gram 索引筛选候选条目，其余查询逐条检查，检查过程不持有文件锁。
 
         Args:
             query (str): 搜索查询字符串。
             scope (str): 搜索范围 ('all', 'source_text', 'translated_text', 'polished_text')。
             is_regex (bool): 是否使用正则表达式。
             search_flagged (bool): 是否仅搜索被标记的行。
+            cancel_event (threading.Event): 设置后尽快结束搜索，返回已找到的结果。
+            on_results (Callable): 每找到一批结果时调用，参数为该批结果。
 
         Returns:
             list: 包含元组 (file_path, original_row_num, CacheItem) 的结果列表。
@@ -486,44 +706,87 @@ class CacheManager(Base):
             # 这里可以向UI发送一个错误提示
             return []
 
-        with self.file_lock:
-            for file_path, cache_file in self.project.files.items():
-                for item_index, item in enumerate(cache_file.items):
-                    # 如果要求搜索标记行，则先进行标记过滤
-                    if search_flagged:
-                        is_item_flagged = False
-                        if item.extra:
-                            if scope == 'translated_text':
-                                is_item_flagged = item.extra.get('language_mismatch_translation', False)
-                            elif scope == 'polished_text':
-                                is_item_flagged = item.extra.get('language_mismatch_polish', False)
-                            elif scope == 'all':
-                                is_item_flagged = (item.extra.get('language_mismatch_translation', False) or
-                                                   item.extra.get('language_mismatch_polish', False))
-                            # 对于 'source_text' 范围, is_item_flagged 保持 False, 自动跳过
-
-                        if not is_item_flagged:
-                            continue  # 如果不满足标记条件，则直接跳到下一个条目
-
-                    # 通过标记过滤后，再执行文本/正则搜索
-                    # 如果查询为空，则所有通过标记过滤的条目都匹配
-                    if not query.strip():
-                        # 仅在search_flagged为True时，空查询才有意义（即列出所有标记行）
-                        if search_flagged:
-                             results.append((file_path, item_index + 1, item))
-                        continue # 否则，空查询不匹配任何内容                    
-                    found = False
-                    for field_name in fields_to_check:
-                        text_to_check = getattr(item, field_name, None)
-                        if text_to_check and matcher(text_to_check):
-                            # (文件路径, 原始行号, 完整的CacheItem对象)
-                            results.append((file_path, item_index + 1, item))
-                            found = True
-                            break  # 找到一个匹配就跳出字段循环，避免重复添加
-                    if found:
-                        continue
+        # 纯文本查询使用索引筛选候选条目
+        has_query = bool(query.strip())
+        candidates = None
+        if not is_regex and has_query:
+            candidates = self.search_index.search(self.project, query)
+
+        if candidates is None:
+            # 使用数据库查询
+            store = self.get_synced_store()
+            if store is not None:
+                rows = store.search(query, fields_to_check, is_regex, scope if search_flagged else None)
+                with self.file_lock:
+                    for file_path, position in rows:
+                        cache_file = self.project.get_file(file_path)
+                        results.append((file_path, position + 1, cache_file.items[position]))
+                if on_results is not None and results:
+                    on_results(results)
+                return results
+
+            candidates = self.iter_search_candidates()
+
+        def is_match(item: CacheItem) -> bool:
+            # 如果要求搜索标记行，则先进行标记过滤
+            if search_flagged and not self.is_item_flagged(item, scope):
+                return False  # 如果不满足标记条件，则直接跳到下一个条目
+
+            # 通过标记过滤后，再执行文本/正则搜索
+            # 如果查询为空，则所有通过标记过滤的条目都匹配
+            if not has_query:
+                # 仅在search_flagged为True时，空查询才有意义（即列出所有标记行）
+                return search_flagged
+            for field_name in fields_to_check:
+                text_to_check = getattr(item, field_name, None)
+                if text_to_check and matcher(text_to_check):
+                    return True  # 找到一个匹配就跳出字段循环，避免重复添加
+            return False
+
+        # 分批检查候选条目，每批结束后返回结果并检查是否取消
+        for file_path, row_nums, items in candidates:
+            for start in range(0, len(items), self.SEARCH_BATCH_SIZE):
+                if cancel_event is not None and cancel_event.is_set():
+                    return results
+
+                end = start + self.SEARCH_BATCH_SIZE
+                # (文件路径, 原始行号, 完整的CacheItem对象)
+                batch = [
+                    (file_path, row_num, item)
+                    for row_num, item in zip(row_nums[start:end], items[start:end])
+                    if is_match(item)
+                ]
+                if batch:
+                    results.extend(batch)
+                    if on_results is not None:
+                        on_results(batch)
+
         return results
 
+    # 项目中的全部条目，按文件分组为 (文件路径, 行号列表, 条目列表)，文件锁只在获取文件列表时持有
+    def iter_search_candidates(self) -> list[tuple[str, range, list[CacheItem]]]:
+        with self.file_lock:
+            if self.project is None:
+                return []
+            return [
+                (file_path, range(1, len(cache_file.items) + 1), cache_file.items)
+                for file_path, cache_file in self.project.files.items()
+            ]
+
+    # 条目在搜索范围内是否被标记为语言不匹配
+    def is_item_flagged(self, item: CacheItem, scope: str) -> bool:
+        if not item.extra:
+            return False
+        if scope == 'translated_text':
+            return item.extra.get('language_mismatch_translation', False)
+        elif scope == 'polished_text':
+            return item.extra.get('language_mismatch_polish', False)
+        elif scope == 'all':
+            return (item.extra.get('language_mismatch_translation', False) or
+                    item.extra.get('language_mismatch_polish', False))
+        # 对于 'source_text' 范围, 始终为 False, 自动跳过
+        return False
+
     # 获取全部的原文与文件路径
     def get_all_source_items(self) -> list:
         """
@@ -548,17 +811,20 @@ class CacheManager(Base):
     def get_cache(self, cache_key: str) -> str:
         """获取翻译缓存"""
         with self.file_lock:
-            return self.translation_cache.get(cache_key)
+            translation = self.translation_cache.get(cache_key)
+            if translation is not None:
+                self.translation_cache.move_to_end(cache_key)
+            return translation
     
     def set_cache(self, cache_key: str, translation: str) -> None:
         """设置翻译缓存"""
         with self.file_lock:
             # 限制缓存大小，避免内存过度使用
-            if len(self.translation_cache) >= 1000:
-                # 清理最旧的缓存项
-                oldest_key = next(iter(self.translation_cache))
-                del self.translation_cache[oldest_key]
             self.translation_cache[cache_key] = translation
+            self.translation_cache.move_to_end(cache_key)
+            if len(self.translation_cache) > 1000:
+                # 清理最久未使用的缓存项
+                self.translation_cache.popitem(last=False)
     
     def clear_project(self) -> None:
         """清除当前项目的所有数据"""
@@ -569,6 +835,12 @@ class CacheManager(Base):
                 
                 # 清除翻译缓存
                 self.translation_cache.clear()
+
+                # 清除增量日志状态与搜索索引
+                self.search_index.invalidate()
+                self.journal_items = {}
+                self.journal_snapshot_path = None
+                self.store_synced = False
                 
                 # 重置保存相关标志
                 self.save_to_file_require_flag = False
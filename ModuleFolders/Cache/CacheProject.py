@@ -77,12 +77,15 @@ class CacheProject(ThreadSafeCache, ExtraMixin):
 
     def count_items(self, status=None):
         with self._lock:
-            if status is None:
-                return sum(len(file.items) for file in self.files.values())
-            else:
-                return sum(
-                    1 for item in self.items_iter() if item.translation_status == status
-                )
+            return sum(file.count_items(status) for file in self.files.values())
+
+    def check_status_counts(self) -> list[str]:
+        """校验各文件的状态计数，返回计数不一致（已重建）的文件路径"""
+        with self._lock:
+            return [
+                storage_path for storage_path, file in self.files.items()
+                if not file.check_status_counts()
+            ]
 
     @cached_property
     def file_project_types(self) -> frozenset[str]:
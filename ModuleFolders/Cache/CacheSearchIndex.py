@@ -0,0 +1,203 @@
+import itertools
+import threading
+from array import array
+from collections import defaultdict
+from operator import itemgetter
+
+from ModuleFolders.Cache.CacheItem import CacheItem
+from ModuleFolders.Cache.CacheProject import CacheProject
+
+
+class CacheSearchIndex:
+    """
+    缓存条目的 n-gram 倒排索引，用于加速纯文本搜索
+    每个条目的原文、译文、润文切分为 n-gram，查询时取查询词所有 n-gram 的倒排表交集作为候选，再由调用方逐条确认
+    索引在后台线程中建立，建立完成前查询返回 None，由调用方逐条搜索
+    条目文本变化时只记录到待处理列表，查询时写入增量索引，增量过多时在后台重建
+    索引只能通过 mark_changed（由 CacheManager.record_item_changes 调用）得知文本变化，绕过它直接修改条目会使查询漏掉结果
+    条目增删、项目替换或插件批量修改文本时，需调用 invalidate，下次查询时重建
+    """
+
+    NGRAM = 3
+
+    # 参与索引的字段
+    FIELDS = ("source_text", "translated_text", "polished_text")
+
+    # 变更条目数超过总数的该比例时重建索引，而不是继续写入增量索引
+    DELTA_REBUILD_RATIO = 0.2
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+
+        # 等待写入增量索引的变更条目，单独加锁，记录变更时不会被查询阻塞
+        self.pending_lock = threading.Lock()
+        self.pending = {}
+        self.tracking = False               # 开始建立索引后才需要记录变更
+        self.generation = 0                 # 每次失效时加一，失效前开始建立的索引不会被使用
+
+        self.project = None                 # 索引对应的项目，为 None 时需要重建
+        self.entries = []                   # 文档编号 -> (文件路径, 行号, 条目)
+        self.doc_of = {}                    # 文本索引 -> 文档编号
+        self.postings = {}                  # n-gram -> 文档编号数组
+
+        # 增量索引，文本变化过的条目只在这里查找
+        self.dirty = set()
+        self.delta_postings = defaultdict(set)
+        self.delta_grams = {}
+
+        # 后台建立中的项目，以及建立期间写入旧索引的变更，建立完成后需要写入新索引
+        self.building_project = None
+        self.build_changes = {}
+
+    # 切分文本的 n-gram
+    @classmethod
+    def grams_of(cls, text: str) -> set[str]:
+        n = cls.NGRAM
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    # 切分条目所有字段的 n-gram
+    @classmethod
+    def item_grams(cls, item: CacheItem) -> set[str]:
+        grams = set()
+        for field_name in cls.FIELDS:
+            text = getattr(item, field_name, None)
+            if text:
+                grams.update(cls.grams_of(text))
+        return grams
+
+    # 查询词是否可以使用索引
+    @classmethod
+    def supports(cls, query: str) -> bool:
+        return len(query) >= cls.NGRAM
+
+    # 标记索引失效，下次查询时重建，不等待正在进行的查询
+    def invalidate(self) -> None:
+        with self.pending_lock:
+            self.generation += 1
+            self.tracking = False
+            self.pending = {}
+            self.project = None
+
+    # 记录文本发生变化的条目
+    def mark_changed(self, items: list[CacheItem]) -> None:
+        if not self.tracking:
+            return
+        with self.pending_lock:
+            for item in items:
+                self.pending[item.text_index] = item
+
+    # 在后台线程中建立索引，调用时需持有锁
+    def start_build(self, project: CacheProject) -> None:
+        if self.building_project is project:
+            return
+
+        if self.project is project:
+            self.apply_pending()
+        self.building_project = project
+        self.build_changes = {}
+        with self.pending_lock:
+            self.tracking = True
+            generation = self.generation
+
+        threading.Thread(target = self.build, args = (project, generation), daemon = True).start()
+
+    # 建立索引，建立过程不持有锁，完成后替换当前索引
+    def build(self, project: CacheProject, generation: int = None) -> None:
+        if generation is None:
+            with self.pending_lock:
+                self.tracking = True
+                generation = self.generation
+
+        entries = []
+        doc_of = {}
+        postings = defaultdict(lambda: array("I"))
+        for file_path, cache_file in list(project.files.items()):
+            for position, item in enumerate(cache_file.items):
+                doc = len(entries)
+                entries.append((file_path, position + 1, item))
+                doc_of[item.text_index] = doc
+                for gram in self.item_grams(item):
+                    postings[gram].append(doc)
+
+        with self.lock:
+            if self.building_project is project:
+                self.building_project = None
+
+            # 与 invalidate 使用同一把锁，避免替换时索引已经失效
+            with self.pending_lock:
+                if generation != self.generation:
+                    return
+
+                self.project = project
+                self.entries = entries
+                self.doc_of = doc_of
+                self.postings = dict(postings)
+                self.dirty = set()
+                self.delta_postings = defaultdict(set)
+                self.delta_grams = {}
+
+                # 建立期间已写入旧索引的变更，新索引可能读到的是变更前的文本
+                self.build_changes.update(self.pending)
+                self.pending = self.build_changes
+                self.build_changes = {}
+
+    # 将待处理的变更写入增量索引，调用时需持有锁
+    def apply_pending(self) -> None:
+        with self.pending_lock:
+            pending = self.pending
+            self.pending = {}
+
+        if self.building_project is not None:
+            self.build_changes.update(pending)
+
+        for text_index, item in pending.items():
+            doc = self.doc_of.get(text_index)
+            if doc is None:
+                continue
+
+            for gram in self.delta_grams.pop(doc, ()):
+                self.delta_postings[gram].discard(doc)
+
+            grams = self.item_grams(item)
+            for gram in grams:
+                self.delta_postings[gram].add(doc)
+            self.delta_grams[doc] = grams
+            self.dirty.add(doc)
+
+    # 返回可能包含查询词的条目，按文件分组为 (文件路径, 行号列表, 条目列表)，按项目顺序排列，无法使用索引时返回 None
+    def search(self, project: CacheProject, query: str) -> list[tuple[str, list[int], list[CacheItem]]] | None:
+        if project is None or not self.supports(query):
+            return None
+
+        grams = list(self.grams_of(query))
+        with self.lock:
+            # 索引尚未建立，先在后台建立
+            if self.project is not project:
+                self.start_build(project)
+                return None
+
+            # 增量过多时在后台重建，重建完成前继续使用增量索引
+            self.apply_pending()
+            if len(self.dirty) > len(self.entries) * self.DELTA_REBUILD_RATIO:
+                self.start_build(project)
+
+            # 原有索引中的候选，排除文本变化过的条目
+            lists = sorted((self.postings.get(gram, ()) for gram in grams), key = len)
+            docs = set(lists[0])
+            for postings in lists[1:]:
+                if not docs:
+                    break
+                docs.intersection_update(postings)
+            docs.difference_update(self.dirty)
+
+            # 文本变化过的条目在增量索引中查找
+            if self.dirty:
+                delta = set.intersection(*(self.delta_postings.get(gram, set()) for gram in grams))
+                docs.update(delta)
+
+            entries = self.entries
+            candidates = []
+            for file_path, group in itertools.groupby((entries[doc] for doc in sorted(docs)), key = itemgetter(0)):
+                group = list(group)
+                candidates.append((file_path, [row_num for _, row_num, _ in group], [item for _, _, item in group]))
+            return candidates
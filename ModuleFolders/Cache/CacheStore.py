@@ -0,0 +1,259 @@
+import dataclasses
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterator
+
+import msgspec
+
+from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem
+from ModuleFolders.Cache.CacheProject import CacheProject
+
+
+class SqliteCacheStore:
+    """
+    基于 SQLite 的缓存存储
+    条目按列保存状态、文件与文本，状态统计、任务切分与搜索都走索引查询，
+    保存时只更新发生变更的行，而不是重新编码整个项目
+    数据库是内存中 CacheProject 的镜像，读取时仍会加载完整项目，不会降低常驻内存
+    """
+
+    DB_NAME = "AinieeCacheData.db"
+
+    # 搜索时允许查询的文本字段
+    TEXT_FIELDS = ("source_text", "translated_text", "polished_text")
+
+    # 批量读写的行数
+    BATCH_SIZE = 2000
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS project (id INTEGER PRIMARY KEY CHECK (id = 0), meta BLOB NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS files ("
+        " storage_path TEXT PRIMARY KEY,"
+        " file_order INTEGER NOT NULL,"
+        " meta BLOB NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS items ("
+        " text_index INTEGER PRIMARY KEY,"
+        " storage_path TEXT NOT NULL,"
+        " file_order INTEGER NOT NULL,"
+        " position INTEGER NOT NULL,"
+        " translation_status INTEGER NOT NULL,"
+        " model TEXT NOT NULL DEFAULT '',"
+        " source_text TEXT NOT NULL DEFAULT '',"
+        " translated_text TEXT NOT NULL DEFAULT '',"
+        " polished_text TEXT NOT NULL DEFAULT '',"
+        " mismatch_translation INTEGER NOT NULL DEFAULT 0,"
+        " mismatch_polish INTEGER NOT NULL DEFAULT 0,"
+        " data BLOB NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_items_status ON items (translation_status, file_order, position)",
+        "CREATE INDEX IF NOT EXISTS idx_items_file ON items (file_order, position)",
+    )
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.create_function("REGEXP", 2, self._regexp, deterministic=True)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    @classmethod
+    def get_db_path(cls, output_path: str) -> str:
+        return os.path.join(output_path, "cache", cls.DB_NAME)
+
+    @staticmethod
+    def _regexp(pattern: str, text: str) -> bool:
+        if text is None:
+            return False
+        return re.search(pattern, text) is not None
+
+    # 记录最近一次写入的时间，需在事务中调用
+    def _touch(self) -> None:
+        self.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('saved_at', ?)", (time.time(),))
+
+    # 最近一次写入的时间，用于与 json 缓存比较新旧，旧版数据库没有记录时返回 0
+    def get_saved_time(self) -> float:
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM state WHERE key = 'saved_at'").fetchone()
+        return row[0] if row else 0.0
+
+    @staticmethod
+    def _decode(data: bytes, type_):
+        try:
+            return msgspec.json.decode(data, type=type_)
+        except msgspec.ValidationError:
+            # 与 json 缓存读取一致，严格反序列化失败时退回宽松的字典加载
+            return type_.from_dict(msgspec.json.decode(data))
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    @classmethod
+    def _item_row(cls, item: CacheItem, storage_path: str, file_order: int, position: int) -> tuple:
+        with item.atomic_scope():
+            return (
+                item.text_index,
+                storage_path,
+                file_order,
+                position,
+                item.translation_status,
+                item.model or "",
+                item.source_text or "",
+                item.translated_text or "",
+                item.polished_text or "",
+                int(bool(item.extra.get("language_mismatch_translation", False))),
+                int(bool(item.extra.get("language_mismatch_polish", False))),
+                msgspec.json.encode(item),
+            )
+
+    # 写入整个项目（全量同步）
+    def write_project(self, project: CacheProject) -> None:
+        project_meta = msgspec.json.encode(dataclasses.replace(project, files={}))
+
+        def rows() -> Iterator[tuple]:
+            for file_order, file in enumerate(project.files.values()):
+                for position, item in enumerate(file.items):
+                    yield self._item_row(item, file.storage_path, file_order, position)
+
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM items")
+            self.connection.execute("DELETE FROM files")
+            self.connection.execute("INSERT OR REPLACE INTO project (id, meta) VALUES (0, ?)", (project_meta,))
+            self.connection.executemany(
+                "INSERT INTO files (storage_path, file_order, meta) VALUES (?, ?, ?)",
+                (
+                    (file.storage_path, file_order, msgspec.json.encode(dataclasses.replace(file, items=[])))
+                    for file_order, file in enumerate(project.files.values())
+                ),
+            )
+            self.connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows())
+            self._touch()
+
+    # 只更新发生变更的条目
+    def update_items(self, items: list[CacheItem]) -> None:
+        if not items:
+            return
+
+        def rows() -> Iterator[tuple]:
+            for item in items:
+                with item.atomic_scope():
+                    yield (
+                        item.translation_status,
+                        item.model or "",
+                        item.source_text or "",
+                        item.translated_text or "",
+                        item.polished_text or "",
+                        int(bool(item.extra.get("language_mismatch_translation", False))),
+                        int(bool(item.extra.get("language_mismatch_polish", False))),
+                        msgspec.json.encode(item),
+                        item.text_index,
+                    )
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE items SET translation_status = ?, model = ?, source_text = ?, translated_text = ?,"
+                " polished_text = ?, mismatch_translation = ?, mismatch_polish = ?, data = ? WHERE text_index = ?",
+                rows(),
+            )
+            self._touch()
+
+    # 从数据库重建项目
+    def read_project(self) -> CacheProject | None:
+        with self.lock:
+            row = self.connection.execute("SELECT meta FROM project WHERE id = 0").fetchone()
+            if row is None:
+                return None
+            project = self._decode(row[0], CacheProject)
+
+            files = []
+            for storage_path, meta in self.connection.execute("SELECT storage_path, meta FROM files ORDER BY file_order"):
+                files.append(self._decode(meta, CacheFile))
+            for file in files:
+                project.files[file.storage_path] = file
+
+            cursor = self.connection.execute("SELECT storage_path, data FROM items ORDER BY file_order, position")
+            while rows := cursor.fetchmany(self.BATCH_SIZE):
+                for storage_path, data in rows:
+                    project.files[storage_path].items.append(self._decode(data, CacheItem))
+        return project
+
+    # 获取条目数量，可按状态过滤
+    def count_items(self, status: int = None) -> int:
+        with self.lock:
+            if status is None:
+                row = self.connection.execute("SELECT COUNT(*) FROM items").fetchone()
+            else:
+                row = self.connection.execute(
+                    "SELECT COUNT(*) FROM items WHERE translation_status = ?", (status,)
+                ).fetchone()
+        return row[0]
+
+    # 是否存在某状态的条目
+    def has_status(self, status: int) -> bool:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT EXISTS (SELECT 1 FROM items WHERE translation_status = ?)", (status,)
+            ).fetchone()
+        return bool(row[0])
+
+    # 按文件顺序获取某状态的条目位置
+    def iter_positions_by_status(self, status: int) -> Iterator[tuple[str, int]]:
+        """返回 (storage_path, position) ，position 为条目在文件 items 中的下标"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT storage_path, position FROM items WHERE translation_status = ? ORDER BY file_order, position",
+                (status,),
+            ).fetchall()
+        return iter(rows)
+
+    # 搜索条目
+    def search(self, query: str, fields_to_check: list[str], is_regex: bool, flagged_scope: str = None) -> list[tuple[str, int]]:
+        """
+        返回匹配条目的 (storage_path, position) 列表
+        flagged_scope 不为空时，仅搜索被标记为语言不匹配的条目
+        """
+        conditions, params = [], []
+
+        if flagged_scope == "translated_text":
+            conditions.append("mismatch_translation = 1")
+        elif flagged_scope == "polished_text":
+            conditions.append("mismatch_polish = 1")
+        elif flagged_scope == "all":
+            conditions.append("(mismatch_translation = 1 OR mismatch_polish = 1)")
+        elif flagged_scope is not None:
+            # 原文范围没有标记
+            return []
+
+        if query.strip():
+            field_conditions = []
+            for field_name in fields_to_check:
+                if field_name not in self.TEXT_FIELDS:
+                    continue
+                if is_regex:
+                    field_conditions.append(f"{field_name} REGEXP ?")
+                else:
+                    field_conditions.append(f"instr({field_name}, ?) > 0")
+                params.append(query)
+            if not field_conditions:
+                return []
+            conditions.append("(" + " OR ".join(field_conditions) + ")")
+        elif flagged_scope is None:
+            return []
+
+        sql = "SELECT storage_path, position FROM items"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY file_order, position"
+
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
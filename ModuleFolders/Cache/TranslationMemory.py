@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable
+
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+
+
+class TranslationMemory:
+    """
+    持久化翻译记忆
+    以 (规范化原文, 上下文指纹, 目标语言, 模型) 为键保存译文，跨文件、跨项目复用，
+    内存中保留一层 LRU 热数据，未命中时再查询 SQLite 数据库
+    """
+
+    DB_PATH = os.path.join(".", "Resource", "TranslationMemory.db")
+
+    # 内存热数据层的条目上限
+    LRU_SIZE = 20000
+
+    # 批量查询时每条语句的参数个数，需低于 SQLite 的参数数量限制
+    BATCH_SIZE = 500
+
+    # 影响译文结果的配置项，参与上下文指纹的计算
+    CONTEXT_KEYS = (
+        "source_language",
+        "translation_prompt_selection",
+        "prompt_dictionary_switch",
+        "prompt_dictionary_data",
+        "exclusion_list_switch",
+        "exclusion_list_data",
+        "characterization_switch",
+        "characterization_data",
+        "world_building_switch",
+        "world_building_content",
+        "writing_style_switch",
+        "writing_style_content",
+        "translation_example_switch",
+        "translation_example_data",
+        "few_shot_and_example_switch",
+        "pre_translation_switch",
+        "pre_translation_data",
+        "post_translation_switch",
+        "post_translation_data",
+    )
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS memory ("
+        " context TEXT NOT NULL,"
+        " target_language TEXT NOT NULL,"
+        " model TEXT NOT NULL,"
+        " source_text TEXT NOT NULL,"
+        " translated_text TEXT NOT NULL,"
+        " updated_at REAL NOT NULL,"
+        " PRIMARY KEY (context, target_language, model, source_text))",
+    )
+
+    def __init__(self, db_path: str = DB_PATH, lru_size: int = LRU_SIZE) -> None:
+        self.db_path = db_path
+        self.lru_size = lru_size
+        self.lock = threading.RLock()
+        self.connection = None  # 首次使用时才打开数据库
+        self.lru = OrderedDict()
+
+        # 命中统计
+        self.lookups = 0
+        self.memory_hits = 0
+        self.db_hits = 0
+
+    # 规范化原文，只统一换行符与 Unicode 组合形式，首尾空白会影响译文还原，需保留
+    @staticmethod
+    def normalize(text: str) -> str:
+        if not text:
+            return ""
+        return unicodedata.normalize("NFC", text.replace("\r\n", "\n").replace("\r", "\n"))
+
+    # 计算影响译文的配置的指纹，配置变化后不会复用旧译文
+    @classmethod
+    def get_context_fingerprint(cls, config) -> str:
+        data = {key: getattr(config, key, None) for key in cls.CONTEXT_KEYS}
+        content = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self.connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            with self.connection:
+                for statement in self.SCHEMA:
+                    self.connection.execute(statement)
+        return self.connection
+
+    def close(self) -> None:
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def _remember(self, key: tuple, translation: str) -> None:
+        self.lru[key] = translation
+        self.lru.move_to_end(key)
+        while len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    # 批量查询译文
+    def lookup_many(self, sources: list[str], context: str, target_language: str, model: str) -> dict[str, str]:
+        """sources 为规范化后的原文，返回 原文 -> 译文 ，未命中的原文不在结果中"""
+        result = {}
+        missing = []
+        with self.lock:
+            for source in dict.fromkeys(sources):
+                key = (source, context, target_language, model)
+                translation = self.lru.get(key)
+                if translation is not None:
+                    self.lru.move_to_end(key)
+                    result[source] = translation
+                else:
+                    missing.append(source)
+            self.lookups += len(result) + len(missing)
+            self.memory_hits += len(result)
+
+            if missing:
+                connection = self._get_connection()
+                for i in range(0, len(missing), self.BATCH_SIZE):
+                    batch = missing[i:i + self.BATCH_SIZE]
+                    rows = connection.execute(
+                        "SELECT source_text, translated_text FROM memory"
+                        " WHERE context = ? AND target_language = ? AND model = ?"
+                        f" AND source_text IN ({', '.join('?' * len(batch))})",
+                        (context, target_language, model, *batch),
+                    ).fetchall()
+                    for source, translation in rows:
+                        self._remember((source, context, target_language, model), translation)
+                        result[source] = translation
+                    self.db_hits += len(rows)
+        return result
+
+    # 批量保存译文
+    def store_many(self, translations: dict[str, str], context: str, target_language: str, model: str) -> None:
+        """translations 为 规范化原文 -> 译文"""
+        if not translations:
+            return
+        now = time.time()
+        with self.lock:
+            for source, translation in translations.items():
+                self._remember((source, context, target_language, model), translation)
+            connection = self._get_connection()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (context, target_language, model, source, translation, now)
+                        for source, translation in translations.items()
+                    ),
+                )
+
+    # 获取命中统计
+    def get_stats(self) -> dict:
+        with self.lock:
+            hits = self.memory_hits + self.db_hits
+            return {
+                "lookups": self.lookups,
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.lookups = 0
+            self.memory_hits = 0
+            self.db_hits = 0
+
+
+class TranslationMemorySession:
+    """
+    单次翻译任务中的翻译记忆会话
+    切分片段前用翻译记忆预填条目，并对重复的原文去重，只发送第一次出现的条目，
+    译文返回后再分发给其余重复条目
+    """
+
+    def __init__(self, memory: TranslationMemory, config, on_filled: Callable[[list[CacheItem]], None] = None) -> None:
+        self.memory = memory
+        self.context = TranslationMemory.get_context_fingerprint(config)
+        self.target_language = config.target_language
+        self.model = config.model
+        self.on_filled = on_filled  # 条目由翻译记忆填充后的回调
+        self.lock = threading.Lock()
+
+        # 规范化原文 -> 等待分发译文的重复条目，键存在即表示该原文已在本轮中发送
+        self.duplicates = {}
+        # 本次任务中发送过的原文，再次命中时计为去重
+        self.sent_sources = set()
+
+        # 统计
+        self.memory_filled = 0
+        self.duplicate_filled = 0
+        self.tokens_saved = 0
+
+    # 新一轮开始时清空等待分发的条目，上一轮发送失败的条目会重新参与去重
+    def begin_round(self) -> None:
+        with self.lock:
+            self.duplicates.clear()
+
+    def _fill(self, items: list[CacheItem], translation: str) -> None:
+        for item in items:
+            with item.atomic_scope():
+                item.model = self.model
+                item.translated_text = translation
+                item.translation_status = TranslationStatus.TRANSLATED
+
+    # 过滤出需要发送的条目，供 CacheManager.iter_item_chunks 在切分前调用
+    def filter_items(self, items: list[CacheItem]) -> list[CacheItem]:
+        keys = [TranslationMemory.normalize(item.source_text) for item in items]
+        found = self.memory.lookup_many([key for key in keys if key.strip()], self.context, self.target_language, self.model)
+
+        pending, filled = [], []
+        with self.lock:
+            for item, key in zip(items, keys):
+                if not key.strip():
+                    pending.append(item)
+                elif key in found:
+                    self._fill([item], found[key])
+                    filled.append(item)
+                    if key in self.sent_sources:
+                        self.duplicate_filled += 1
+                    else:
+                        self.memory_filled += 1
+                elif key in self.duplicates:
+                    self.duplicates[key].append(item)
+                else:
+                    self.duplicates[key] = []
+                    self.sent_sources.add(key)
+                    pending.append(item)
+
+        if filled:
+            self._count_tokens(filled)
+            if self.on_filled:
+                self.on_filled(filled)
+        return pending
+
+    # 翻译完成后写入翻译记忆，并把译文分发给重复条目，返回被分发的条目
+    def complete(self, items: list[CacheItem]) -> list[CacheItem]:
+        translations = {}
+        fanned = []
+        with self.lock:
+            for item in items:
+                if item.translation_status != TranslationStatus.TRANSLATED:
+                    continue
+                key = TranslationMemory.normalize(item.source_text)
+                if not key.strip():
+                    continue
+                translations[key] = item.translated_text
+                followers = self.duplicates.pop(key, [])
+                if followers:
+                    self._fill(followers, item.translated_text)
+                    fanned.extend(followers)
+            self.duplicate_filled += len(fanned)
+
+        self.memory.store_many(translations, self.context, self.target_language, self.model)
+        if fanned:
+            self._count_tokens(fanned)
+        return fanned
+
+    def _count_tokens(self, items: list[CacheItem]) -> None:
+        CacheItem.compute_token_counts(items)
+        tokens = sum(item.token_count for item in items)
+        with self.lock:
+            self.tokens_saved += tokens
+
+    # 获取本次任务的复用统计
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = {
+                "memory_filled": self.memory_filled,
+                "duplicate_filled": self.duplicate_filled,
+                "tokens_saved": self.tokens_saved,
+            }
+        stats.update(self.memory.get_stats())
+        return stats
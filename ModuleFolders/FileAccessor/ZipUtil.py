@@ -1,6 +1,11 @@
+import copy
+import struct
 import zipfile
 from pathlib import Path
 
+# 原样复制条目时每次读写的字节数
+COPY_BUFFER_SIZE = 1024 * 1024
+
 
 def decompress_zip_to_path(zip_file_path: Path, decompress_path: Path):
     decompress_path.mkdir(exist_ok=True)
@@ -26,6 +31,55 @@ def compress_to_zip_file(compress_path: Path, zip_file_path: Path):
             zipf.write(compress_path)
 
 
+def copy_raw_entry(zin: zipfile.ZipFile, zout: zipfile.ZipFile, item: zipfile.ZipInfo):
+    """
+    将条目的压缩数据原样写入新的压缩包，不经过解压与重新压缩
+    原样复制依赖 zipfile 的内部接口，内部接口不可用或源条目无法原样复制时，退回解压后重新写入
+    """
+    start = zout.fp.tell()
+    try:
+        _copy_raw_entry(zin, zout, item)
+    except (AttributeError, zipfile.BadZipFile):
+        # 丢弃已写入的部分数据，条目只有在复制完成后才会加入目录
+        zout.fp.seek(start)
+        zout.fp.truncate()
+        zout.writestr(item, zin.read(item))
+
+
+# 使用了 zipfile 的内部接口（_lock、_strip_extra / _Extra.strip、_MASK_USE_DATA_DESCRIPTOR、_FH_*、_didModify）
+# 并直接修改 filelist、NameToInfo 与 start_dir，已在 CPython 3.9 ~ 3.13 上验证
+def _copy_raw_entry(zin: zipfile.ZipFile, zout: zipfile.ZipFile, item: zipfile.ZipInfo):
+    with zin._lock, zout._lock:
+        # 跳过源文件中的本地文件头，定位到压缩数据
+        zin.fp.seek(item.header_offset)
+        file_header = struct.unpack(zipfile.structFileHeader, zin.fp.read(zipfile.sizeFileHeader))
+        if file_header[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Bad magic number for file header: {item.filename}")
+        zin.fp.seek(file_header[zipfile._FH_FILENAME_LENGTH] + file_header[zipfile._FH_EXTRA_FIELD_LENGTH], 1)
+
+        # 大小与校验值已知，直接写入本地文件头，不再需要数据描述符
+        zinfo = copy.copy(item)
+        zinfo.flag_bits &= ~getattr(zipfile, "_MASK_USE_DATA_DESCRIPTOR", 0x08)  # 3.11 之前没有该常量
+        # 3.13 起 _strip_extra 移入 _Extra.strip
+        strip_extra = getattr(zipfile, "_strip_extra", None) or zipfile._Extra.strip
+        zinfo.extra = strip_extra(item.extra, (1,))
+        zinfo.header_offset = zout.fp.tell()
+        zout.fp.write(zinfo.FileHeader())
+
+        remaining = item.compress_size
+        while remaining > 0:
+            data = zin.fp.read(min(COPY_BUFFER_SIZE, remaining))
+            if not data:
+                raise zipfile.BadZipFile(f"Truncated file data: {item.filename}")
+            zout.fp.write(data)
+            remaining -= len(data)
+
+        zout.filelist.append(zinfo)
+        zout.NameToInfo[zinfo.filename] = zinfo
+        zout.start_dir = zout.fp.tell()
+        zout._didModify = True
+
+
 def replace_in_zip_file(
     src_zip_file_path: Path, dst_zip_file_path: Path,
     content: dict[str, str],
@@ -39,5 +93,5 @@ def replace_in_zip_file(
             # 如果是目标文件，替换为新内容
             if item.filename in content:
                 zout.writestr(item, content[item.filename])
-            else:  # 否则直接复制
-                zout.writestr(item, zin.read(item.filename))
+            else:  # 否则直接复制压缩数据
+                copy_raw_entry(zin, zout, item)
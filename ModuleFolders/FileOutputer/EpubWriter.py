@@ -1,3 +1,4 @@
+import html
 import re
 from itertools import groupby
 from pathlib import Path
@@ -19,10 +20,22 @@ from ModuleFolders.FileOutputer.BaseWriter import (
 
 
 class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
+    # 开始标签中的 id 与 style 属性
+    ATTR_ID_PATTERN = re.compile(r'\s+id\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE)
+    ATTR_STYLE_PATTERN = re.compile(r'(\s+style\s*=\s*)(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+    TAG_PATTERN = re.compile(r'<[^>]*>')
+
     def __init__(self, output_config: OutputConfig):
         super().__init__(output_config)
         self.file_accessor = EpubAccessor()
 
+        # 最近读取的源文件内容，译文与双语输出共用同一份解析结果
+        self.source_content_cache = None
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        self.source_content_cache = None
+        return super().__exit__(exc_type, exc, exc_tb)
+
     def on_write_bilingual(
         self, translation_file_path: Path, cache_file: CacheFile,
         pre_write_metadata: PreWriteMetadata,
@@ -45,34 +58,70 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
 
     def _write_translation_file(
         self, translation_file_path: Path, cache_file: CacheFile,
-        source_file_path: Path, translate_html_tag: Callable[[str, str], str]
+        source_file_path: Path, translate_html_tag: Callable[[str, str, tuple[int, int] | None], str]
     ):
-        content = self.file_accessor.read_content(source_file_path)
+        content = self._read_source_content(source_file_path)
 
         translated_item_dict = {
             k: list(v)
             for k, v in groupby(cache_file.items, key=lambda x: x.require_extra("item_id"))
         }
         translation_content = {}
+        # 未修改的文件不写入，由压缩包原样复制
         for item_id, item_filename, html_content in content:
             if item_id not in translated_item_dict:
-                translation_content[item_filename] = html_content
                 continue
-            
-            modified_html_content = html_content
-            for item in translated_item_dict[item_id]:
-                if item.translation_status == TranslationStatus.TRANSLATED or item.translation_status == TranslationStatus.POLISHED:
-                    original_html = item.require_extra("original_html")
-                    translated_text = item.final_text
-                    new_html = translate_html_tag(original_html, translated_text)
-                    modified_html_content = modified_html_content.replace(original_html, new_html, 1)
-            translation_content[item_filename] = modified_html_content
+
+            items = [
+                item for item in translated_item_dict[item_id]
+                if item.translation_status == TranslationStatus.TRANSLATED or item.translation_status == TranslationStatus.POLISHED
+            ]
+            modified_html_content = self._splice_translation(html_content, items, translate_html_tag)
+            if modified_html_content != html_content:
+                translation_content[item_filename] = modified_html_content
         self.file_accessor.write_content(
             translation_content, translation_file_path, source_file_path
         )
 
+    # 按读取时记录的位置一次性拼接译文，位置缺失或与源文件不一致时回退到字符串替换
+    def _splice_translation(self, html_content: str, items: list, translate_html_tag: Callable) -> str:
+        parts = []
+        last_end = 0
+        fallback_items = []
+        for item in items:
+            original_html = item.require_extra("original_html")
+            offsets = item.get_extra("html_offsets")
+            if offsets is None or offsets[0] < last_end or html_content[offsets[0]:offsets[3]] != original_html:
+                fallback_items.append(item)
+                continue
+
+            start, inner_start, inner_end, end = offsets
+            parts.append(html_content[last_end:start])
+            parts.append(translate_html_tag(original_html, item.final_text, (inner_start - start, inner_end - start)))
+            last_end = end
+        parts.append(html_content[last_end:])
+        modified_html_content = "".join(parts)
+
+        # 旧版本缓存没有记录位置
+        for item in fallback_items:
+            original_html = item.require_extra("original_html")
+            new_html = translate_html_tag(original_html, item.final_text, None)
+            modified_html_content = modified_html_content.replace(original_html, new_html, 1)
+        return modified_html_content
+
+    # 读取源文件内容，同一文件的多次输出只解析一次
+    def _read_source_content(self, source_file_path: Path):
+        if self.source_content_cache is None or self.source_content_cache[0] != source_file_path:
+            self.source_content_cache = (source_file_path, self.file_accessor.read_content(source_file_path))
+        return self.source_content_cache[1]
+
     # 译文版本
-    def _rebuild_translated_tag(self, original_html, translated_text):
+    def _rebuild_translated_tag(self, original_html, translated_text, inner_range=None):
+        if inner_range is not None:
+            start_tag, inner_html, end_tag = self._split_tag(original_html, inner_range)
+            processed_translated = self._copy_leading_spaces(self._get_inner_text(inner_html), translated_text)
+            return start_tag + html.escape(processed_translated, quote=False) + end_tag
+
         soup = BeautifulSoup(original_html, 'html.parser')
         original_tag = soup.find()
         if not original_tag:
@@ -91,7 +140,7 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
         return str(new_tag)
 
     # 双语版本
-    def _rebuild_bilingual_tag(self, original_html, translated_text):
+    def _rebuild_bilingual_tag(self, original_html, translated_text, inner_range=None):
         ORIGINAL_STYLE = {
             'opacity': '0.8',
             'color': '#888',
@@ -100,6 +149,31 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
             'margin-top': '0.2em',
         }
 
+        # 直接修改原始字符串，保留原文标签的格式与内部结构
+        if inner_range is not None:
+            start_tag, inner_html, end_tag = self._split_tag(original_html, inner_range)
+            processed_trans = self._copy_leading_spaces(self._get_inner_text(inner_html), translated_text)
+            trans_html = start_tag + html.escape(processed_trans, quote=False) + end_tag
+
+            # 原文标签去掉 id 并合并样式
+            orig_start_tag = self.ATTR_ID_PATTERN.sub('', start_tag)
+            new_style = '; '.join([f"{k}:{v}" for k, v in ORIGINAL_STYLE.items()])
+            style_match = self.ATTR_STYLE_PATTERN.search(orig_start_tag)
+            if style_match:
+                existing_style = html.unescape(style_match.group(2) if style_match.group(2) is not None else style_match.group(3))
+                if existing_style and not existing_style.strip().endswith(';'):
+                    existing_style += '; '
+                merged_style = html.escape(existing_style + new_style)
+                orig_start_tag = f'{orig_start_tag[:style_match.start()]}{style_match.group(1)}"{merged_style}"{orig_start_tag[style_match.end():]}'
+            else:
+                orig_start_tag = f'{orig_start_tag[:-1]} style="{new_style}">'
+            orig_html_styled = orig_start_tag + inner_html + end_tag
+
+            if self.output_config.bilingual_order == BilingualOrder.SOURCE_FIRST:
+                return f"{orig_html_styled}\n  {trans_html}"
+            else:  # 默认为译文在前
+                return f"{trans_html}\n  {orig_html_styled}"
+
         soup = BeautifulSoup(original_html, 'html.parser')
         original_tag = soup.find()
 
@@ -112,7 +186,7 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
             trans_div = f'<div>{processed_trans}</div>'
             orig_div = f'<div style="{style_str}">{original_html}</div>'
 
-            if self.output_config.bilingual_order == BilingualOrder.SOURCE_FIRSTT:
+            if self.output_config.bilingual_order == BilingualOrder.SOURCE_FIRST:
                 return f"{orig_div}\n  {trans_div}"
             else:  # 默认为译文在前
                 return f"{trans_div}\n  {orig_div}"
@@ -146,6 +220,17 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
         else:  # 默认为译文在前
             return f"{trans_html}\n  {orig_html_styled}"
 
+    # 按标签内部范围拆分为开始标签、内部内容与结束标签
+    @staticmethod
+    def _split_tag(original_html, inner_range):
+        inner_start, inner_end = inner_range
+        return original_html[:inner_start], original_html[inner_start:inner_end], original_html[inner_end:]
+
+    # 标签内部内容的文本，与 get_text 的结果一致
+    @classmethod
+    def _get_inner_text(cls, inner_html):
+        return html.unescape(cls.TAG_PATTERN.sub('', inner_html))
+
     def _copy_leading_spaces(self, source_text, target_text):
         leading_spaces = re.match(r'^[ \u3000]+', source_text)
         leading_spaces = leading_spaces.group(0) if leading_spaces else ''
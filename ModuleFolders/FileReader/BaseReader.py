@@ -28,6 +28,9 @@ class ReaderInitParams(TypedDict):
 class BaseSourceReader(ABC):
     """Reader基类，在其生命周期内可以输入多个文件"""
 
+    # 是否显示语言检测进度条，多进程读取时由主进程统一显示文件进度
+    show_detect_progress = True
+
     def __init__(self, input_config: InputConfig) -> None:
         self.input_config = input_config
 
@@ -103,7 +106,8 @@ class BaseSourceReader(ABC):
                 MofNCompleteColumn(),
                 "•",
                 TimeRemainingColumn(),
-                expand=True
+                expand=True,
+                disable=not self.show_detect_progress
         ) as progress:
 
             # 总体进度
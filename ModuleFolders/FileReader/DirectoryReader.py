@@ -1,17 +1,62 @@
 import fnmatch
+import multiprocessing
+import os
+import pickle
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.util import Finalize
 from pathlib import Path
 from typing import Callable
 
-from ModuleFolders.Cache.CacheItem import CacheItem
+import rich
+from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, MofNCompleteColumn, TimeRemainingColumn
+
+from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheProject import CacheProject
 from ModuleFolders.FileReader import ReaderUtil
 from ModuleFolders.FileReader.BaseReader import BaseSourceReader
 from ModuleFolders.FileReader.ReaderUtil import make_final_detect_text
 
+
+# 子进程内的reader，每个进程只创建一次，并持有各自的语言检测器
+_worker_reader: BaseSourceReader | None = None
+
+
+def _close_worker_reader():
+    if _worker_reader is not None:
+        _worker_reader.__exit__(None, None, None)
+    ReaderUtil.close_lang_detector()
+
+
+def _init_worker(create_reader: Callable[[], BaseSourceReader]):
+    global _worker_reader
+    # 多个进程同时输出进度条会导致控制台显示错乱，由主进程统一显示文件进度
+    BaseSourceReader.show_detect_progress = False
+    _worker_reader = create_reader()
+    _worker_reader.__enter__()
+    # 进程池关闭时释放reader与语言检测器
+    Finalize(None, _close_worker_reader, exitpriority=10)
+
+
+def _read_file_in_worker(file_path: Path) -> dict | None:
+    cache_file = _worker_reader.read_source_file(file_path)
+    if not cache_file:
+        return None
+    cache_file.storage_path = str(cache_file.storage_path)
+    return cache_file.to_dict()
+
+
 class DirectoryReader:
-    def __init__(self, create_reader: Callable[[], BaseSourceReader], exclude_rules: list[str]):
+    # 自动模式下文件数量达到该值才使用多进程，子进程需要重新导入模块并加载语言检测模型
+    MIN_PARALLEL_FILES = 8
+
+    # 自动模式下的最大进程数量
+    MAX_AUTO_PROCESSES = 8
+
+    def __init__(self, create_reader: Callable[[], BaseSourceReader], exclude_rules: list[str], process_count: int = 1):
         self.create_reader = create_reader  # 工厂函数
+        self.process_count = process_count  # 读取进程数量，0 为自动，1 为单进程读取
 
         self.exclude_files = set()
         self.exclude_paths = set()
@@ -83,51 +128,52 @@ class DirectoryReader:
             self._update_exclude_rules(reader.exclude_rules)
             cache_project.project_type = reader.get_project_type()
 
-            # 遍历预先生成的文件列表
-            for file_path in files_to_process:
-                # 检查是否被排除，以及是否是目标类型文件
-                if not self.is_exclude(file_path, base_directory) and reader.can_read(file_path):
-                    
-                    # 读取单个文件的文本信息，并添加其他信息
-                    cache_file = reader.read_source_file(file_path)
-                    #空文件跳过
-                    if not cache_file:
-                       continue
-                       
-                    # 使用 base_directory 计算相对路径
-                    cache_file.storage_path = str(file_path.relative_to(base_directory))
-                    cache_file.file_project_type = reader.get_file_project_type(file_path)
-                    for item in cache_file.items:
-                        item.text_index = text_index
-                        item.model = 'none'
-                        text_index += 1
-
-                        # 统计每行的语言信息
-                        lang_code = item.lang_code
-
-                        # 只统计检测到有效语言代码的item行
-                        if lang_code:
-                            lang_confidence = lang_code[1]
-
-                            # 更新语言统计：[计数, 累计置信度]
-                            stats = language_stats[cache_file.storage_path][lang_code[0]]
-                            stats[0] += 1   # 增加计数
-                            stats[1] += lang_confidence   # 累加置信度
-
-                            # 累计有效项目总数
-                            file_valid_items_count[cache_file.storage_path] += 1
-
-                            # 添加行至后续使用
-                            final_detect_text = make_final_detect_text(item)
-                            if final_detect_text:
-                                source_texts[cache_file.storage_path].append(final_detect_text)
-
-                    # 补充缺失的字典项
-                    if not language_stats[cache_file.storage_path]:
-                        language_stats[cache_file.storage_path] = defaultdict(lambda: [0, 0.0])
-
-                    if cache_file.items:
-                        cache_project.add_file(cache_file)
+            # 检查是否被排除，以及是否是目标类型文件
+            files_to_read = [
+                file_path for file_path in files_to_process
+                if not self.is_exclude(file_path, base_directory) and reader.can_read(file_path)
+            ]
+
+            # 按文件列表的顺序合并结果，文本索引与单进程读取一致
+            for file_path, cache_file in zip(files_to_read, self._read_files(reader, files_to_read)):
+                # 空文件跳过
+                if not cache_file:
+                    continue
+
+                # 使用 base_directory 计算相对路径
+                cache_file.storage_path = str(file_path.relative_to(base_directory))
+                cache_file.file_project_type = reader.get_file_project_type(file_path)
+                for item in cache_file.items:
+                    item.text_index = text_index
+                    item.model = 'none'
+                    text_index += 1
+
+                    # 统计每行的语言信息
+                    lang_code = item.lang_code
+
+                    # 只统计检测到有效语言代码的item行
+                    if lang_code:
+                        lang_confidence = lang_code[1]
+
+                        # 更新语言统计：[计数, 累计置信度]
+                        stats = language_stats[cache_file.storage_path][lang_code[0]]
+                        stats[0] += 1   # 增加计数
+                        stats[1] += lang_confidence   # 累加置信度
+
+                        # 累计有效项目总数
+                        file_valid_items_count[cache_file.storage_path] += 1
+
+                        # 添加行至后续使用
+                        final_detect_text = make_final_detect_text(item)
+                        if final_detect_text:
+                            source_texts[cache_file.storage_path].append(final_detect_text)
+
+                # 补充缺失的字典项
+                if not language_stats[cache_file.storage_path]:
+                    language_stats[cache_file.storage_path] = defaultdict(lambda: [0, 0.0])
+
+                if cache_file.items:
+                    cache_project.add_file(cache_file)
 
 
         # 处理语言统计结果
@@ -165,8 +211,8 @@ class DirectoryReader:
                 # 如果到这里了还没有high_confidence_langs的结果，使用mp对所有有效文字进行检测
                 if not high_confidence_langs:
                     if len(source_texts[file_path]) > 0:
-                        mp_langs, mp_score, _ = ReaderUtil.detect_language_with_mediapipe(
-                            [CacheItem(source_text='\n'.join(source_texts[file_path]))], 0, None
+                        mp_langs, mp_score, _ = ReaderUtil.detect_language_texts(
+                            ['\n'.join(source_texts[file_path])]
                         )[0]
                         if mp_score >= 0.82:
                             # 添加到language_counter
@@ -218,6 +264,66 @@ class DirectoryReader:
         return cache_project
 
 
+    # 获取实际使用的进程数量
+    def _get_worker_count(self, file_count: int) -> int:
+        if self.process_count == 0:
+            if file_count < self.MIN_PARALLEL_FILES:
+                return 1
+            return min(os.cpu_count() or 1, self.MAX_AUTO_PROCESSES, file_count)
+        return max(1, min(self.process_count, file_count))
+
+    # 依次返回每个文件的读取结果，顺序与文件列表一致
+    def _read_files(self, reader: BaseSourceReader, files_to_read: list[Path]):
+        worker_count = self._get_worker_count(len(files_to_read))
+        if worker_count > 1:
+            try:
+                # 工厂函数需要传递给子进程
+                pickle.dumps(self.create_reader)
+            except Exception as e:
+                rich.print(f"[[yellow]WARNING[/]] 当前项目类型的读取器无法在子进程中创建，将使用单进程读取: {e}")
+            else:
+                try:
+                    yield from self._read_files_parallel(files_to_read, worker_count)
+                    return
+                except BrokenProcessPool as e:
+                    rich.print(f"[[yellow]WARNING[/]] 多进程读取失败，将使用单进程重新读取: {e}")
+
+        for file_path in files_to_read:
+            yield reader.read_source_file(file_path)
+
+    # 在进程池中读取文件并检测语言，每读取完一个文件更新一次进度
+    def _read_files_parallel(self, files_to_read: list[Path], worker_count: int) -> list[CacheFile | None]:
+        rich.print(f"[[green]INFO[/]] 使用 {worker_count} 个进程读取 {len(files_to_read)} 个文件...")
+        results = [None] * len(files_to_read)
+
+        # 使用 spawn 方式创建子进程，避免复制界面线程与已加载的模型
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.create_reader,),
+        ) as executor, Progress(
+            TextColumn("[bold blue]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            MofNCompleteColumn(),
+            "•",
+            TimeRemainingColumn(),
+            expand=True
+        ) as progress:
+            main_task = progress.add_task("读取文件与语言检测中...", total=len(files_to_read))
+            futures = {
+                executor.submit(_read_file_in_worker, file_path): index
+                for index, file_path in enumerate(files_to_read)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                data = future.result()
+                results[index] = CacheFile.from_dict(data) if data else None
+                progress.update(main_task, advance=1, description=f"读取文件与语言检测中... {files_to_read[index].name}")
+
+        return results
+
     # 自动生成工程名字方法
     def _generate_project_name(self, cache_project: CacheProject):
         """
@@ -0,0 +1,145 @@
+from html.parser import HTMLParser
+
+
+class EpubBlock:
+    """文本块在源文件中的位置与纯文本内容，偏移量均为字符偏移"""
+
+    __slots__ = ("tag", "start", "inner_start", "inner_end", "end", "text")
+
+    def __init__(self, tag: str, start: int, inner_start: int, inner_end: int, end: int, text: str) -> None:
+        self.tag = tag
+        self.start = start  # 开始标签的起始位置
+        self.inner_start = inner_start  # 开始标签的结束位置
+        self.inner_end = inner_end  # 结束标签的起始位置
+        self.end = end  # 结束标签的结束位置
+        self.text = text
+
+
+class _Node:
+    __slots__ = ("tag", "start", "inner_start", "inner_end", "end", "children", "text", "has_block", "closed")
+
+    def __init__(self, tag: str, start: int, inner_start: int) -> None:
+        self.tag = tag
+        self.start = start
+        self.inner_start = inner_start
+        self.inner_end = inner_start
+        self.end = inner_start
+        self.children = []  # 子节点与文本
+        self.text = ""
+        self.has_block = False  # 是否包含块级子孙标签
+        self.closed = False  # 是否有对应的结束标签
+
+
+class EpubBlockExtractor(HTMLParser):
+    """
+    单次遍历 XHTML 提取文本块
+    解析时记录每个标签在源文件中的起止位置，不包含其他块级标签的块级标签即为一个文本块，
+    再向下找到实际存放文本的最内层标签，写入时可按位置直接替换，无需重新解析
+    """
+
+    # 提取文本的块级标签
+    BLOCK_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6", "h7", "li", "p", "blockquote", "text", "td", "div"})
+
+    # 没有结束标签的空元素
+    VOID_TAGS = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"})
+
+    # 内容不属于正文的标签
+    SKIP_TAGS = frozenset({"script", "style"})
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.html_content = ""
+        self.line_starts = [0]
+        self.stack = []
+        self.blocks = []
+
+    def extract(self, html_content: str) -> list[EpubBlock]:
+        """按文档顺序返回所有文本块"""
+        self.reset()
+        self.html_content = html_content
+        self.line_starts = [0]
+        pos = html_content.find("\n")
+        while pos != -1:
+            self.line_starts.append(pos + 1)
+            pos = html_content.find("\n", pos + 1)
+        self.stack = []
+        self.blocks = []
+
+        self.feed(html_content)
+        self.close()
+
+        # 未闭合的标签
+        while self.stack:
+            self._pop(len(html_content), len(html_content), False)
+        return self.blocks
+
+    # 当前解析位置的字符偏移
+    def _offset(self) -> int:
+        lineno, col = self.getpos()
+        return self.line_starts[lineno - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        start = self._offset()
+        node = _Node(tag, start, start + len(self.get_starttag_text()))
+        if self.stack:
+            self.stack[-1].children.append(node)
+        if tag not in self.VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        start = self._offset()
+        node = _Node(tag, start, start + len(self.get_starttag_text()))
+        node.closed = True
+        if self.stack:
+            self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        # 忽略没有对应开始标签的结束标签
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index].tag == tag:
+                break
+        else:
+            return
+
+        inner_end = self._offset()
+        end = self.html_content.find(">", inner_end) + 1 or len(self.html_content)
+
+        # 中间未闭合的标签视为在此处结束
+        while len(self.stack) > index + 1:
+            self._pop(inner_end, inner_end, False)
+        self._pop(inner_end, end, True)
+
+    def handle_data(self, data):
+        if self.stack and self.stack[-1].tag not in self.SKIP_TAGS:
+            self.stack[-1].children.append(data)
+
+    def _pop(self, inner_end: int, end: int, closed: bool) -> None:
+        node = self.stack.pop()
+        node.inner_end = inner_end
+        node.end = end
+        node.closed = closed
+        node.text = "".join(child if isinstance(child, str) else child.text for child in node.children)
+
+        is_block = node.tag in self.BLOCK_TAGS
+        if is_block and closed and not node.has_block:
+            self._add_block(node)
+
+        if self.stack:
+            parent = self.stack[-1]
+            parent.has_block = parent.has_block or is_block or node.has_block
+
+    # 从文本块向下找到最内层包含文本的标签
+    def _add_block(self, node: _Node) -> None:
+        if not node.text.strip():
+            return
+
+        while True:
+            text_children = [
+                child for child in node.children
+                if (child if isinstance(child, str) else child.text).strip()
+            ]
+            if len(text_children) != 1 or isinstance(text_children[0], str) or not text_children[0].closed:
+                break
+            node = text_children[0]
+
+        self.blocks.append(EpubBlock(node.tag, node.start, node.inner_start, node.inner_end, node.end, node.text.strip()))
@@ -74,16 +74,23 @@ class FileReader():
             return ReaderInitParams(input_config=input_config, reader_init_params_factory=reader_init_params_factory)
         return ReaderInitParams(input_config=input_config)
 
+    def _get_reader_factory(self, project_type, label_input_path):
+        # 获取初始化参数
+        reader_init_params = self._get_reader_init_params(project_type, label_input_path)
+        # 绑定配置，使工厂变成无参
+        return partial(self.reader_factory_dict[project_type], **reader_init_params)
+
     # 根据文件类型读取文件，并返回缓存对象
-    def read_files (self,translation_project,label_input_path, exclude_rule_str):
+    def read_files (self,translation_project,label_input_path, exclude_rule_str, process_count=1):
         # 检查传入的项目类型是否已经被注册。
         if translation_project in self.reader_factory_dict:
-            # 获取初始化参数
-            reader_init_params = self._get_reader_init_params(translation_project, label_input_path)
-            # 绑定配置，使工厂变成无参
-            reader_factory = partial(self.reader_factory_dict[translation_project], **reader_init_params)
+            if process_count == 1:
+                reader_factory = self._get_reader_factory(translation_project, label_input_path)
+            else:
+                # 多进程读取时工厂需要传递给子进程，改为在子进程中重新注册后创建
+                reader_factory = partial(create_reader, translation_project, label_input_path)
             # 创建对象，接收配置好、无参数的 reader_factory
-            reader = DirectoryReader(reader_factory, exclude_rule_str.split(','))
+            reader = DirectoryReader(reader_factory, exclude_rule_str.split(','), process_count)
             # 再次获取路径对象
             source_directory = Path(label_input_path)
             # 读取整个输入目录,生成缓存对象
@@ -117,3 +124,8 @@ class FileReader():
             AutoTypeReader.get_project_type(),
             *(project_type for project_type in self.reader_factory_dict.keys() if project_type != AutoTypeReader.get_project_type())
         ]
+
+
+# 创建指定项目类型的reader，可被序列化后在子进程中调用
+def create_reader(project_type, label_input_path) -> BaseSourceReader:
+    return FileReader()._get_reader_factory(project_type, label_input_path)()
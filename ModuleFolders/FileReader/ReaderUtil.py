@@ -1,8 +1,12 @@
+import hashlib
 import os
 import pathlib
 import re
 import sys
+import threading
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Union
 
 import chardet
@@ -77,6 +81,9 @@ NON_LATIN_ISO_CODES = [
     'fa'  # 波斯语
 ]
 """ISO 639-1非西文语言代码列表"""
+NON_LATIN_ISO_CODES_SET = frozenset(NON_LATIN_ISO_CODES)
+LATIN_LETTERS_PATTERN = re.compile(fr"[{VARIOUS_LETTERS_RANGE}'-]+")
+WHITESPACES_PATTERN = re.compile(r'\s+')
 
 
 # 加载语言检测器(全局)
@@ -198,6 +205,81 @@ def detect_file_encoding(file_path: Union[str, pathlib.Path], min_confidence: fl
         return 'utf-8'  # 出错时返回默认编码
 
 
+# 语言检测结果缓存
+class LanguageDetectionCache:
+    """
+    以文本内容的哈希为键保存语言检测结果，重复文本只检测一次
+    检测结果可以保存到项目缓存中，再次检查同一项目时直接复用
+    """
+
+    # 项目缓存 extra 中保存检测结果的键
+    PROJECT_EXTRA_KEY = "language_detection_cache"
+
+    # 最多保留的检测结果数量
+    MAX_SIZE = 50000
+
+    def __init__(self, max_size: int = MAX_SIZE) -> None:
+        self.lock = threading.Lock()
+        self.results = OrderedDict()
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+
+    def get(self, key: str) -> tuple[list[str], float, float] | None:
+        with self.lock:
+            result = self.results.get(key)
+            if result is not None:
+                self.results.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: tuple[list[str], float, float]) -> None:
+        with self.lock:
+            self.results[key] = result
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.results.clear()
+
+    # 从项目缓存中载入检测结果
+    def load_from_project(self, project) -> None:
+        data = project.get_extra(self.PROJECT_EXTRA_KEY) if project is not None else None
+        if not data:
+            return
+        with self.lock:
+            for key, (langs, score, raw_score) in data.items():
+                if key not in self.results:
+                    self.results[key] = (list(langs), score, raw_score)
+                    self.results.move_to_end(key, last=False)
+            while len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+
+    # 将项目文本的检测结果保存到项目缓存中，缓存中其他项目的结果不保存
+    def save_to_project(self, project, keys: set[str]) -> None:
+        if project is None:
+            return
+        with self.lock:
+            data = {}
+            for key in keys:
+                result = self.results.get(key)
+                if result is not None:
+                    langs, score, raw_score = result
+                    data[key] = [langs, score, raw_score]
+        project.set_extra(self.PROJECT_EXTRA_KEY, data)
+
+
+_LANG_DETECTION_CACHE = LanguageDetectionCache()
+"""语言检测结果缓存单例"""
+
+
+def get_lang_detection_cache() -> LanguageDetectionCache:
+    return _LANG_DETECTION_CACHE
+
+
 # 检测文本语言
 def detect_language_with_mediapipe(items: list[CacheItem], _start_index: int, _file_data: CacheFile | None) -> \
         list[tuple[list[str], float, float]]:
@@ -211,95 +293,115 @@ def detect_language_with_mediapipe(items: list[CacheItem], _start_index: int, _f
     Returns:
         list[tuple]: 每项对应的(语言代码, 置信度)列表
     """
-    # 初始化结果列表
-    results = []
-
-    # 获取语言检测器（只获取一次以提高效率）
-    detector = get_lang_detector()
-    
-    # 如果检测器不可用，返回默认结果
-    if detector is None:
-        for _ in items:
-            results.append((['un'], -1.0, -1.0))
-        return results
-
-    for item in items:
-        # 获取原文并清理
-        source_text = item.source_text
-        # 20250518 fix: 修复行不为字符串时的异常
-        if source_text is None or not isinstance(source_text, str) or not source_text.strip():
-            results.append((['no_text'], -1.0, -1.0))
-            continue
+    return detect_language_texts([item.source_text for item in items])
 
-        # 检测是否匹配目标正则
-        if HAS_UNUSUAL_ENG_REGEX.match(source_text.strip()):
-            results.append((['un'], -1.0, -1.0))
-            continue
 
-        cleaned_text = clean_text(source_text)
+def detect_language_texts(texts: list[str], used_keys: set[str] | None = None) -> list[tuple[list[str], float, float]]:
+    """批量检测文本语言，相同文本只检测一次，并复用缓存中的检测结果
 
-        # 检查是否只包含符号
-        if is_symbols_only(cleaned_text):
-            results.append((['symbols_only'], -1.0, -1.0))
-            continue
+    Args:
+        texts: 待检测的文本列表
+        used_keys: 不为 None 时，收集本次检测用到的缓存键
 
-        # 使用mediapipe的语言检测任务
-        no_symbols_text = remove_symbols(cleaned_text)
-        if not no_symbols_text:
-            results.append((['no_text'], -1.0, -1.0))
-            continue
+    Returns:
+        list[tuple]: 每个文本对应的(语言代码列表, 置信度, 原始置信度)
+    """
+    # 获取语言检测器（只获取一次以提高效率）
+    detector = get_lang_detector()
 
-        # 再次检查是否仅包含符号
-        if is_symbols_only(no_symbols_text):
-            results.append((['symbols_only_again'], -1.0, -1.0))
-            continue
+    # 如果检测器不可用，返回默认结果
+    if detector is None:
+        return [(['un'], -1.0, -1.0) for _ in texts]
 
-        # 再次检测是否匹配目标正则
-        if HAS_UNUSUAL_ENG_REGEX.match(no_symbols_text):
-            results.append((['un_again'], -1.0, -1.0))
+    # 去重后只检测缓存中没有的文本
+    results_by_text = {}
+    for text in texts:
+        if not isinstance(text, str) or text in results_by_text:
             continue
+        key = LanguageDetectionCache.get_key(text)
+        if used_keys is not None:
+            used_keys.add(key)
+        result = _LANG_DETECTION_CACHE.get(key)
+        if result is None:
+            result = _detect_text_language(detector, text)
+            # 检测出错的结果不缓存，下次重新检测
+            if result[0] != ['error']:
+                _LANG_DETECTION_CACHE.put(key, result)
+        results_by_text[text] = result
+
+    # 将结果分发回原来的位置
+    return [
+        results_by_text[text] if isinstance(text, str) else (['no_text'], -1.0, -1.0)
+        for text in texts
+    ]
+
+
+# 检测单个文本的语言
+def _detect_text_language(detector, source_text: str) -> tuple[list[str], float, float]:
+    # 20250518 fix: 修复行不为字符串时的异常
+    if not source_text.strip():
+        return ['no_text'], -1.0, -1.0
+
+    # 检测是否匹配目标正则
+    if HAS_UNUSUAL_ENG_REGEX.match(source_text.strip()):
+        return ['un'], -1.0, -1.0
+
+    cleaned_text = clean_text(source_text)
+
+    # 检查是否只包含符号
+    if is_symbols_only(cleaned_text):
+        return ['symbols_only'], -1.0, -1.0
+
+    # 使用mediapipe的语言检测任务
+    no_symbols_text = remove_symbols(cleaned_text)
+    if not no_symbols_text:
+        return ['no_text'], -1.0, -1.0
+
+    # 再次检查是否仅包含符号
+    if is_symbols_only(no_symbols_text):
+        return ['symbols_only_again'], -1.0, -1.0
+
+    # 再次检测是否匹配目标正则
+    if HAS_UNUSUAL_ENG_REGEX.match(no_symbols_text):
+        return ['un_again'], -1.0, -1.0
 
-        try:
-            lang_result = detector.detect(no_symbols_text).detections
-            if not lang_result:
-                results.append((['un'], -1.0, -1.0))
-            else:
-                raw_prob = lang_result[0].probability
-                first_prob = raw_prob
-                mediapipe_langs = [detection.language_code for detection in lang_result]
-
-                # 判断识别后的语言是否有非西文语言
-                has_non_latin = bool(set(mediapipe_langs) & set(NON_LATIN_ISO_CODES))
-                if has_non_latin:
-                    # 如果有非西文语言出现，去掉所有的英文字母与一些符号后再识别
-                    non_latin_text = re.sub(fr"[{VARIOUS_LETTERS_RANGE}'-]+", ' ', no_symbols_text)
-                    # 去除多余空格
-                    non_latin_text = re.sub(r'\s+', ' ', non_latin_text).strip()
-                    # 判断是否为空字符串，非空串才重新识别
-                    if non_latin_text:
-                        # 进行重新识别
-                        non_latin_lang_result = detector.detect(non_latin_text).detections
-                        # 如果有识别结果才重置结果
-                        if non_latin_lang_result:
-                            # 重置lang_result
-                            lang_result = non_latin_lang_result
-                            # 重置三个变量
-                            raw_prob = lang_result[0].probability
-                            first_prob = raw_prob
-                            mediapipe_langs = [detection.language_code for detection in lang_result]
-
-                # 如果有至少两个识别结果，则使用最高置信度减去第二个
-                if len(lang_result) >= 2:
-                    # 最终的mediapipe置信度
-                    first_prob -= lang_result[1].probability
-
-                results.append((mediapipe_langs, first_prob, raw_prob))
-        except Exception as e:
-            # 如果检测过程中出现异常，返回默认结果
-            rich.print(f"[[red]ERROR[/]] MediaPipe 语言检测出错: {e}")
-            results.append((['error'], -1.0, -1.0))
-
-    return results
+    try:
+        lang_result = detector.detect(no_symbols_text).detections
+        if not lang_result:
+            return ['un'], -1.0, -1.0
+
+        raw_prob = lang_result[0].probability
+        first_prob = raw_prob
+        mediapipe_langs = [detection.language_code for detection in lang_result]
+
+        # 判断识别后的语言是否有非西文语言
+        has_non_latin = bool(set(mediapipe_langs) & NON_LATIN_ISO_CODES_SET)
+        if has_non_latin:
+            # 如果有非西文语言出现，去掉所有的英文字母与一些符号后再识别
+            non_latin_text = remove_latin_letters(no_symbols_text)
+            # 判断是否为空字符串，非空串才重新识别
+            if non_latin_text:
+                # 进行重新识别
+                non_latin_lang_result = detector.detect(non_latin_text).detections
+                # 如果有识别结果才重置结果
+                if non_latin_lang_result:
+                    # 重置lang_result
+                    lang_result = non_latin_lang_result
+                    # 重置三个变量
+                    raw_prob = lang_result[0].probability
+                    first_prob = raw_prob
+                    mediapipe_langs = [detection.language_code for detection in lang_result]
+
+        # 如果有至少两个识别结果，则使用最高置信度减去第二个
+        if len(lang_result) >= 2:
+            # 最终的mediapipe置信度
+            first_prob -= lang_result[1].probability
+
+        return mediapipe_langs, first_prob, raw_prob
+    except Exception as e:
+        # 如果检测过程中出现异常，返回默认结果
+        rich.print(f"[[red]ERROR[/]] MediaPipe 语言检测出错: {e}")
+        return ['error'], -1.0, -1.0
 
 
 # def detect_language_with_onnx(items: list[CacheItem], _start_index: int, _file_data: CacheFile) -> \
@@ -514,6 +616,9 @@ def is_symbols_only(source_text: str):
 
 # 辅助函数，用于去除文字中的html标签
 def remove_html_tags(source_text):
+    # 不含标签与字符实体的文本无需解析
+    if '<' not in source_text and '&' not in source_text:
+        return source_text
     soup = BeautifulSoup(source_text, 'html.parser')
     return soup.get_text()
 
@@ -542,16 +647,27 @@ def remove_symbols(source_text):
     return source_text.strip()
 
 
+# 去掉所有的英文字母与一些符号
+def remove_latin_letters(source_text):
+    non_latin_text = LATIN_LETTERS_PATTERN.sub(' ', source_text)
+    # 去除多余空格
+    return WHITESPACES_PATTERN.sub(' ', non_latin_text).strip()
+
+
+# 清理后的检测文本，重复文本只处理一次
+@lru_cache(maxsize=65536)
+def _get_no_symbols_text(source_text):
+    return remove_symbols(clean_text(source_text))
+
+
 def make_final_detect_text(item: CacheItem):
-    no_symbols_text = remove_symbols(clean_text(item.source_text))
+    no_symbols_text = _get_no_symbols_text(item.source_text)
 
     langs = set([item.lang_code[0]] + item.lang_code[2])
-    has_non_latin = bool(langs & set(NON_LATIN_ISO_CODES))
+    has_non_latin = bool(langs & NON_LATIN_ISO_CODES_SET)
     if has_non_latin:
         # 如果有非西文语言出现，去掉所有的英文字母与一些符号后再识别
-        non_latin_text = re.sub(fr"[{VARIOUS_LETTERS_RANGE}'-]+", ' ', no_symbols_text)
-        # 去除多余空格
-        return re.sub(r'\s+', ' ', non_latin_text).strip()
+        return remove_latin_letters(no_symbols_text)
     return no_symbols_text
 
 
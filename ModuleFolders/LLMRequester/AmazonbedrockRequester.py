@@ -6,7 +6,7 @@ from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 # 接口请求器
 class AmazonbedrockRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_error = None  # 最近一次请求的异常
 
     # 发起请求
     def request_amazonbedrock(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
@@ -41,6 +41,7 @@ class AmazonbedrockRequester(Base):
             response_content = response.content[0].text
         except Exception as e:
             self.error(f"翻译任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
             return True, None, None, None, None
 
         # 获取指令消耗
@@ -87,6 +88,7 @@ class AmazonbedrockRequester(Base):
             response_content = response["output"]["message"]["content"][0]["text"]
         except Exception as e:
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
             return True, None, None, None, None
 
         # 获取指令消耗
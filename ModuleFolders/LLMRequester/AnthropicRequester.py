@@ -10,31 +10,12 @@ def is_claude3_model(model_name):
 # 接口请求器
 class AnthropicRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_error = None  # 最近一次请求的异常
 
     # 发起请求
     def request_anthropic(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
         try:
-            model_name = platform_config.get("model_name")
-            request_timeout = platform_config.get("request_timeout", 60)
-            temperature = platform_config.get("temperature", 1.0)
-            top_p = platform_config.get("top_p", 1.0)
-            think_switch = platform_config.get("think_switch")
-            think_depth = platform_config.get("think_depth")
-
-
-
-            # 参数基础配置
-            base_params = {
-                "model": model_name,
-                "system": system_prompt,
-                "messages": messages,
-                "temperature": temperature,
-                "top_p": top_p,
-                "timeout": request_timeout,
-                "max_tokens": 4096 if is_claude3_model(model_name) else 20000
-            }
-
+            base_params = self.build_params(messages, system_prompt, platform_config)
 
             # 从工厂获取客户端
             client = LLMClientFactory().get_anthropic_client(platform_config)
@@ -42,15 +23,53 @@ class AnthropicRequester(Base):
             # 发送请求
             response = client.messages.create(**base_params)
 
+            return self.parse_response(response)
+        except Exception as e:
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
+            return True, None, None, None, None
+
+    # 发起异步请求
+    async def request_anthropic_async(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
+        try:
+            base_params = self.build_params(messages, system_prompt, platform_config)
+
+            # 从工厂获取异步客户端
+            client = LLMClientFactory().get_anthropic_async_client(platform_config)
 
-            # 提取回复的文本内容
-            response_think = ""
-            response_content = response.content[0].text
+            # 发送请求
+            response = await client.messages.create(**base_params)
 
+            return self.parse_response(response)
         except Exception as e:
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
             return True, None, None, None, None
 
+    # 构建请求参数
+    def build_params(self, messages, system_prompt, platform_config) -> dict:
+        model_name = platform_config.get("model_name")
+        request_timeout = platform_config.get("request_timeout", 60)
+        temperature = platform_config.get("temperature", 1.0)
+        top_p = platform_config.get("top_p", 1.0)
+
+        # 参数基础配置
+        return {
+            "model": model_name,
+            "system": system_prompt,
+            "messages": messages,
+            "temperature": temperature,
+            "top_p": top_p,
+            "timeout": request_timeout,
+            "max_tokens": 4096 if is_claude3_model(model_name) else 20000
+        }
+
+    # 解析回复
+    def parse_response(self, response) -> tuple[bool, str, str, int, int]:
+        # 提取回复的文本内容
+        response_think = ""
+        response_content = response.content[0].text
+
         # 获取指令消耗
         try:
             prompt_tokens = int(response.usage.prompt_tokens)
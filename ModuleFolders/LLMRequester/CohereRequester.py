@@ -5,7 +5,7 @@ from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 # 接口请求器
 class CohereRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_error = None  # 最近一次请求的异常
 
     # 发起请求
     def request_cohere(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
@@ -44,6 +44,7 @@ class CohereRequester(Base):
             response_content = response.message.content[0].text
         except Exception as e:
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
             return True, None, None, None, None
 
         # 获取指令消耗
@@ -5,7 +5,7 @@ from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 # 因为各家思考模式的开关设置不同.............................
 class DashscopeRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_error = None  # 最近一次请求的异常
 
     # 发起请求
     def request_openai(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
@@ -89,6 +89,7 @@ class DashscopeRequester(Base):
 
         except Exception as e:
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
             return True, None, None, None, None
 
         # 获取指令消耗
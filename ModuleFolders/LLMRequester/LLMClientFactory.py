@@ -1,8 +1,9 @@
 # LLMClientFactory.py
+import asyncio
 import threading
 from typing import Dict, Any
 import httpx
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import anthropic
 import boto3
 import cohere
@@ -10,7 +11,7 @@ from google import genai
 import json
 
 
-def create_httpx_client(
+def _build_httpx_client_kwargs(
         http2=True,
         max_connections=256,
         max_keepalive_connections=128,
@@ -18,20 +19,7 @@ def create_httpx_client(
         proxy=None,
         **kwargs
 ):
-    """
-    创建配置好的HTTP客户端
-
-    参数:
-        http2: 是否启用HTTP/2
-        max_connections: 最大并发连接数
-        max_keepalive_connections: 最大保持活跃的连接数
-        keepalive_expiry: 连接保持活跃的秒数
-        proxy: 代理设置，支持字符串或字典格式
-        **kwargs: 传递给httpx.Client的其他参数
-
-    返回:
-        配置好的httpx.Client实例
-    """
+    """构建同步与异步HTTP客户端共用的参数"""
     client_kwargs = {
         "http2": http2,
         "limits": httpx.Limits(
@@ -55,8 +43,55 @@ def create_httpx_client(
                 client_kwargs["proxy"] = proxy["https"]
             elif "url" in proxy:
                 client_kwargs["proxy"] = proxy["url"]
-    
-    return httpx.Client(**client_kwargs)
+
+    return client_kwargs
+
+
+def create_httpx_client(
+        http2=True,
+        max_connections=256,
+        max_keepalive_connections=128,
+        keepalive_expiry=30,
+        proxy=None,
+        **kwargs
+):
+    """
+    创建配置好的HTTP客户端
+
+    参数:
+        http2: 是否启用HTTP/2
+        max_connections: 最大并发连接数
+        max_keepalive_connections: 最大保持活跃的连接数
+        keepalive_expiry: 连接保持活跃的秒数
+        proxy: 代理设置，支持字符串或字典格式
+        **kwargs: 传递给httpx.Client的其他参数
+
+    返回:
+        配置好的httpx.Client实例
+    """
+    return httpx.Client(**_build_httpx_client_kwargs(
+        http2, max_connections, max_keepalive_connections, keepalive_expiry, proxy, **kwargs
+    ))
+
+
+def create_async_httpx_client(
+        http2=True,
+        max_connections=1024,
+        max_keepalive_connections=512,
+        keepalive_expiry=30,
+        proxy=None,
+        **kwargs
+):
+    """
+    创建配置好的异步HTTP客户端，参数同 create_httpx_client
+    异步模式下单个事件循环承载大量并发请求，因此默认连接池更大
+
+    返回:
+        配置好的httpx.AsyncClient实例
+    """
+    return httpx.AsyncClient(**_build_httpx_client_kwargs(
+        http2, max_connections, max_keepalive_connections, keepalive_expiry, proxy, **kwargs
+    ))
 
 
 class LLMClientFactory:
@@ -105,6 +140,39 @@ class LLMClientFactory:
         key = ("anthropic", api_url, api_key)
         return self._get_cached_client(key, lambda: self._create_anthropic_client(config))
 
+    # 异步客户端与创建时所在的事件循环绑定，因此缓存键中包含当前事件循环
+    def get_openai_async_client(self, config: Dict[str, Any]) -> AsyncOpenAI:
+        """获取异步OpenAI客户端"""
+        api_key = config.get("api_key")
+        api_url = config.get("api_url")
+        key = ("openai_async", api_url, api_key, asyncio.get_running_loop())
+        return self._get_cached_client(key, lambda: self._create_openai_async_client(config, api_key))
+
+    def get_openai_async_client_local(self, config: Dict[str, Any]) -> AsyncOpenAI:
+        """获取异步OpenAI客户端"""
+        api_key = config.get("api_key")
+        if not api_key:
+            api_key = "none_api_key"
+        api_url = config.get("api_url")
+        key = ("openai_local_async", api_url, api_key, asyncio.get_running_loop())
+        return self._get_cached_client(key, lambda: self._create_openai_async_client(config, api_key))
+
+    def get_openai_async_client_sakura(self, config: Dict[str, Any]) -> AsyncOpenAI:
+        """获取异步OpenAI客户端"""
+        api_key = config.get("api_key")
+        if not api_key:
+            api_key = "none_api_key"
+        api_url = config.get("api_url")
+        key = ("openai_sakura_async", api_url, api_key, asyncio.get_running_loop())
+        return self._get_cached_client(key, lambda: self._create_openai_async_client(config, api_key))
+
+    def get_anthropic_async_client(self, config: Dict[str, Any]) -> anthropic.AsyncAnthropic:
+        """获取异步Anthropic客户端"""
+        api_key = config.get("api_key")
+        api_url = config.get("api_url")
+        key = ("anthropic_async", api_url, api_key, asyncio.get_running_loop())
+        return self._get_cached_client(key, lambda: self._create_anthropic_async_client(config))
+
     def get_anthropic_bedrock(self, config: Dict[str, Any]) -> anthropic.AnthropicBedrock:
         """获取AnthropicBedrock客户端"""
         region = config.get("region")
@@ -164,6 +232,24 @@ class LLMClientFactory:
             http_client=create_httpx_client(proxy=proxy)
         )
 
+    def _create_openai_async_client(self, config, api_key):
+        # 获取代理配置
+        proxy = self._get_proxy_config(config)
+        return AsyncOpenAI(
+            base_url=config.get("api_url"),
+            api_key=api_key,
+            http_client=create_async_httpx_client(proxy=proxy)
+        )
+
+    def _create_anthropic_async_client(self, config):
+        # 获取代理配置
+        proxy = self._get_proxy_config(config)
+        return anthropic.AsyncAnthropic(
+            base_url=config.get("api_url"),
+            api_key=config.get("api_key"),
+            http_client=create_async_httpx_client(proxy=proxy)
+        )
+
     def _create_anthropic_bedrock(self, config):
         # 获取代理配置
         proxy = self._get_proxy_config(config)
@@ -234,7 +320,7 @@ class LLMClientFactory:
         try:
             from Base.Base import Base
             base = Base()
-            global_config = base.load_config()
+            global_config = base.get_config_snapshot()
             
             # 检查全局代理是否启用
             if global_config.get("proxy_enable", False):
@@ -1,3 +1,6 @@
+import time
+import asyncio
+
 from ModuleFolders.LLMRequester.SakuraRequester import SakuraRequester
 from ModuleFolders.LLMRequester.LocalLLMRequester import LocalLLMRequester
 from ModuleFolders.LLMRequester.CohereRequester import CohereRequester
@@ -6,74 +9,132 @@ from ModuleFolders.LLMRequester.AnthropicRequester import AnthropicRequester
 from ModuleFolders.LLMRequester.AmazonbedrockRequester import AmazonbedrockRequester
 from ModuleFolders.LLMRequester.OpenaiRequester import OpenaiRequester
 from ModuleFolders.LLMRequester.DashscopeRequester import DashscopeRequester
+from ModuleFolders.LLMRequester.RequestErrorType import RequestErrorType
 
 # 接口请求器
 class LLMRequester():
     def __init__(self) -> None:
-        pass
+        # 最近一次请求的耗时与错误类型，供自适应并发控制使用
+        self.last_latency = 0.0
+        self.last_error_type = RequestErrorType.NONE
 
     # 分发请求
-    def sent_request(self, messages: list[dict], system_prompt: str, platform_config: dict) -> tuple[bool, str, str, int, int]:
+    def sent_request(self, messages: list[dict], system_prompt: str, platform_config: dict, stream_checker = None) -> tuple[bool, str, str, int, int]:
+        """stream_checker 不为空时，OpenAI 兼容格式的接口使用流式请求，检查未通过时提前中止"""
         # 获取平台参数
         target_platform = platform_config.get("target_platform")
         api_format = platform_config.get("api_format")
 
         # 发起请求
+        start_time = time.time()
         if target_platform == "sakura":
-            sakura_requester = SakuraRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = sakura_requester.request_sakura(
+            requester = SakuraRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_sakura(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "LocalLLM":
-            local_llm_requester = LocalLLMRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = local_llm_requester.request_LocalLLM(
+            requester = LocalLLMRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_LocalLLM(
                 messages,
                 system_prompt,
                 platform_config,
+                stream_checker,
             )
         elif target_platform == "cohere":
-            cohere_requester = CohereRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = cohere_requester.request_cohere(
+            requester = CohereRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_cohere(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "google" or (target_platform.startswith("custom_platform_") and api_format == "Google"):
-            google_requester = GoogleRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = google_requester.request_google(
+            requester = GoogleRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_google(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "anthropic" or (target_platform.startswith("custom_platform_") and api_format == "Anthropic"):
-            anthropic_requester = AnthropicRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = anthropic_requester.request_anthropic(
+            requester = AnthropicRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_anthropic(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "amazonbedrock":
-            amazonbedrock_requester = AmazonbedrockRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = amazonbedrock_requester.request_amazonbedrock(
+            requester = AmazonbedrockRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_amazonbedrock(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "dashscope":
-            dashscope_requester = DashscopeRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = dashscope_requester.request_openai(
+            requester = DashscopeRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_openai(
                 messages,
                 system_prompt,
                 platform_config,
             )
         else:
-            openai_requester = OpenaiRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = openai_requester.request_openai(
+            requester = OpenaiRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_openai(
+                messages,
+                system_prompt,
+                platform_config,
+                stream_checker,
+            )
+
+        # 记录请求耗时与错误类型
+        self.last_latency = time.time() - start_time
+        self.last_error_type = RequestErrorType.classify(getattr(requester, "last_error", None)) if skip else RequestErrorType.NONE
+
+        return skip, response_think, response_content, prompt_tokens, completion_tokens
+
+    # 异步分发请求，仅 OpenAI 兼容格式与 Anthropic 格式的接口使用异步客户端，其余接口在线程中执行同步请求
+    async def sent_request_async(self, messages: list[dict], system_prompt: str, platform_config: dict, stream_checker = None) -> tuple[bool, str, str, int, int]:
+        # 获取平台参数
+        target_platform = platform_config.get("target_platform")
+        api_format = platform_config.get("api_format")
+
+        # 发起请求
+        start_time = time.time()
+        if target_platform == "sakura":
+            requester = SakuraRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = await requester.request_sakura_async(
                 messages,
                 system_prompt,
                 platform_config,
             )
+        elif target_platform == "LocalLLM":
+            requester = LocalLLMRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = await requester.request_LocalLLM_async(
+                messages,
+                system_prompt,
+                platform_config,
+                stream_checker,
+            )
+        elif target_platform == "anthropic" or (target_platform.startswith("custom_platform_") and api_format == "Anthropic"):
+            requester = AnthropicRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = await requester.request_anthropic_async(
+                messages,
+                system_prompt,
+                platform_config,
+            )
+        elif target_platform in ("cohere", "google", "amazonbedrock", "dashscope") or (target_platform.startswith("custom_platform_") and api_format == "Google"):
+            return await asyncio.to_thread(self.sent_request, messages, system_prompt, platform_config, stream_checker)
+        else:
+            requester = OpenaiRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = await requester.request_openai_async(
+                messages,
+                system_prompt,
+                platform_config,
+                stream_checker,
+            )
+
+        # 记录请求耗时与错误类型
+        self.last_latency = time.time() - start_time
+        self.last_error_type = RequestErrorType.classify(getattr(requester, "last_error", None)) if skip else RequestErrorType.NONE
 
         return skip, response_think, response_content, prompt_tokens, completion_tokens
@@ -1,108 +1,159 @@
 from Base.Base import Base
 from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
+from ModuleFolders.LLMRequester.RequestErrorType import StreamAbortedError
+from ModuleFolders.LLMRequester.StreamCollector import StreamCollector
 
 
 # 接口请求器
 class OpenaiRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_error = None  # 最近一次请求的异常
 
     # 发起请求
-    def request_openai(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
+    def request_openai(self, messages, system_prompt, platform_config, stream_checker = None) -> tuple[bool, str, str, int, int]:
         try:
-            # 获取具体配置
-            model_name = platform_config.get("model_name")
-            request_timeout = platform_config.get("request_timeout", 60)
-            temperature = platform_config.get("temperature", 1.0)
-            top_p = platform_config.get("top_p", 1.0)
-            presence_penalty = platform_config.get("presence_penalty", 0)
-            frequency_penalty = platform_config.get("frequency_penalty", 0)
-            extra_body = platform_config.get("extra_body", "{}")
-            think_switch = platform_config.get("think_switch")
-            think_depth = platform_config.get("think_depth")
-
-            # 插入系统消息
-            if system_prompt:
-                messages.insert(
-                    0,
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    })
+            base_params = self.build_params(messages, system_prompt, platform_config)
 
             # 从工厂获取客户端
             client = LLMClientFactory().get_openai_client(platform_config)
 
-            # 针对ds模型的特殊处理，因为该模型不支持模型预输入回复
-            if 'deepseek' in model_name.lower():
-                # 检查一下最后的消息是否用户消息，以免误删。(用户使用了推理模型卻不切换为推理模型提示词的情况)
-                if messages and isinstance(messages[-1], dict) and messages[-1].get('role') != 'user':
-                    messages = messages[:-1]  # 移除最后一个元素
-
-
-            # 参数基础配置
-            base_params = {
-                "extra_body": extra_body,
-                "model": model_name,
-                "messages": messages,
-                "timeout": request_timeout,
-                "stream": False
-            }
-
-            # 按需添加参数
-            if temperature != 1:
-                base_params.update({
-                    "temperature": temperature,
-                })
-
-            if top_p != 1:
-                base_params.update({
-                    "top_p": top_p,
-                })
-
-            if presence_penalty != 0:
-                base_params.update({
-                    "presence_penalty": presence_penalty,
-                })
+            # 发起请求
+            # 流式请求，检查未通过时提前中止
+            if stream_checker is not None:
+                return self.request_stream(client, base_params, stream_checker)
 
-            if frequency_penalty != 0:
-                base_params.update({
-                    "frequency_penalty": frequency_penalty
-                })
+            response = client.chat.completions.create(**base_params)
 
+            return self.parse_response(response)
+        except Exception as e:
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
+            return True, None, None, None, None
 
-            # 开启思考开关时添加参数
-            if think_switch:
-                base_params.update({
-                    "reasoning_effort": think_depth
-                })
+    # 发起异步请求
+    async def request_openai_async(self, messages, system_prompt, platform_config, stream_checker = None) -> tuple[bool, str, str, int, int]:
+        try:
+            base_params = self.build_params(messages, system_prompt, platform_config)
 
+            # 从工厂获取异步客户端
+            client = LLMClientFactory().get_openai_async_client(platform_config)
 
             # 发起请求
-            response = client.chat.completions.create(**base_params)
-
+            # 流式请求，检查未通过时提前中止
+            if stream_checker is not None:
+                return await self.request_stream_async(client, base_params, stream_checker)
 
-            # 提取回复内容
-            message = response.choices[0].message
-
-            # 自适应提取推理过程
-            if "</think>" in message.content:
-                splited = message.content.split("</think>")
-                response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n")
-                response_content = splited[-1]
-            else:
-                try:
-                    response_think = message.reasoning_content
-                    if not response_think:
-                        response_think = ""
-                except Exception:
-                    response_think = ""
-                response_content = message.content
+            response = await client.chat.completions.create(**base_params)
 
+            return self.parse_response(response)
         except Exception as e:
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
             return True, None, None, None, None
 
+    # 发起流式请求
+    def request_stream(self, client, base_params, stream_checker) -> tuple[bool, str, str, int, int]:
+        result = StreamCollector(stream_checker).collect(client, base_params)
+        if result[0]:
+            self.warning(f"流式检查未通过，已提前中止请求 - {stream_checker.error}")
+            self.last_error = StreamAbortedError(stream_checker.error)
+        return result
+
+    # 发起异步流式请求
+    async def request_stream_async(self, client, base_params, stream_checker) -> tuple[bool, str, str, int, int]:
+        result = await StreamCollector(stream_checker).collect_async(client, base_params)
+        if result[0]:
+            self.warning(f"流式检查未通过，已提前中止请求 - {stream_checker.error}")
+            self.last_error = StreamAbortedError(stream_checker.error)
+        return result
+
+    # 构建请求参数
+    def build_params(self, messages, system_prompt, platform_config) -> dict:
+        # 获取具体配置
+        model_name = platform_config.get("model_name")
+        request_timeout = platform_config.get("request_timeout", 60)
+        temperature = platform_config.get("temperature", 1.0)
+        top_p = platform_config.get("top_p", 1.0)
+        presence_penalty = platform_config.get("presence_penalty", 0)
+        frequency_penalty = platform_config.get("frequency_penalty", 0)
+        extra_body = platform_config.get("extra_body", "{}")
+        think_switch = platform_config.get("think_switch")
+        think_depth = platform_config.get("think_depth")
+
+        # 插入系统消息
+        if system_prompt:
+            messages.insert(
+                0,
+                {
+                    "role": "system",
+                    "content": system_prompt
+                })
+
+        # 针对ds模型的特殊处理，因为该模型不支持模型预输入回复
+        if 'deepseek' in model_name.lower():
+            # 检查一下最后的消息是否用户消息，以免误删。(用户使用了推理模型卻不切换为推理模型提示词的情况)
+            if messages and isinstance(messages[-1], dict) and messages[-1].get('role') != 'user':
+                messages = messages[:-1]  # 移除最后一个元素
+
+
+        # 参数基础配置
+        base_params = {
+            "extra_body": extra_body,
+            "model": model_name,
+            "messages": messages,
+            "timeout": request_timeout,
+            "stream": False
+        }
+
+        # 按需添加参数
+        if temperature != 1:
+            base_params.update({
+                "temperature": temperature,
+            })
+
+        if top_p != 1:
+            base_params.update({
+                "top_p": top_p,
+            })
+
+        if presence_penalty != 0:
+            base_params.update({
+                "presence_penalty": presence_penalty,
+            })
+
+        if frequency_penalty != 0:
+            base_params.update({
+                "frequency_penalty": frequency_penalty
+            })
+
+
+        # 开启思考开关时添加参数
+        if think_switch:
+            base_params.update({
+                "reasoning_effort": think_depth
+            })
+
+        return base_params
+
+    # 解析回复
+    def parse_response(self, response) -> tuple[bool, str, str, int, int]:
+        # 提取回复内容
+        message = response.choices[0].message
+
+        # 自适应提取推理过程
+        if "</think>" in message.content:
+            splited = message.content.split("</think>")
+            response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n")
+            response_content = splited[-1]
+        else:
+            try:
+                response_think = message.reasoning_content
+                if not response_think:
+                    response_think = ""
+            except Exception:
+                response_think = ""
+            response_content = message.content
+
         # 获取指令消耗
         try:
             prompt_tokens = int(response.usage.prompt_tokens)
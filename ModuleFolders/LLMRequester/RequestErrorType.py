@@ -0,0 +1,67 @@
+import socket
+
+
+# 流式检查未通过、请求被提前中止
+class StreamAbortedError(Exception):
+    pass
+
+
+class RequestErrorType():
+
+    NONE = ""
+    RATE_LIMIT = "rate_limit"    # 触发接口限流（429 等）
+    TIMEOUT = "timeout"          # 请求超时
+    AUTH = "auth"                # 密钥无效、无权限或余额耗尽（401、403 等）
+    ERROR = "error"              # 其他错误
+
+    # 各接口 SDK 的限流、超时与鉴权异常类名关键字
+    RATE_LIMIT_KEYWORDS = ("ratelimit", "toomanyrequests", "throttling", "resourceexhausted")
+    TIMEOUT_KEYWORDS = ("timeout", "timedout")
+    AUTH_KEYWORDS = ("authentication", "permissiondenied", "unauthorized")
+
+    # 根据请求异常判断错误类型
+    @classmethod
+    def classify(cls, e: Exception) -> str:
+        if e is None:
+            return cls.NONE
+
+        # 回复内容异常而中止，与接口状态无关
+        if isinstance(e, StreamAbortedError):
+            return cls.ERROR
+
+        # 额度耗尽时部分接口同样返回 429，但短时间内无法恢复
+        message = str(e).lower()
+        if "insufficient_quota" in message or "insufficient balance" in message:
+            return cls.AUTH
+
+        # 优先使用异常中携带的状态码
+        for attr in ("status_code", "status", "code", "http_status"):
+            status = getattr(e, attr, None)
+            if status in (401, 402, 403, "401", "402", "403"):
+                return cls.AUTH
+            if status == 429 or status == "429":
+                return cls.RATE_LIMIT
+            if status in (408, 504, "408", "504"):
+                return cls.TIMEOUT
+
+        # 其次根据异常类型判断
+        if isinstance(e, (TimeoutError, socket.timeout)):
+            return cls.TIMEOUT
+        for type_ in type(e).__mro__:
+            name = type_.__name__.lower()
+            if any(keyword in name for keyword in cls.RATE_LIMIT_KEYWORDS):
+                return cls.RATE_LIMIT
+            if any(keyword in name for keyword in cls.TIMEOUT_KEYWORDS):
+                return cls.TIMEOUT
+            if any(keyword in name for keyword in cls.AUTH_KEYWORDS):
+                return cls.AUTH
+
+        # 最后根据错误信息判断
+        if "429" in message or "rate limit" in message or "too many requests" in message:
+            return cls.RATE_LIMIT
+        if "timed out" in message or "timeout" in message:
+            return cls.TIMEOUT
+        if "401" in message or "invalid api key" in message or "incorrect api key" in message:
+            return cls.AUTH
+
+        return cls.ERROR
@@ -5,50 +5,77 @@ from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 # 接口请求器
 class SakuraRequester(Base):
     def __init__(self):
-        pass
+        self.last_error = None  # 最近一次请求的异常
 
     # 发起请求
     def request_sakura(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
         try:
-            model_name = platform_config.get("model_name")
-            request_timeout = platform_config.get("request_timeout", 60)
-            temperature = platform_config.get("temperature", 0.1)
-            top_p = platform_config.get("top_p", 0.3)
-            frequency_penalty = platform_config.get("frequency_penalty", 0)
-
-            # 插入系统消息
-            if system_prompt:
-                messages.insert(
-                    0,
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    })
+            base_params = self.build_params(messages, system_prompt, platform_config)
 
             # 从工厂获取客户端
             client = LLMClientFactory().get_openai_client_sakura(platform_config)
 
-            response = client.chat.completions.create(
-                model=model_name,
-                messages=messages,
-                top_p=top_p,
-                temperature=temperature,
-                frequency_penalty=frequency_penalty,
-                timeout=request_timeout,
-                max_tokens=512,
-                extra_query={
-                    "do_sample": True,
-                    "num_beams": 1,
-                    "repetition_penalty": 1.0
-                },
-            )
-
-            # 提取回复的文本内容
-            response_content = response.choices[0].message.content
+            response = client.chat.completions.create(**base_params)
+
+            return self.parse_response(response)
         except Exception as e:
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
             return True, None, None, None, None
 
+    # 发起异步请求
+    async def request_sakura_async(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
+        try:
+            base_params = self.build_params(messages, system_prompt, platform_config)
+
+            # 从工厂获取异步客户端
+            client = LLMClientFactory().get_openai_async_client_sakura(platform_config)
+
+            response = await client.chat.completions.create(**base_params)
+
+            return self.parse_response(response)
+        except Exception as e:
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            self.last_error = e
+            return True, None, None, None, None
+
+    # 构建请求参数
+    def build_params(self, messages, system_prompt, platform_config) -> dict:
+        model_name = platform_config.get("model_name")
+        request_timeout = platform_config.get("request_timeout", 60)
+        temperature = platform_config.get("temperature", 0.1)
+        top_p = platform_config.get("top_p", 0.3)
+        frequency_penalty = platform_config.get("frequency_penalty", 0)
+
+        # 插入系统消息
+        if system_prompt:
+            messages.insert(
+                0,
+                {
+                    "role": "system",
+                    "content": system_prompt
+                })
+
+        return {
+            "model": model_name,
+            "messages": messages,
+            "top_p": top_p,
+            "temperature": temperature,
+            "frequency_penalty": frequency_penalty,
+            "timeout": request_timeout,
+            "max_tokens": 512,
+            "extra_query": {
+                "do_sample": True,
+                "num_beams": 1,
+                "repetition_penalty": 1.0
+            },
+        }
+
+    # 解析回复
+    def parse_response(self, response) -> tuple[bool, str, str, int, int]:
+        # 提取回复的文本内容
+        response_content = response.choices[0].message.content
+
         # 获取指令消耗
         try:
             prompt_tokens = int(response.usage.prompt_tokens)
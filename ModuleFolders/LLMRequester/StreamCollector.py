@@ -0,0 +1,127 @@
+from ModuleFolders.RequestLimiter import TokenCounter
+from ModuleFolders.ResponseChecker.StreamChecker import StreamChecker
+
+
+# 流式回复收集器
+class StreamCollector():
+    """
+    收集 OpenAI 兼容接口的流式回复片段，每个片段到达时交给流式检查器检查，
+    检查未通过时关闭连接提前中止请求，并返回已收到的部分内容与消耗
+    部分自建接口不接受 stream_options 参数，报错提到该参数时去掉该参数重试，并记住该接口地址
+    """
+
+    # 不接受 stream_options 参数的接口地址，之后的请求不再发送该参数
+    usage_unsupported_urls = set()
+
+    # 接口拒绝 stream_options 参数时错误信息中会出现的关键词
+    USAGE_PARAM_KEYWORDS = ("stream_options", "include_usage")
+
+    def __init__(self, stream_checker: StreamChecker) -> None:
+        self.stream_checker = stream_checker
+        self.think_parts = []
+        self.content_parts = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.error = ""
+
+    # 流式请求参数，include_usage 为 True 时要求接口在最后一个片段中返回消耗
+    @staticmethod
+    def build_stream_params(base_params: dict, include_usage: bool = True) -> dict:
+        params = dict(base_params)
+        params["stream"] = True
+        if include_usage:
+            params["stream_options"] = {"include_usage": True}
+        return params
+
+    # 接口是否接受 stream_options 参数
+    @classmethod
+    def supports_usage(cls, client) -> bool:
+        return str(getattr(client, "base_url", "")) not in cls.usage_unsupported_urls
+
+    # 请求是否因为 stream_options 参数被拒绝，拒绝时记住该接口地址
+    @classmethod
+    def reject_usage(cls, client, e: Exception) -> bool:
+        # 只有错误信息中提到了该参数才回退，其他请求错误照常抛出
+        error_text = f"{e} {getattr(e, 'body', '') or ''}".lower()
+        if not any(keyword in error_text for keyword in cls.USAGE_PARAM_KEYWORDS):
+            return False
+        cls.usage_unsupported_urls.add(str(getattr(client, "base_url", "")))
+        return True
+
+    def open_stream(self, client, base_params: dict):
+        if self.supports_usage(client):
+            try:
+                return client.chat.completions.create(**self.build_stream_params(base_params))
+            except Exception as e:
+                if not self.reject_usage(client, e):
+                    raise
+        return client.chat.completions.create(**self.build_stream_params(base_params, False))
+
+    async def open_stream_async(self, client, base_params: dict):
+        if self.supports_usage(client):
+            try:
+                return await client.chat.completions.create(**self.build_stream_params(base_params))
+            except Exception as e:
+                if not self.reject_usage(client, e):
+                    raise
+        return await client.chat.completions.create(**self.build_stream_params(base_params, False))
+
+    # 处理一个回复片段，需要中止请求时返回 False
+    def feed_chunk(self, chunk) -> bool:
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self.prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+            self.completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+
+        if not chunk.choices:
+            return True
+        delta = chunk.choices[0].delta
+
+        think = getattr(delta, "reasoning_content", None)
+        if think:
+            self.think_parts.append(think)
+            self.error = self.stream_checker.feed_think(think)
+
+        content = getattr(delta, "content", None)
+        if content and not self.error:
+            self.content_parts.append(content)
+            self.error = self.stream_checker.feed_content(content)
+
+        return not self.error
+
+    def collect(self, client, base_params: dict) -> tuple[bool, str, str, int, int]:
+        stream = self.open_stream(client, base_params)
+        try:
+            for chunk in stream:
+                if not self.feed_chunk(chunk):
+                    break
+        finally:
+            stream.close()
+        return self.get_result()
+
+    async def collect_async(self, client, base_params: dict) -> tuple[bool, str, str, int, int]:
+        stream = await self.open_stream_async(client, base_params)
+        try:
+            async for chunk in stream:
+                if not self.feed_chunk(chunk):
+                    break
+        finally:
+            await stream.close()
+        return self.get_result()
+
+    # 整理收到的内容，返回值与非流式请求一致
+    def get_result(self) -> tuple[bool, str, str, int, int]:
+        response_think = "".join(self.think_parts)
+        response_content = "".join(self.content_parts)
+
+        # 自适应提取推理过程
+        if "</think>" in response_content:
+            splited = response_content.split("</think>")
+            response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n")
+            response_content = splited[-1]
+
+        # 中止请求时接口不会返回消耗，按已收到的内容估算
+        if not self.completion_tokens:
+            self.completion_tokens = TokenCounter.count_tokens("".join(self.think_parts) + "".join(self.content_parts))
+
+        return bool(self.error), response_think, response_content, self.prompt_tokens, self.completion_tokens
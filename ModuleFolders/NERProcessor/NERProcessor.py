@@ -13,6 +13,15 @@ class NERProcessor(Base):
                         "|","ｰ","%","if","Lv","(","\\","]","[","◆",":","_","ｗｗｗ","、","ぁぁ","んえ","んんん",
                     )
 
+    # 每批送入模型的文本数量
+    BATCH_SIZE = 256
+
+    # 识别使用的进程数，大于 1 时由 spaCy 启动子进程并行识别
+    N_PROCESS = 1
+
+    # 每处理多少条文本报告一次进度
+    PROGRESS_INTERVAL = 500
+
     def __init__(self):
         super().__init__()
         self.nlp_models = {}
@@ -50,20 +59,71 @@ class NERProcessor(Base):
             self.info(f"模型 {model_name} 加载成功。")
             return nlp
 
-    def _deduplicate_results(self, results: list) -> list:
+    def _collect_texts(self, items_data: list) -> tuple[list, list]:
+        """
+        对原文去重，重复的文本只需识别一次。
+        返回按首次出现顺序排列的文本列表，以及每条文本首次出现时所在的文件路径。
+        """
+        texts = []
+        file_paths = []
+        seen = set()
+        for item_data in items_data:
+            source_text = item_data.get("source_text")
+            if not source_text or not source_text.strip() or source_text in seen:
+                continue
+            seen.add(source_text)
+            texts.append(source_text)
+            file_paths.append(item_data.get("file_path"))
+        return texts, file_paths
+
+    def _iter_entities(self, nlp, texts: list, entity_types: set, batch_size: int, n_process: int, on_progress = None):
         """
-        对提取的术语列表进行去重。
+        使用 nlp.pipe 批量识别实体，逐个产出 (术语, 类型, 文本序号)。
+        多进程识别失败时（例如模型无法在子进程中加载），从中断处改为单进程继续。
+        """
+        total = len(texts)
+        processed = 0
+        found = 0
+        while processed < total:
+            try:
+                docs = nlp.pipe(texts[processed:], batch_size=batch_size, n_process=n_process)
+                for doc in docs:
+                    for ent in doc.ents:
+                        if ent.label_ in entity_types:
+                            found += 1
+                            yield ent.text, ent.label_, processed
+
+                    processed += 1
+                    if processed % self.PROGRESS_INTERVAL == 0 or processed == total:
+                        self.info(f"实体识别进度: {processed}/{total}...")
+                        if on_progress:
+                            on_progress(processed, total, found)
+            except Exception as e:
+                if n_process == 1:
+                    raise
+                self.warning(f"多进程实体识别失败，改为单进程继续: {e}")
+                n_process = 1
+
+    def _deduplicate_results(self, results: list, texts: list, file_paths: list) -> list:
+        """
+        对提取的术语列表进行去重，并为保留的术语填充上下文。
         去重逻辑: 基于小写的术语文本和实体类型。
+        原始结果只记录文本序号，上下文直接引用去重后的文本。
         """
         self.info(f"初步提取到 {len(results)} 个实体。正在去重...")
         
         unique_results = []
         seen = set()
-        for res in results:
+        for term, entity_type, text_id in results:
             # 使用小写术语和类型作为唯一标识符
-            identifier = (res["term"].lower(), res["type"])
+            identifier = (term.lower(), entity_type)
             if identifier not in seen:
-                unique_results.append(res)
+                unique_results.append({
+                    "term": term,
+                    "type": entity_type,
+                    "context": texts[text_id],
+                    "file_path": file_paths[text_id],
+                })
                 seen.add(identifier)
         
         self.info(f"去重后得到 {len(unique_results)} 个独立术语。")
@@ -111,7 +171,8 @@ class NERProcessor(Base):
         self.info("正在按类型对术语进行排序...")
         return sorted(results, key=lambda item: item['type'])
 
-    def extract_terms(self, items_data: list, model_name: str, entity_types: list) -> list:
+    def extract_terms(self, items_data: list, model_name: str, entity_types: list,
+                      batch_size: int = None, n_process: int = None, on_progress = None) -> list:
         """
         从提供的原文数据列表中提取、去重、过滤和排序命名实体。
 
@@ -119,6 +180,9 @@ class NERProcessor(Base):
             items_data (list): 包含待处理数据的列表。
             model_name (str): 要使用的模型名称 (文件夹名)。
             entity_types (list): 需要提取的实体类型标签列表。
+            batch_size (int): 每批送入模型的文本数量，默认为 BATCH_SIZE。
+            n_process (int): 识别使用的进程数，默认为 N_PROCESS。
+            on_progress (callable): 进度回调，参数为 (已处理文本数, 文本总数, 已找到实体数)。
 
         Returns:
             list: 包含最终处理结果的字典列表。
@@ -127,36 +191,18 @@ class NERProcessor(Base):
         if not nlp:
             return []
 
-        total_items = len(items_data)
-        self.info(f"开始对 {total_items} 条原文进行实体识别...")
-        
-        raw_results = []
-        processed_count = 0
-        
-        # 步骤 1: 从文本中提取原始实体
-        for item_data in items_data:
-            source_text = item_data.get("source_text")
-            file_path = item_data.get("file_path")
-            
-            if not source_text or not source_text.strip():
-                continue
-
-            doc = nlp(source_text)
-            for ent in doc.ents:
-                if ent.label_ in entity_types:
-                    raw_results.append({
-                        "term": ent.text,
-                        "type": ent.label_,
-                        "context": source_text,
-                        "file_path": file_path,
-                    })
+        batch_size = max(1, batch_size or self.BATCH_SIZE)
+        n_process = max(1, n_process or self.N_PROCESS)
 
-            processed_count += 1
-            if processed_count % 50 == 0 or processed_count == total_items:
-                self.info(f"实体识别进度: {processed_count}/{total_items}...")
+        # 重复的原文只识别一次
+        texts, file_paths = self._collect_texts(items_data)
+        self.info(f"开始对 {len(items_data)} 条原文进行实体识别，去重后 {len(texts)} 条...")
+        
+        # 步骤 1: 批量提取原始实体
+        raw_results = list(self._iter_entities(nlp, texts, set(entity_types or ()), batch_size, n_process, on_progress))
 
         # 步骤 2: 对提取结果进行去重
-        unique_results = self._deduplicate_results(raw_results)
+        unique_results = self._deduplicate_results(raw_results, texts, file_paths)
         
         # 步骤 3: 对去重后的结果进行过滤
         filtered_results = self._filter_results(unique_results)
@@ -165,4 +211,4 @@ class NERProcessor(Base):
         sorted_results = self._sort_results(filtered_results)
 
         self.info(f"处理完成，最终返回 {len(sorted_results)} 个术语。")
-        return sorted_results
\ No newline at end of file
+        return sorted_results
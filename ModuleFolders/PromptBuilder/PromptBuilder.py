@@ -1,34 +1,65 @@
 import re
+import threading
 from types import SimpleNamespace
 
 from Base.Base import Base
 from ModuleFolders.TaskExecutor import TranslatorUtil
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.PromptBuilder.PromptBuilderEnum import PromptBuilderEnum
+from ModuleFolders.PromptBuilder.PromptTermMatcher import PromptTermMatcher
+from ModuleFolders.RequestLimiter import TokenCounter
+
+
+class StaticPrompt:
+    """
+    提示词中与原文无关的静态部分
+    同一次任务的各个子任务共享，只构建一次，Token 数量也只在首次使用时计算
+    """
+
+    def __init__(self, system: str, suffix_sections: list[str], translation_example_data: list) -> None:
+        self.system = system  # 处理好的基础系统提示词
+        self.suffix_sections = suffix_sections  # 附加在动态内容之后的背景设定、翻译风格与翻译示例
+        self.suffix = "".join(suffix_sections)
+        self.translation_example_data = translation_example_data  # 用于判断翻译示例是否被替换
+        self.user_example_prefix = ""
+        self.model_example_prefix = ""
+        self.user_query_prefix = ""
+        self.model_response_prefix = ""
+        self._system_tokens = None
+        self._suffix_tokens = None
+
+    @property
+    def system_tokens(self) -> int:
+        if self._system_tokens is None:
+            self._system_tokens = TokenCounter.count_tokens(self.system)
+        return self._system_tokens
+
+    @property
+    def suffix_tokens(self) -> int:
+        if self._suffix_tokens is None:
+            self._suffix_tokens = TokenCounter.count_tokens(self.suffix)
+        return self._suffix_tokens
+
+
 class PromptBuilder(Base):
     def __init__(self) -> None:
         super().__init__()
 
+    # 默认系统提示词文件，加载后以同名类属性保存
+    SYSTEM_DEFAULT_NAMES = ("common_system_zh", "common_system_en", "cot_system_zh", "cot_system_en", "think_system_zh", "think_system_en")
+
+    # 静态提示词缓存，键为 (提示词预设, 源语言, 目标语言, 配置版本)
+    STATIC_PROMPT_CACHE_SIZE = 32
+    _STATIC_PROMPT_LOCK = threading.Lock()
+    _static_prompt_cache = {}
+
     # 获取默认系统提示词(未处理的)，优先从内存中读取，如果没有，则从文件中读取
     def get_system_default(config: TaskConfig, prompt_preset) -> str:
-        if getattr(PromptBuilder, "common_system_zh", None) == None:
-            with open("./Resource/Prompt/Translate/common_system_zh.txt", "r", encoding = "utf-8") as reader:
-                PromptBuilder.common_system_zh = reader.read().strip()
-        if getattr(PromptBuilder, "common_system_en", None) == None:
-            with open("./Resource/Prompt/Translate/common_system_en.txt", "r", encoding = "utf-8") as reader:
-                PromptBuilder.common_system_en = reader.read().strip()
-        if getattr(PromptBuilder, "cot_system_zh", None) == None:
-            with open("./Resource/Prompt/Translate/cot_system_zh.txt", "r", encoding = "utf-8") as reader:
-                PromptBuilder.cot_system_zh = reader.read().strip()
-        if getattr(PromptBuilder, "cot_system_en", None) == None:
-            with open("./Resource/Prompt/Translate/cot_system_en.txt", "r", encoding = "utf-8") as reader:
-                PromptBuilder.cot_system_en = reader.read().strip()
-        if getattr(PromptBuilder, "think_system_zh", None) == None:
-            with open("./Resource/Prompt/Translate/think_system_zh.txt", "r", encoding = "utf-8") as reader:
-                PromptBuilder.think_system_zh = reader.read().strip()
-        if getattr(PromptBuilder, "think_system_en", None) == None:
-            with open("./Resource/Prompt/Translate/think_system_en.txt", "r", encoding = "utf-8") as reader:
-                PromptBuilder.think_system_en = reader.read().strip()
+        if getattr(PromptBuilder, "system_default_loaded", False) == False:
+            for name in PromptBuilder.SYSTEM_DEFAULT_NAMES:
+                with open(f"./Resource/Prompt/Translate/{name}.txt", "r", encoding = "utf-8") as reader:
+                    setattr(PromptBuilder, name, reader.read().strip())
+            PromptBuilder.system_default_loaded = True
 
 
         # 如果输入的是字典，则转换为命名空间
@@ -421,12 +452,8 @@ class PromptBuilder(Base):
         # 将输入字典中的所有值转换为集合
         lines = set(line for line in input_dict.values())
 
-        # 筛选在输入词典中出现过的条目
-        result = []
-        for v in config.prompt_dictionary_data:
-            src_lower = v.get("src").lower() # 将术语表中的 src 转换为小写
-            if any(src_lower in line.lower() for line in lines): # 将原文行也转换为小写进行比较
-                result.append(v)
+        # 筛选在输入词典中出现过的条目，忽略大小写
+        result = PromptTermMatcher.get(config).match_glossary(lines)
 
         # 数据校验
         if len(result) == 0:
@@ -476,39 +503,9 @@ class PromptBuilder(Base):
     # 构造禁翻表
     def build_ntl_prompt(config: TaskConfig, source_text_dict) -> str:
 
-        # 获取禁翻表内容
-        exclusion_list_data = config.exclusion_list_data.copy()
-
-
-        exclusion_dict = {}  # 用字典存储并自动去重
+        # 用字典存储并自动去重，正则已预编译，标记符一次遍历匹配
         texts = list(source_text_dict.values())
-        
-        # 处理正则匹配
-        for element in exclusion_list_data:
-            regex = element.get("regex", "").strip()
-            marker = element.get("markers", "").strip()
-            info = element.get("info", "")
-            
-            # 检查是否写正则，如果写了，只处理正则
-            if regex:
-                # 避免错误正则，导致崩溃
-                try:
-                    # 编译正则表达式字符串为模式对象
-                    pattern = re.compile(regex)
-                    # 寻找文本中所有符合正则的文本内容
-                    for text in texts:
-                        for match in pattern.finditer(text):
-                            markers = match.group(0)
-                            # 避免重复添加
-                            if markers not in exclusion_dict: 
-                                exclusion_dict[markers] = info
-                except re.error:
-                    pass
-            # 没写正则，只处理标记符        
-            else:
-                found = any(marker in text for text in texts)
-                if found and marker not in exclusion_dict:  # 避免重复添加
-                    exclusion_dict[marker] = info
+        exclusion_dict = PromptTermMatcher.get(config).match_exclusions(texts)
         
         # 检查内容是否为空
         if not exclusion_dict :
@@ -527,17 +524,8 @@ class PromptBuilder(Base):
 
     # 构造角色设定
     def build_characterization(config: TaskConfig, input_dict: dict) -> str:
-        # 将数据存储到中间字典中
-        dictionary = {}
-        for v in config.characterization_data:
-            dictionary[v.get("original_name", "")] = v
-
-        # 筛选，如果该key在发送文本中，则存储进新字典中
-        temp_dict = {}
-        for key_a, value_a in dictionary.items():
-            for _, value_b in input_dict.items():
-                if key_a in value_b:
-                    temp_dict[key_a] = value_a
+        # 筛选，如果角色名在发送文本中，则存储进新字典中
+        temp_dict = PromptTermMatcher.get(config).match_characters(input_dict.values())
 
         # 如果没有含有字典内容
         if temp_dict == {}:
@@ -748,6 +736,71 @@ class PromptBuilder(Base):
         return the_profile
 
 
+    # 获取静态提示词，配置未变化时直接复用
+    def get_static_prompt(config: TaskConfig, source_lang: str) -> StaticPrompt:
+        prompt_selection = config.translation_prompt_selection
+        prompt_preset = prompt_selection["last_selected_id"]
+        is_builtin = prompt_preset in (PromptBuilderEnum.COMMON, PromptBuilderEnum.COT, PromptBuilderEnum.THINK)
+        translation_example_data = config.translation_example_data if config.translation_example_switch == True else None
+
+        # 配置版本，从配置文件载入的配置使用配置文件的版本号
+        # 手动构建的配置没有版本号，由影响静态部分的配置项组成，翻译示例按对象判断是否被替换
+        config_version = getattr(config, "config_version", None)
+        check_example_data = config_version is None
+        if check_example_data:
+            config_version = (
+                None if is_builtin else prompt_selection["prompt_content"],
+                config.world_building_content if config.world_building_switch == True else None,
+                config.writing_style_content if config.writing_style_switch == True else None,
+                id(translation_example_data),
+            )
+        key = (prompt_preset, source_lang, config.target_language, config_version)
+
+        with PromptBuilder._STATIC_PROMPT_LOCK:
+            static_prompt = PromptBuilder._static_prompt_cache.get(key)
+            if static_prompt is not None and (not check_example_data or static_prompt.translation_example_data is translation_example_data):
+                return static_prompt
+
+        # 基础系统提示词
+        if is_builtin:
+            system = PromptBuilder.build_system(config, source_lang)
+        else:
+            system = PromptBuilder._replace_language_placeholders(prompt_selection["prompt_content"], config, source_lang)
+
+        # 背景设定、翻译风格与翻译示例
+        suffix_sections = []
+        if config.world_building_switch == True:
+            suffix_sections.append(PromptBuilder.build_world_building(config))
+        if config.writing_style_switch == True:
+            suffix_sections.append(PromptBuilder.build_writing_style(config))
+        if config.translation_example_switch == True:
+            suffix_sections.append(PromptBuilder.build_translation_example(config))
+
+        static_prompt = StaticPrompt(system, [v for v in suffix_sections if v != ""], translation_example_data)
+        static_prompt.user_example_prefix = PromptBuilder.build_userExamplePrefix(config)
+        static_prompt.model_example_prefix = PromptBuilder.build_modelExamplePrefix(config)
+        static_prompt.user_query_prefix = PromptBuilder.build_userQueryPrefix(config)
+        static_prompt.model_response_prefix = PromptBuilder.build_modelResponsePrefix(config)
+
+        with PromptBuilder._STATIC_PROMPT_LOCK:
+            if len(PromptBuilder._static_prompt_cache) >= PromptBuilder.STATIC_PROMPT_CACHE_SIZE:
+                PromptBuilder._static_prompt_cache.clear()
+            PromptBuilder._static_prompt_cache[key] = static_prompt
+        return static_prompt
+
+    # 计算系统提示词的 Token 数量，静态部分使用缓存的数量，只计算中间的动态部分
+    def count_system_tokens(config: TaskConfig, source_lang: str, system: str) -> int:
+        static_prompt = PromptBuilder.get_static_prompt(config, source_lang)
+        prefix, suffix = static_prompt.system, static_prompt.suffix
+        if len(system) < len(prefix) + len(suffix) or not system.startswith(prefix) or not system.endswith(suffix):
+            return TokenCounter.count_tokens(system)
+
+        dynamic = system[len(prefix):len(system) - len(suffix)]
+        tokens = static_prompt.system_tokens + static_prompt.suffix_tokens
+        if dynamic:
+            tokens += TokenCounter.count_tokens(dynamic)
+        return tokens
+
     # 生成信息结构 - 通用
     def generate_prompt(config, source_text_dict: dict, previous_text_list: list[str], source_lang) -> tuple[list[dict], str, list[str]]:
         # 储存指令
@@ -755,12 +808,11 @@ class PromptBuilder(Base):
         # 储存额外日志
         extra_log = []
 
+        # 静态部分，同一配置下的子任务共享
+        static_prompt = PromptBuilder.get_static_prompt(config, source_lang)
+
         # 基础系统提示词
-        if config.translation_prompt_selection["last_selected_id"] in (PromptBuilderEnum.COMMON, PromptBuilderEnum.COT, PromptBuilderEnum.THINK):
-            system = PromptBuilder.build_system(config, source_lang)
-        else:
-            custom_prompt = config.translation_prompt_selection["prompt_content"]
-            system = PromptBuilder._replace_language_placeholders(custom_prompt, config, source_lang)
+        system = static_prompt.system
 
 
         # 如果开启术语表
@@ -785,26 +837,10 @@ class PromptBuilder(Base):
                 system += characterization
                 extra_log.append(characterization)
 
-        # 如果启用自定义世界观设定功能
-        if config.world_building_switch == True:
-            world_building = PromptBuilder.build_world_building(config)
-            if world_building != "":
-                system += world_building
-                extra_log.append(world_building)
-
-        # 如果启用自定义行文措辞要求功能
-        if config.writing_style_switch == True:
-            writing_style = PromptBuilder.build_writing_style(config)
-            if writing_style != "":
-                system += writing_style
-                extra_log.append(writing_style)
-
-        # 如果启用翻译风格示例功能
-        if config.translation_example_switch == True:
-            translation_example = PromptBuilder.build_translation_example(config)
-            if translation_example != "":
-                system += translation_example
-                extra_log.append(translation_example)
+        # 背景设定、翻译风格与翻译示例
+        for section in static_prompt.suffix_sections:
+            system += section
+            extra_log.append(section)
 
         # 构建动态few-shot
         switch_A = config.few_shot_and_example_switch # 打开动态示例开关时
@@ -812,8 +848,8 @@ class PromptBuilder(Base):
         if switch_A and switch_B:
 
             # 获取默认示例前置文本
-            pre_prompt_example = PromptBuilder.build_userExamplePrefix(config)
-            fol_prompt_example = PromptBuilder.build_modelExamplePrefix(config)
+            pre_prompt_example = static_prompt.user_example_prefix
+            fol_prompt_example = static_prompt.model_example_prefix
 
             # 获取具体动态示例内容
             original_exmaple, translation_example_content = PromptBuilder.build_translation_sample(config, source_text_dict, source_lang)
@@ -840,7 +876,7 @@ class PromptBuilder(Base):
 
         # 构建待翻译文本
         source_text = PromptBuilder.build_source_text(config,source_text_dict)
-        pre_prompt = PromptBuilder.build_userQueryPrefix(config) # 用户提问前置文本
+        pre_prompt = static_prompt.user_query_prefix # 用户提问前置文本
         source_text_str = f"{previous}\n{pre_prompt}<textarea>\n{source_text}\n</textarea>"
 
         # 构建用户信息
@@ -854,7 +890,7 @@ class PromptBuilder(Base):
         # 构建预输入回复信息
         switch_C = config.translation_prompt_selection["last_selected_id"] in (PromptBuilderEnum.COT, PromptBuilderEnum.COMMON) 
         if switch_A and switch_C:
-            fol_prompt = PromptBuilder.build_modelResponsePrefix(config)
+            fol_prompt = static_prompt.model_response_prefix
             messages.append({"role": "assistant", "content": fol_prompt})
 
 
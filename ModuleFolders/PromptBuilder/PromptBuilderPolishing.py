@@ -1,9 +1,9 @@
-import re
 from types import SimpleNamespace
 
 from Base.Base import Base
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.PromptBuilder.PromptBuilderEnum import PromptBuilderEnum
+from ModuleFolders.PromptBuilder.PromptTermMatcher import PromptTermMatcher
 from ModuleFolders.PromptBuilder.PromptBuilder import PromptBuilder
 class PromptBuilderPolishing(Base):
 
@@ -63,12 +63,8 @@ class PromptBuilderPolishing(Base):
         # 将输入字典中的所有值转换为集合
         lines = set(line for line in input_dict.values())
 
-        # 筛选在输入词典中出现过的条目
-        result = []
-        for v in config.prompt_dictionary_data:
-            src_lower = v.get("src").lower() # 将术语表中的 src 转换为小写
-            if any(src_lower in line.lower() for line in lines): # 将原文行也转换为小写进行比较
-                result.append(v)
+        # 筛选在输入词典中出现过的条目，忽略大小写
+        result = PromptTermMatcher.get(config).match_glossary(lines)
 
         # 数据校验
         if len(result) == 0:
@@ -103,39 +99,9 @@ class PromptBuilderPolishing(Base):
     # 构造禁翻表
     def build_ntl_prompt(config: TaskConfig, source_text_dict) -> str:
 
-        # 获取禁翻表内容
-        exclusion_list_data = config.exclusion_list_data.copy()
-
-
-        exclusion_dict = {}  # 用字典存储并自动去重
+        # 用字典存储并自动去重，正则已预编译，标记符一次遍历匹配
         texts = list(source_text_dict.values())
-        
-        # 处理正则匹配
-        for element in exclusion_list_data:
-            regex = element.get("regex", "").strip()
-            marker = element.get("markers", "").strip()
-            info = element.get("info", "")
-            
-            # 检查是否写正则，如果写了，只处理正则
-            if regex:
-                # 避免错误正则，导致崩溃
-                try:
-                    # 编译正则表达式字符串为模式对象
-                    pattern = re.compile(regex)
-                    # 寻找文本中所有符合正则的文本内容
-                    for text in texts:
-                        for match in pattern.finditer(text):
-                            markers = match.group(0)
-                            # 避免重复添加
-                            if markers not in exclusion_dict: 
-                                exclusion_dict[markers] = info
-                except re.error:
-                    pass
-            # 没写正则，只处理标记符        
-            else:
-                found = any(marker in text for text in texts)
-                if found and marker not in exclusion_dict:  # 避免重复添加
-                    exclusion_dict[marker] = info
+        exclusion_dict = PromptTermMatcher.get(config).match_exclusions(texts)
         
         # 检查内容是否为空
         if not exclusion_dict :
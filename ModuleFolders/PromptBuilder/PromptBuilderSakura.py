@@ -3,6 +3,7 @@ from types import SimpleNamespace
 from Base.Base import Base
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.PromptBuilder.PromptBuilder import PromptBuilder
+from ModuleFolders.PromptBuilder.PromptTermMatcher import PromptTermMatcher
 
 class PromptBuilderSakura(Base):
 
@@ -47,10 +48,7 @@ class PromptBuilderSakura(Base):
         lines = set(line for line in input_dict.values())
 
         # 筛选在输入词典中出现过的条目
-        result: list[dict] = [
-            v for v in config.prompt_dictionary_data
-            if any(v.get("src", "") in lines for lines in lines)
-        ]
+        result: list[dict] = PromptTermMatcher.get(config).match_glossary(lines, ignore_case=False)
 
         if len(result) == 0:
             return ""
@@ -0,0 +1,169 @@
+import re
+import threading
+from collections import deque
+from typing import Any, Iterable
+
+
+class TermAutomaton:
+    """
+    Aho-Corasick 多模式匹配自动机
+    一次遍历文本即可找出所有出现过的模式（包括相互重叠的模式），返回模式的序号
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.goto = [{}]  # 每个节点的转移表
+        self.fail = [0]  # 失配指针
+        self.outputs = [[]]  # 到达该节点时匹配到的模式序号，已合并失配链上的输出
+        self.empty_patterns = []  # 空模式可匹配任意文本，单独处理
+
+        for index, pattern in enumerate(patterns):
+            if not pattern:
+                self.empty_patterns.append(index)
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                node = next_node
+            self.outputs[node].append(index)
+
+        # 按层次构造失配指针，第一层节点的失配指针指向根节点
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def find(self, texts: Iterable[str]) -> set[int]:
+        """返回在任意一段文本中出现过的模式序号，不同文本之间不会跨界匹配"""
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        matched = set()
+        visited = set()  # 已收集过输出的节点
+
+        has_text = False
+        for text in texts:
+            has_text = True
+            node = 0
+            for char in text:
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                if node and node not in visited:
+                    visited.add(node)
+                    matched.update(outputs[node])
+
+        if has_text and self.empty_patterns:
+            matched.update(self.empty_patterns)
+        return matched
+
+
+class PromptTermMatcher:
+    """
+    提示词的术语匹配器
+    由术语表、禁翻表与角色设定构建，同一次任务只构建一次，每个子任务只需遍历一次原文即可找到需要附加的条目
+    """
+
+    _CACHE_LOCK = threading.Lock()
+    _cache_key = None
+    _cache_matcher = None
+
+    def __init__(self, glossary_data: list[dict], exclusion_list_data: list[dict], characterization_data: list[dict]) -> None:
+        self.glossary_data = list(glossary_data or [])
+        self.exclusion_list_data = list(exclusion_list_data or [])
+
+        # 术语表原文，按需构建忽略大小写与区分大小写的自动机
+        self.glossary_sources = [v.get("src", "") for v in self.glossary_data]
+        self._glossary_automaton = None
+        self._glossary_automaton_case = None
+
+        # 禁翻表，正则条目预编译，标记符条目使用自动机匹配
+        self.exclusion_entries = []
+        markers = []
+        for element in self.exclusion_list_data:
+            regex = element.get("regex", "").strip()
+            marker = element.get("markers", "").strip()
+            info = element.get("info", "")
+            if regex:
+                # 避免错误正则，导致崩溃
+                try:
+                    self.exclusion_entries.append((re.compile(regex), None, info))
+                except re.error:
+                    pass
+            else:
+                self.exclusion_entries.append((None, len(markers), info))
+                markers.append(marker)
+        self.markers = markers
+        self.marker_automaton = TermAutomaton(markers)
+
+        # 角色设定，同名角色以最后一条为准
+        self.characters = {}
+        for v in characterization_data or []:
+            self.characters[v.get("original_name", "")] = v
+        self.character_names = list(self.characters.keys())
+        self.character_automaton = TermAutomaton(self.character_names)
+
+    @classmethod
+    def get(cls, config: Any) -> "PromptTermMatcher":
+        """获取与配置对应的匹配器，同一次任务的各个子任务共享同一组配置数据，只构建一次"""
+        data = (
+            getattr(config, "prompt_dictionary_data", None) or [],
+            getattr(config, "exclusion_list_data", None) or [],
+            getattr(config, "characterization_data", None) or [],
+        )
+        with cls._CACHE_LOCK:
+            if cls._cache_key is None or any(a is not b for a, b in zip(cls._cache_key, data)):
+                cls._cache_matcher = cls(*data)
+                cls._cache_key = data
+            return cls._cache_matcher
+
+    # 筛选在原文中出现过的术语表条目
+    def match_glossary(self, texts: Iterable[str], ignore_case: bool = True) -> list[dict]:
+        if ignore_case:
+            if self._glossary_automaton is None:
+                self._glossary_automaton = TermAutomaton([src.lower() for src in self.glossary_sources])
+            matched = self._glossary_automaton.find(text.lower() for text in texts)
+        else:
+            if self._glossary_automaton_case is None:
+                self._glossary_automaton_case = TermAutomaton(self.glossary_sources)
+            matched = self._glossary_automaton_case.find(texts)
+        return [v for index, v in enumerate(self.glossary_data) if index in matched]
+
+    # 获取原文中出现的禁翻内容，返回 {标记符: 备注}，顺序与禁翻表一致
+    def match_exclusions(self, texts: list[str]) -> dict[str, str]:
+        matched_markers = self.marker_automaton.find(texts)
+        exclusion_dict = {}
+        for pattern, marker_index, info in self.exclusion_entries:
+            if pattern is not None:
+                # 寻找文本中所有符合正则的文本内容
+                for text in texts:
+                    for match in pattern.finditer(text):
+                        markers = match.group(0)
+                        # 避免重复添加
+                        if markers not in exclusion_dict:
+                            exclusion_dict[markers] = info
+            elif marker_index in matched_markers:
+                marker = self.markers[marker_index]
+                if marker not in exclusion_dict:
+                    exclusion_dict[marker] = info
+        return exclusion_dict
+
+    # 获取原文中出现的角色设定，顺序与角色设定表一致
+    def match_characters(self, texts: Iterable[str]) -> dict[str, dict]:
+        matched = self.character_automaton.find(texts)
+        return {
+            name: self.characters[name]
+            for index, name in enumerate(self.character_names)
+            if index in matched
+        }
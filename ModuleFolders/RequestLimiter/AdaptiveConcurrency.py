@@ -0,0 +1,181 @@
+import time
+import asyncio
+import threading
+import collections
+from typing import Callable
+
+from ModuleFolders.LLMRequester.RequestErrorType import RequestErrorType
+
+
+class AdaptiveConcurrency:
+    """
+    自适应并发控制器（AIMD）
+    请求成功且延迟正常时线性增加同时请求的数量，遇到限流或超时时按比例减少，
+    使并发数稳定在接口实际能承受的上限附近
+    """
+
+    # 遇到限流或超时时并发数的缩减比例
+    DECREASE_FACTOR = 0.5
+
+    # 平均延迟超过基线延迟的倍数时，不再增加并发数
+    LATENCY_TOLERANCE = 2.0
+
+    # 平均延迟的平滑系数
+    LATENCY_SMOOTHING = 0.2
+
+    # 等待时检测停止标志的最大间隔（s）
+    STOP_CHECK_INTERVAL = 0.5
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.limit = 0  # 当前允许同时进行的请求数量
+        self.min_limit = 1
+        self.max_limit = 1
+        self.in_flight = 0  # 正在进行的请求数量
+
+        # 每累计 limit 次成功增加 1 个并发
+        self.success_count = 0
+
+        # 一次拥塞只缩减一次，在此时间之前的失败不再缩减，成功也不再增加
+        self.decrease_until = 0
+
+        # 延迟统计
+        self.avg_latency = 0.0
+        self.base_latency = 0.0
+
+        self.condition = threading.Condition()
+
+        # 异步等待者，元素为 (事件循环, future)
+        self.async_waiters = collections.deque()
+
+    # 设置控制器参数，未开启时不限制并发数
+    def configure(self, enabled: bool, initial: int, min_limit: int, max_limit: int) -> None:
+        with self.condition:
+            self.enabled = enabled
+            self.min_limit = max(1, min_limit)
+            self.max_limit = max(self.min_limit, max_limit)
+            self.limit = min(self.max_limit, max(self.min_limit, initial))
+            self.success_count = 0
+            self.decrease_until = 0
+            self.avg_latency = 0.0
+            self.base_latency = 0.0
+            self.notify_waiters()
+
+    def acquire(self, timeout: float = None, should_stop: Callable[[], bool] = None) -> bool:
+        """等待并占用一个并发名额，超时或 should_stop 返回 True 时返回 False"""
+        deadline = None if timeout is None else time.time() + timeout
+
+        with self.condition:
+            while self.enabled and self.in_flight >= self.limit:
+                if should_stop is not None and should_stop():
+                    return False
+
+                wait_time = self.STOP_CHECK_INTERVAL if should_stop is not None else None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                    wait_time = remaining if wait_time is None else min(wait_time, remaining)
+
+                self.condition.wait(wait_time)
+
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self, timeout: float = None, should_stop: Callable[[], bool] = None) -> bool:
+        """acquire 的异步版本，在事件循环中等待而不占用线程"""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else time.time() + timeout
+
+        while True:
+            with self.condition:
+                if not self.enabled or self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return True
+                future = loop.create_future()
+                self.async_waiters.append((loop, future))
+
+            if should_stop is not None and should_stop():
+                return False
+
+            wait_time = self.STOP_CHECK_INTERVAL if should_stop is not None else None
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                wait_time = remaining if wait_time is None else min(wait_time, remaining)
+
+            try:
+                await asyncio.wait_for(future, wait_time)
+            except asyncio.TimeoutError:
+                pass
+
+    def release(self, latency: float, error_type: str = RequestErrorType.NONE) -> None:
+        """释放并发名额，并根据请求结果调整并发数"""
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+
+            # 未实际发送请求，不参与并发数调整
+            if latency <= 0 and error_type == RequestErrorType.NONE:
+                self.notify_waiters()
+                return
+
+            if self.enabled:
+                if error_type in (RequestErrorType.RATE_LIMIT, RequestErrorType.TIMEOUT):
+                    self.on_congestion(latency)
+                elif error_type == RequestErrorType.NONE:
+                    self.on_success(latency)
+
+            self.notify_waiters()
+
+    # 唤醒所有等待者重新检查名额，需在持有锁时调用
+    def notify_waiters(self) -> None:
+        self.condition.notify_all()
+        while self.async_waiters:
+            loop, future = self.async_waiters.popleft()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._wake_future, future)
+
+    @staticmethod
+    def _wake_future(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    # 请求成功，需在持有锁时调用
+    def on_success(self, latency: float) -> None:
+        if self.avg_latency <= 0:
+            self.avg_latency = latency
+        else:
+            self.avg_latency += (latency - self.avg_latency) * self.LATENCY_SMOOTHING
+
+        # 基线取观测到的最低平均延迟，并缓慢上浮以适应接口自身的变化
+        if self.base_latency <= 0 or self.avg_latency < self.base_latency:
+            self.base_latency = self.avg_latency
+        else:
+            self.base_latency += (self.avg_latency - self.base_latency) * 0.01
+
+        # 刚缩减过并发数，或延迟明显升高说明接口已接近饱和时，保持当前并发数
+        if time.time() < self.decrease_until or self.avg_latency > self.base_latency * self.LATENCY_TOLERANCE:
+            self.success_count = 0
+            return
+
+        self.success_count += 1
+        if self.success_count >= self.limit:
+            self.success_count = 0
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    # 限流或超时，需在持有锁时调用
+    def on_congestion(self, latency: float) -> None:
+        now = time.time()
+        self.success_count = 0
+
+        # 同一批并发请求的失败只缩减一次
+        if now < self.decrease_until:
+            return
+
+        self.limit = max(self.min_limit, int(self.limit * self.DECREASE_FACTOR))
+        self.decrease_until = now + max(latency, self.avg_latency, 1.0)
+
+    def get_limit(self) -> int:
+        with self.condition:
+            return self.limit
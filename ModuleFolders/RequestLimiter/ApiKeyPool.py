@@ -0,0 +1,255 @@
+import time
+import asyncio
+import threading
+from typing import Callable
+
+from ModuleFolders.LLMRequester.RequestErrorType import RequestErrorType
+from ModuleFolders.RequestLimiter.RequestLimiter import RequestLimiter
+
+
+class ApiKeyState:
+    """单个密钥的限额、健康状态与请求统计"""
+
+    def __init__(self, key: str, limiter: RequestLimiter) -> None:
+        self.key = key
+        self.limiter = limiter  # 该密钥独立的 RPM 与 TPM 令牌桶
+        self.in_flight = 0  # 正在进行的请求数量
+
+        # 冷却状态，在此时间之前不再分配该密钥
+        self.cooldown_until = 0.0
+        self.strikes = 0  # 连续失败次数，决定下一次冷却的时长
+
+        # 请求统计
+        self.requests = 0
+        self.successes = 0
+        self.rate_limits = 0
+        self.auth_errors = 0
+        self.total_latency = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return self.cooldown_until <= now
+
+    def get_stats(self, now: float) -> dict:
+        return {
+            "key": self.key,
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.requests - self.successes,
+            "rate_limits": self.rate_limits,
+            "auth_errors": self.auth_errors,
+            "avg_latency": self.total_latency / self.successes if self.successes else 0.0,
+            "in_flight": self.in_flight,
+            "cooldown": max(0.0, self.cooldown_until - now),
+        }
+
+
+class ApiKeyPool:
+    """
+    密钥池
+    每个密钥拥有独立的 RPM 与 TPM 令牌桶，请求时选择额度最早可用、负载最低的健康密钥，
+    遇到限流或鉴权错误的密钥会暂时冷却，总吞吐量随健康密钥的数量变化
+    """
+
+    # 限流后的冷却时间（s），连续限流时按倍数增加
+    RATE_LIMIT_COOLDOWN = 10.0
+    MAX_RATE_LIMIT_COOLDOWN = 300.0
+
+    # 密钥无效或余额耗尽时的冷却时间（s），通常在本次任务中不会恢复
+    AUTH_COOLDOWN = 1800.0
+
+    # 连续出现其他错误达到该次数时，按限流处理冷却
+    ERROR_STRIKES = 3
+
+    # 等待时检测停止标志的最大间隔（s）
+    STOP_CHECK_INTERVAL = 0.5
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.states = []
+        self.states_by_key = {}
+        self.cursor = 0  # 负载相同时从该位置开始轮询，避免总是选中第一个密钥
+
+    # 设置密钥列表与单个密钥的限额
+    def configure(self, keys: list[str], rpm_limit: int, tpm_limit: int, max_tokens: int = RequestLimiter.DEFAULT_MAX_TOKENS) -> None:
+        states = []
+        for key in dict.fromkeys(keys):
+            limiter = RequestLimiter()
+            limiter.set_limit(tpm_limit, rpm_limit, max_tokens)
+            states.append(ApiKeyState(key, limiter))
+
+        with self.lock:
+            self.states = states
+            self.states_by_key = {state.key: state for state in states}
+            self.cursor = 0
+
+    # 按轮询顺序获取未冷却的密钥，需在持有锁时调用
+    def _get_available(self, now: float) -> list[ApiKeyState]:
+        if not self.states:
+            return []
+        self.cursor = (self.cursor + 1) % len(self.states)
+        ordered = self.states[self.cursor:] + self.states[:self.cursor]
+        return [state for state in ordered if state.is_available(now)]
+
+    # 检查是否超过单次请求的最大输入限制
+    def exceeds_max_tokens(self, tokens: int) -> bool:
+        with self.lock:
+            return bool(self.states) and self.states[0].limiter.exceeds_max_tokens(tokens)
+
+    # 不等待额度，直接选择当前负载最低的健康密钥，没有可用密钥时返回 None
+    def select(self) -> str | None:
+        with self.lock:
+            available = self._get_available(time.time())
+            if not available:
+                return None
+            return min(available, key = lambda state: (state.in_flight, state.limiter.get_wait_time(0))).key
+
+    # 选择额度最早可用、负载最低的健康密钥并占用，需在持有锁时调用
+    def _select(self, tokens: int) -> tuple[ApiKeyState | None, float]:
+        """
+        返回 (密钥状态, 0)
+        所有密钥都在冷却时返回 (None, 距离最早恢复的时间)
+        """
+        now = time.time()
+        available = self._get_available(now)
+        if not available:
+            return None, min(state.cooldown_until for state in self.states) - now
+
+        state = min(available, key = lambda state: (state.limiter.get_wait_time(tokens), state.in_flight))
+        state.in_flight += 1
+        return state, 0.0
+
+    # 取消已选择但未发送的请求
+    def _cancel(self, state: ApiKeyState) -> None:
+        with self.lock:
+            state.in_flight = max(0, state.in_flight - 1)
+
+    def _warn_max_tokens(self) -> None:
+        max_tokens = self.states[0].limiter.max_tokens
+        print(f"[Warning INFO] 该次任务的文本总tokens量已经超过最大输入限制({max_tokens} tokens)，请检查原文文件是否有问题或者文本切分量设置过大！！！")
+        print("[Warning INFO] 该次任务将进行拆分处理，并进入下一轮任务中....")
+
+    # 停止或所选密钥进入冷却时放弃在该密钥的限流器中等待
+    def _abort_check(self, state: ApiKeyState, should_stop: Callable[[], bool] | None) -> Callable[[], bool]:
+        return lambda: (should_stop is not None and should_stop()) or not state.is_available(time.time())
+
+    def acquire(self, tokens: int, timeout: float = None, should_stop: Callable[[], bool] = None) -> str | None:
+        """
+        阻塞等待直到某个健康密钥的 RPM 与 TPM 额度可用，返回该密钥
+        超时、should_stop 返回 True 或请求超过最大输入限制时返回 None，请求结束后需调用 release
+        """
+        if self.exceeds_max_tokens(tokens):
+            self._warn_max_tokens()
+            return None
+
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining < 0:
+                return None
+
+            with self.lock:
+                if not self.states:
+                    return None
+                state, wait_time = self._select(tokens)
+
+            # 所有密钥都在冷却，等待最早恢复的密钥
+            if state is None:
+                wait_until = time.time() + (wait_time if remaining is None else min(wait_time, remaining))
+                while (left := wait_until - time.time()) > 0:
+                    if should_stop is not None and should_stop():
+                        return None
+                    time.sleep(min(left, self.STOP_CHECK_INTERVAL))
+                continue
+
+            # 在该密钥的限流器中按先来先服务的顺序等待额度，未获得额度时不会扣除
+            if state.limiter.acquire(tokens, remaining, self._abort_check(state, should_stop)):
+                return state.key
+            self._cancel(state)
+
+            # 停止或超时时放弃，密钥进入冷却时重新选择
+            if should_stop is not None and should_stop():
+                return None
+            if state.is_available(time.time()):
+                return None
+
+    async def acquire_async(self, tokens: int, timeout: float = None, should_stop: Callable[[], bool] = None) -> str | None:
+        """acquire 的异步版本，在事件循环中等待而不占用线程"""
+        if self.exceeds_max_tokens(tokens):
+            self._warn_max_tokens()
+            return None
+
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining < 0:
+                return None
+
+            with self.lock:
+                if not self.states:
+                    return None
+                state, wait_time = self._select(tokens)
+
+            if state is None:
+                wait_until = time.time() + (wait_time if remaining is None else min(wait_time, remaining))
+                while (left := wait_until - time.time()) > 0:
+                    if should_stop is not None and should_stop():
+                        return None
+                    await asyncio.sleep(min(left, self.STOP_CHECK_INTERVAL))
+                continue
+
+            # 预约该密钥的额度，放弃等待时额度会归还给限流器
+            if await state.limiter.acquire_async(tokens, remaining, self._abort_check(state, should_stop)):
+                return state.key
+            self._cancel(state)
+
+            if should_stop is not None and should_stop():
+                return None
+            if state.is_available(time.time()):
+                return None
+
+    def release(self, key: str, latency: float, error_type: str = RequestErrorType.NONE) -> None:
+        """请求结束，记录密钥的请求结果，并按错误类型决定是否冷却"""
+        with self.lock:
+            state = self.states_by_key.get(key)
+            if state is None:
+                return
+
+            state.in_flight = max(0, state.in_flight - 1)
+
+            # 未实际发送请求
+            if latency <= 0 and error_type == RequestErrorType.NONE:
+                return
+
+            state.requests += 1
+            now = time.time()
+            if error_type == RequestErrorType.NONE:
+                state.successes += 1
+                state.total_latency += latency
+                state.strikes = 0
+            elif error_type == RequestErrorType.AUTH:
+                state.auth_errors += 1
+                state.cooldown_until = now + self.AUTH_COOLDOWN
+            elif error_type == RequestErrorType.RATE_LIMIT:
+                state.rate_limits += 1
+                state.strikes += 1
+                state.cooldown_until = max(state.cooldown_until, now + self.get_cooldown(state.strikes))
+            else:
+                state.strikes += 1
+                if state.strikes >= self.ERROR_STRIKES:
+                    state.cooldown_until = max(state.cooldown_until, now + self.get_cooldown(state.strikes - self.ERROR_STRIKES + 1))
+
+    # 根据连续失败次数计算冷却时间
+    def get_cooldown(self, strikes: int) -> float:
+        return min(self.MAX_RATE_LIMIT_COOLDOWN, self.RATE_LIMIT_COOLDOWN * 2 ** max(0, strikes - 1))
+
+    # 获取当前未冷却的密钥数量
+    def get_available_count(self) -> int:
+        with self.lock:
+            now = time.time()
+            return sum(1 for state in self.states if state.is_available(now))
+
+    # 获取各密钥的请求统计
+    def get_stats(self) -> list[dict]:
+        with self.lock:
+            now = time.time()
+            return [state.get_stats(now) for state in self.states]
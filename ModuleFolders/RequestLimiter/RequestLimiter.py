@@ -1,11 +1,25 @@
 import time
+import asyncio
 import threading
-import tiktoken  # 需要安装库pip install tiktoken
-import tiktoken_ext  # 必须导入这两个库，否则打包后无法运行
-from tiktoken_ext import openai_public
+import collections
+from typing import Callable
+
+from ModuleFolders.RequestLimiter import TokenCounter
+from ModuleFolders.RequestLimiter.AdaptiveConcurrency import AdaptiveConcurrency
 
 
 class RequestLimiter:
+    """
+    请求调度器
+    调用方在 acquire 中阻塞等待，按先来先服务的顺序依次获得 RPM 与 TPM 额度，
+    队首的等待者只在额度恢复所需的时间到达时被唤醒，而不是按固定间隔轮询
+    """
+
+    # 默认的令牌桶容量，即单次请求允许的最大 Token 数
+    DEFAULT_MAX_TOKENS = 32000
+
+    # 等待时检测停止标志的最大间隔（s）
+    STOP_CHECK_INTERVAL = 0.5
 
     def __init__(self) -> None:
         # TPM相关参数
@@ -15,109 +29,228 @@ class RequestLimiter:
         self.last_time = time.time()  # 上次记录时间
 
         # RPM相关参数
-        self.last_request_time = 0  # 上次记录时间
+        self.next_request_time = 0  # 下一个请求最早可发送的时间
         self.request_interval = 0  # 请求的最小时间间隔（s）
         self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+
+        # 等待队列，元素为 [所需 tokens]，按到达顺序排列
+        self.waiters = collections.deque()
+
+        # 自适应并发控制器，未开启时不限制同时进行的请求数量
+        self.concurrency = AdaptiveConcurrency()
 
     # 设置限制器的参数
-    def set_limit(self, tpm_limit: int, rpm_limit: int) -> None:
-        # 设置限制器的TPM参数
-        self.max_tokens = 32000  # 令牌桶最大容量
-        self.tokens_rate = tpm_limit / 60  # 令牌每秒的恢复速率
-        self.remaining_tokens = 32000  # 令牌桶剩余容量
-
-        # 设置限制器的RPM参数
-        self.request_interval = 60 / rpm_limit  # 请求的最小时间间隔（s）
-
-    def rpm_limiter(self) -> bool:
-        current_time = time.time()  # 获取现在的时间
-        time_since_last_request = current_time - self.last_request_time  # 计算当前时间与上次记录时间的间隔
-        if time_since_last_request < self.request_interval:
-            # print("[DEBUG] Request limit exceeded. Please try again later.")
-            return False
+    def set_limit(self, tpm_limit: int, rpm_limit: int, max_tokens: int = DEFAULT_MAX_TOKENS) -> None:
+        with self.condition:
+            # 设置限制器的TPM参数
+            self.max_tokens = max_tokens  # 令牌桶最大容量
+            self.tokens_rate = tpm_limit / 60  # 令牌每秒的恢复速率
+            self.remaining_tokens = max_tokens  # 令牌桶剩余容量
+            self.last_time = time.time()
+
+            # 设置限制器的RPM参数
+            self.request_interval = 60 / rpm_limit  # 请求的最小时间间隔（s）
+            self.next_request_time = 0
+
+            # 限额变化后让等待者重新计算
+            self.condition.notify_all()
+
+    # 按经过的时间恢复令牌桶
+    def _refill(self, now: float) -> None:
+        tokens_to_add = (now - self.last_time) * self.tokens_rate
+        self.remaining_tokens = min(self.max_tokens, self.remaining_tokens + tokens_to_add)
+        self.last_time = now
+
+    # 计算额度满足所需的等待时间（s），需在持有锁时调用
+    def _get_wait_time(self, tokens: int, now: float) -> float:
+        self._refill(now)
+
+        rpm_wait = max(0.0, self.next_request_time - now)
+        if tokens <= self.remaining_tokens:
+            tpm_wait = 0.0
+        elif self.tokens_rate > 0:
+            tpm_wait = (tokens - self.remaining_tokens) / self.tokens_rate
         else:
-            self.last_request_time = current_time
-            return True
+            tpm_wait = float("inf")
+        return max(rpm_wait, tpm_wait)
+
+    # 扣除额度，需在持有锁时调用
+    def _consume(self, tokens: int, now: float) -> None:
+        self.remaining_tokens -= tokens
+
+        # 唤醒延迟不超过一个间隔时沿用预定的时间槽，避免误差累积导致实际 RPM 偏低
+        if now - self.next_request_time < self.request_interval:
+            slot = self.next_request_time
+        else:
+            slot = now
+        self.next_request_time = slot + self.request_interval
 
-    def tpm_limiter(self, tokens: int) -> bool:
-        now = time.time()  # 获取现在的时间
-        tokens_to_add = (now - self.last_time) * self.tokens_rate  # 现在时间减去上一次记录的时间，乘以恢复速率，得出这段时间恢复的tokens数量
-        self.remaining_tokens = min(self.max_tokens, self.remaining_tokens + tokens_to_add)  # 计算新的剩余容量，与最大容量比较，谁小取谁值，避免发送信息超过最大容量
-        self.last_time = now  # 改变上次记录时间
+    # 检查是否超过单次请求的最大输入限制
+    def exceeds_max_tokens(self, tokens: int) -> bool:
+        return tokens >= self.max_tokens
 
-        # 检查是否超过模型最大输入限制
-        if tokens >= self.max_tokens:
-            print("[Warning INFO] 该次任务的文本总tokens量已经超过最大输入限制(3w tokens)，请检查原文文件是否有问题或者文本切分量设置过大！！！")
+    def acquire(self, tokens: int, timeout: float = None, should_stop: Callable[[], bool] = None) -> bool:
+        """
+        阻塞等待直到 RPM 与 TPM 额度可用并扣除额度
+        超时、should_stop 返回 True 或请求超过最大输入限制时返回 False
+        """
+        if self.exceeds_max_tokens(tokens):
+            print(f"[Warning INFO] 该次任务的文本总tokens量已经超过最大输入限制({self.max_tokens} tokens)，请检查原文文件是否有问题或者文本切分量设置过大！！！")
             print("[Warning INFO] 该次任务将进行拆分处理，并进入下一轮任务中....")
             return False
-        
-        # 检查是否超过余量
-        elif tokens >= self.remaining_tokens:
+
+        deadline = None if timeout is None else time.time() + timeout
+        waiter = [tokens]
+
+        with self.condition:
+            self.waiters.append(waiter)
+            try:
+                while True:
+                    now = time.time()
+
+                    # 只有队首的等待者可以获取额度，保证先来先服务
+                    if self.waiters[0] is waiter:
+                        wait_time = self._get_wait_time(tokens, now)
+                        if wait_time <= 0:
+                            self._consume(tokens, now)
+                            return True
+                    else:
+                        wait_time = None
+
+                    if should_stop is not None and should_stop():
+                        return False
+
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            return False
+                        wait_time = remaining if wait_time is None else min(wait_time, remaining)
+
+                    if should_stop is not None:
+                        wait_time = self.STOP_CHECK_INTERVAL if wait_time is None else min(wait_time, self.STOP_CHECK_INTERVAL)
+
+                    self.condition.wait(wait_time)
+            finally:
+                self.waiters.remove(waiter)
+                self.condition.notify_all()
+
+    def reserve(self, tokens: int, max_wait: float = None) -> float:
+        """
+        不阻塞，直接为请求预约下一个可用的 RPM 时间槽与 TPM 额度，返回预约的发送时间
+        供异步调用方使用，预约按调用顺序排列；等待时间超过 max_wait 时不预约并返回 None
+        预约后未发送请求时需调用 refund 归还额度
+        """
+        with self.condition:
+            now = time.time()
+            self._refill(now)
+
+            # RPM 时间槽
+            send_time = max(now, self.next_request_time)
+
+            # TPM 额度，到达时间槽时令牌桶恢复的数量不足则继续顺延
+            available = min(self.max_tokens, self.remaining_tokens + (send_time - now) * self.tokens_rate)
+            if tokens > available:
+                if self.tokens_rate <= 0:
+                    return None
+                send_time += (tokens - available) / self.tokens_rate
+
+            if max_wait is not None and send_time - now > max_wait:
+                return None
+
+            # 预先扣除额度，令牌桶余量可以为负，之后按速率恢复
+            self.remaining_tokens -= tokens
+            self.next_request_time = send_time + self.request_interval
+            return send_time
+
+    def refund(self, tokens: int, slot: float) -> None:
+        """归还已预约但未发送的请求的额度，slot 为 reserve 返回的发送时间"""
+        with self.condition:
+            self._refill(time.time())
+            self.remaining_tokens = min(self.max_tokens, self.remaining_tokens + tokens)
+
+            # 之后没有新的预约时才归还 RPM 时间槽，否则会与后面的预约重叠
+            if self.next_request_time == slot + self.request_interval:
+                self.next_request_time = slot
+
+            self.condition.notify_all()
+
+    async def acquire_async(self, tokens: int, timeout: float = None, should_stop: Callable[[], bool] = None) -> bool:
+        """acquire 的异步版本，在事件循环中等待而不占用线程"""
+        if self.exceeds_max_tokens(tokens):
+            print(f"[Warning INFO] 该次任务的文本总tokens量已经超过最大输入限制({self.max_tokens} tokens)，请检查原文文件是否有问题或者文本切分量设置过大！！！")
+            print("[Warning INFO] 该次任务将进行拆分处理，并进入下一轮任务中....")
+            return False
+
+        send_time = self.reserve(tokens, timeout)
+        if send_time is None:
             return False
-        
-        else:
-            # print("[DEBUG] 数量足够，剩余tokens：", tokens,'\n' )
-            return True
+
+        while (remaining := send_time - time.time()) > 0:
+            if should_stop is not None and should_stop():
+                self.refund(tokens, send_time)
+                return False
+            await asyncio.sleep(min(remaining, self.STOP_CHECK_INTERVAL))
+        return True
 
     def check_limiter(self, tokens: int) -> bool:
-        # 如果能够发送请求，则扣除令牌桶里的令牌数
-        with self.lock:
-            if self.rpm_limiter() and self.tpm_limiter(tokens):
-                self.remaining_tokens = self.remaining_tokens - tokens
-                return True
-            else:
+        # 不等待，如果能够立即发送请求，则扣除令牌桶里的令牌数
+        if self.exceeds_max_tokens(tokens):
+            return False
+
+        with self.condition:
+            if self.waiters:
                 return False
+            now = time.time()
+            if self._get_wait_time(tokens, now) > 0:
+                return False
+            self._consume(tokens, now)
+            return True
+
+    def get_wait_time(self, tokens: int) -> float:
+        """估算新到达的请求需要等待的时间（s），包含排在前面的等待者"""
+        with self.condition:
+            now = time.time()
+            self._refill(now)
+
+            # 排在前面的请求依次占用的 RPM 时间槽
+            queued = len(self.waiters)
+            rpm_wait = max(0.0, self.next_request_time - now) + queued * self.request_interval
+
+            # 排在前面的请求与本次请求共同消耗的 tokens
+            deficit = sum(waiter[0] for waiter in self.waiters) + tokens - self.remaining_tokens
+            if deficit <= 0:
+                tpm_wait = 0.0
+            elif self.tokens_rate > 0:
+                tpm_wait = deficit / self.tokens_rate
+            else:
+                tpm_wait = float("inf")
+
+            return max(rpm_wait, tpm_wait)
 
     # 计算消息列表内容的tokens的函数
     def num_tokens_from_messages(self, messages) -> int:
         """Return the number of tokens used by a list of messages."""
-        try:
-            encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        except KeyError:
-            print("Warning: model not found. Using cl100k_base encoding.")
-            encoding = tiktoken.get_encoding("cl100k_base")
-
-        tokens_per_message = 3
-        tokens_per_name = 1
-        num_tokens = 0
-        for message in messages:
-            num_tokens += tokens_per_message
-            for key, value in message.items():
-                # 如果value是字符串类型才计算tokens，否则跳过，因为AI在调用函数时，会在content中回复null，导致报错
-                if isinstance(value, str):
-                    num_tokens += len(encoding.encode(value))
-                if key == "name":
-                    num_tokens += tokens_per_name
-        num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
-        return num_tokens
-
+        return TokenCounter.count_message_tokens(messages)
 
     # 计算字符串内容的tokens的函数
     def num_tokens_from_str(self, text) -> int:
-        """Return the number of tokens used by a list of messages."""
-        try:
-            encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        except KeyError:
-            print("Warning: model not found. Using cl100k_base encoding.")
-            encoding = tiktoken.get_encoding("cl100k_base")
-        if isinstance(text, str):
-            num_tokens = len(encoding.encode(text))
-        else:
-            num_tokens = 0
+        """Return the number of tokens used by a string."""
+        return TokenCounter.count_tokens(text)
 
-        return num_tokens
-    
-    def calculate_tokens(self, message1, text1,):
+    def calculate_tokens(self, message1, text1, text_tokens: int = None):
         """
         根据输入的消息和文本，计算tokens消耗并返回。
+        text_tokens 为调用方已算好的文本tokens数量（如静态提示词已缓存数量的系统提示词），传入时不再重复计算。
 
         """
         if message1 and text1:
             tokens1 = self.num_tokens_from_messages(message1)
-            tokens_text1 = self.num_tokens_from_str(text1)
+            tokens_text1 = self.num_tokens_from_str(text1) if text_tokens is None else text_tokens
             return tokens1 + tokens_text1
     
     def can_make_request(self) -> bool:
         """检查是否可以发送请求（不消耗tokens）"""
-        with self.lock:
-            return self.rpm_limiter() and self.tpm_limiter(100)  # 使用100作为估算tokens
+        if self.exceeds_max_tokens(100):  # 使用100作为估算tokens
+            return False
+        return self.get_wait_time(100) <= 0
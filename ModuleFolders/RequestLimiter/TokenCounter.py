@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+from functools import cache
+
+import tiktoken  # 需要安装库pip install tiktoken
+import tiktoken_ext  # 必须导入这两个库，否则打包后无法运行
+from tiktoken_ext import openai_public
+
+
+# Token 预估统一使用的编码，与 gpt-3.5-turbo / gpt-4 一致
+ENCODING_NAME = "cl100k_base"
+
+# 每条消息的固定开销，参考 OpenAI 的计算方式
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_NAME = 1
+TOKENS_PER_REPLY = 3  # every reply is primed with <|start|>assistant<|message|>
+
+
+@cache
+def get_encoding() -> tiktoken.Encoding:
+    """进程内共享的编码器，只加载一次"""
+    return tiktoken.get_encoding(ENCODING_NAME)
+
+
+def count_tokens(text: str) -> int:
+    """计算单段文本的 Token 数量，非字符串按 0 计算"""
+    if not isinstance(text, str) or not text:
+        return 0
+    return len(get_encoding().encode(text))
+
+
+def count_tokens_batch(texts: list[str]) -> list[int]:
+    """批量计算多段文本的 Token 数量，顺序与输入一致"""
+    return [len(tokens) for tokens in get_encoding().encode_batch(texts)] if texts else []
+
+
+class TokenCountCache:
+    """
+    文本 Token 数量的 LRU 缓存
+    提示词中的系统提示词、示例与前置文本在各个子任务之间重复出现，只需编码一次
+    """
+
+    MAX_SIZE = 1024
+
+    def __init__(self, max_size: int = MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.data = OrderedDict()
+
+    def count(self, texts: list[str]) -> list[int]:
+        """返回每段文本的 Token 数量，未缓存的文本合并为一次批量编码"""
+        results = [0] * len(texts)
+        pending = {}  # 文本 -> 结果中的位置
+        with self.lock:
+            for index, text in enumerate(texts):
+                if not text:
+                    continue
+                tokens = self.data.get(text)
+                if tokens is None:
+                    pending.setdefault(text, []).append(index)
+                else:
+                    self.data.move_to_end(text)
+                    results[index] = tokens
+
+        if pending:
+            pending_texts = list(pending.keys())
+            counts = count_tokens_batch(pending_texts)
+            with self.lock:
+                for text, tokens in zip(pending_texts, counts):
+                    for index in pending[text]:
+                        results[index] = tokens
+                    self.data[text] = tokens
+                while len(self.data) > self.max_size:
+                    self.data.popitem(last=False)
+
+        return results
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+
+
+# 进程内共享的缓存
+_token_count_cache = TokenCountCache()
+
+
+def count_tokens_cached(text: str) -> int:
+    """计算文本的 Token 数量，结果会被缓存，适合会在多个任务中重复出现的文本"""
+    if not isinstance(text, str) or not text:
+        return 0
+    return _token_count_cache.count([text])[0]
+
+
+def count_message_tokens(messages: list[dict]) -> int:
+    """计算消息列表的 Token 数量，所有消息内容合并为一次批量编码，重复出现的消息使用缓存"""
+    texts = []
+    num_tokens = TOKENS_PER_REPLY
+    for message in messages:
+        num_tokens += TOKENS_PER_MESSAGE
+        for key, value in message.items():
+            # 如果value是字符串类型才计算tokens，否则跳过，因为AI在调用函数时，会在content中回复null，导致报错
+            if isinstance(value, str):
+                texts.append(value)
+            if key == "name":
+                num_tokens += TOKENS_PER_NAME
+    return num_tokens + sum(_token_count_cache.count(texts))
@@ -0,0 +1,123 @@
+import re
+
+
+# 流式回复检查器
+class StreamChecker():
+    """
+    随回复片段到达增量检查译文
+    逐行解析 textarea 中以数字序号开头的译文行，序号不连续、行数超出原文，
+    或思考与回复内容陷入重复循环时立即给出错误信息，供请求器提前中止请求
+    """
+
+    # 行首数字序号，排除多行文本块内的 "1.1." 形式的子序号
+    line_number_reg = re.compile(r'^(\d+)\.(?!\d+\.)')
+
+    # 文本每增长该长度进行一次重复检测
+    REPEAT_CHECK_STEP = 64
+
+    # 重复检测的最大周期长度
+    REPEAT_MAX_PERIOD = 256
+
+    # 重复片段的最少出现次数与最短总长度，同时满足时判定为重复循环
+    REPEAT_MIN_COUNT = 4
+    REPEAT_MIN_LENGTH = 320
+
+    def __init__(self, expected_lines: int) -> None:
+        self.expected_lines = expected_lines
+        self.error = ""
+
+        # 回复内容的逐行解析状态
+        self.content = ""
+        self.scan_pos = 0
+        self.in_think = False
+        self.in_textarea = False
+        self.last_number = 0
+
+        # 思考内容
+        self.think = ""
+
+        # 上一次重复检测时的文本长度
+        self.content_checked = 0
+        self.think_checked = 0
+
+    # 追加思考内容片段，检查未通过时返回错误信息
+    def feed_think(self, text: str) -> str:
+        if self.error or not text:
+            return self.error
+
+        self.think += text
+        if len(self.think) - self.think_checked >= self.REPEAT_CHECK_STEP:
+            self.think_checked = len(self.think)
+            if self.detect_repetition(self.think):
+                self.error = "【重复循环】 - 思考内容出现重复循环"
+        return self.error
+
+    # 追加回复内容片段，检查未通过时返回错误信息
+    def feed_content(self, text: str) -> str:
+        if self.error or not text:
+            return self.error
+
+        self.content += text
+
+        # 只解析已经完整的行
+        end = self.content.rfind("\n")
+        if end >= self.scan_pos:
+            for line in self.content[self.scan_pos:end].split("\n"):
+                self.check_line(line)
+                if self.error:
+                    return self.error
+            self.scan_pos = end + 1
+
+        if len(self.content) - self.content_checked >= self.REPEAT_CHECK_STEP:
+            self.content_checked = len(self.content)
+            if self.detect_repetition(self.content):
+                self.error = "【重复循环】 - 回复内容出现重复循环"
+        return self.error
+
+    # 检查一行回复内容
+    def check_line(self, line: str) -> None:
+        # 回复内容中的思考部分不参与检查
+        if "<think>" in line:
+            self.in_think = True
+        if "</think>" in line:
+            self.in_think = False
+            line = line.split("</think>")[-1]
+        if self.in_think:
+            return
+
+        # 只检查最后一个 textarea 标签中的内容，出现新的标签时重新计数
+        if "<textarea" in line:
+            self.in_textarea = True
+            self.last_number = 0
+            line = line.split(">", 1)[-1] if ">" in line.split("<textarea", 1)[-1] else ""
+        closed = "</textarea>" in line
+        if closed:
+            line = line.split("</textarea>")[0]
+        if not self.in_textarea:
+            return
+
+        match = self.line_number_reg.match(line.strip())
+        if match:
+            number = int(match.group(1))
+            if number > self.expected_lines:
+                self.error = f"【行数错误】 - 译文行数超出原文行数 {self.expected_lines}"
+            elif number != self.last_number + 1 and self.expected_lines > 1:
+                self.error = "【行数错误】 - 出现错行串行"
+            self.last_number = number
+
+        if closed:
+            self.in_textarea = False
+
+    # 检测文本末尾是否由同一片段重复构成
+    @classmethod
+    def detect_repetition(cls, text: str) -> bool:
+        tail = text[-(cls.REPEAT_MAX_PERIOD * cls.REPEAT_MIN_COUNT + cls.REPEAT_MIN_LENGTH):]
+        for period in range(1, cls.REPEAT_MAX_PERIOD + 1):
+            span = max(cls.REPEAT_MIN_LENGTH, period * cls.REPEAT_MIN_COUNT)
+            if span > len(tail):
+                break
+            # 字符串 s 以 p 为周期等价于 s[p:] == s[:-p]
+            segment = tail[-span:]
+            if segment[period:] == segment[:-period] and segment.strip():
+                return True
+        return False
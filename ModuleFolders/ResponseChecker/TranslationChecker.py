@@ -31,7 +31,9 @@ class TranslationChecker(Base):
     def __init__(self, cache_manager: CacheManager):
         super().__init__()
         self.cache_manager = cache_manager
-        self.config = self.load_config()
+        self.config = self.get_config_snapshot()
+        # 本次检查用到的语言检测缓存键，只有这些结果会保存到项目缓存中
+        self.detection_keys = set()
 
     def check_language(self, mode: str) -> Tuple[str, Dict]:
         """
@@ -71,8 +73,11 @@ class TranslationChecker(Base):
             self.info(self.tra("模式: 宏观统计【将报告每个文件的整体语言组成】"))
         self.print("-" * 20)
 
-        # 执行分析
+        # 执行分析，复用项目缓存中保存的检测结果
         all_results = []
+        detection_cache = ReaderUtil.get_lang_detection_cache()
+        detection_cache.load_from_project(self.cache_manager.project)
+        self.detection_keys = set()
         try:
             for cache_file in self.cache_manager.project.files.values():
                 if is_judging:
@@ -87,6 +92,7 @@ class TranslationChecker(Base):
                         all_results.append(analysis_result)
         finally:
             ReaderUtil.close_lang_detector()
+            detection_cache.save_to_project(self.cache_manager.project, self.detection_keys)
         self.info(self.tra("语言检查完成，耗时 {:.2f} 秒").format(time.time() - start_time))
 
         # 如果在精准判断模式下发现了问题，则保存带有标记的缓存
@@ -94,8 +100,7 @@ class TranslationChecker(Base):
             self.info(self.tra("检测到语言不匹配项，正在将标记保存到磁盘..."))
             try:
                 # 从配置中获取正确的输出路径。
-                config = self.load_config()
-                output_path = config.get("label_output_path")
+                output_path = self.get_config_snapshot().get("label_output_path")
 
                 if output_path and os.path.isdir(output_path):
                     #为 CacheManager 设置必要的保存路径
@@ -154,9 +159,7 @@ class TranslationChecker(Base):
     def _run_detection(self, items_to_check: List[CacheItem], check_target: str) -> list:
         """辅助函数，对给定的 CacheItem 列表运行语言检测。"""
         texts = [getattr(item, check_target, "") for item in items_to_check]
-        # 使用一个临时的、不包含任何复杂数据的 CacheItem 列表进行检测
-        dummy_items = [CacheItem(source_text=t) for t in texts]
-        return ReaderUtil.detect_language_with_mediapipe(dummy_items, 0, None)
+        return ReaderUtil.detect_language_texts(texts, self.detection_keys)
 
 
     def _analyze_file_in_chunks(self, cache_file, check_target: str, target_language_code: str, flag_key: str) -> Dict[str, Any] | None:
@@ -3,6 +3,7 @@ import re
 import threading
 
 from Base.Base import Base
+from Base.EventManager import EventManager
 from ModuleFolders.LLMRequester.LLMRequester import LLMRequester
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.TaskConfig.TaskType import TaskType
@@ -21,21 +22,22 @@ class SimpleExecutor(Base):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # 各处理函数只负责启动子线程，直接在触发事件的线程中执行，无需经过 Qt 事件循环
 
         # 订阅接口测试开始事件
-        self.subscribe(Base.EVENT.API_TEST_START, self.api_test_start)
+        self.subscribe(Base.EVENT.API_TEST_START, self.api_test_start, EventManager.DISPATCH_SYNC)
         # 订阅术语表翻译开始事件
-        self.subscribe(Base.EVENT.GLOSS_TASK_START, self.glossary_translation_start)
+        self.subscribe(Base.EVENT.GLOSS_TASK_START, self.glossary_translation_start, EventManager.DISPATCH_SYNC)
         # 订阅表格翻译任务事件
-        self.subscribe(Base.EVENT.TABLE_TRANSLATE_START, self.handle_table_translation_start)
+        self.subscribe(Base.EVENT.TABLE_TRANSLATE_START, self.handle_table_translation_start, EventManager.DISPATCH_SYNC)
         # 订阅表格润色任务事件
-        self.subscribe(Base.EVENT.TABLE_POLISH_START, self.handle_table_polish_start)
+        self.subscribe(Base.EVENT.TABLE_POLISH_START, self.handle_table_polish_start, EventManager.DISPATCH_SYNC)
         # 订阅表格派能任务事件
-        self.subscribe(Base.EVENT.TABLE_FORMAT_START, self.handle_table_format_start)
+        self.subscribe(Base.EVENT.TABLE_FORMAT_START, self.handle_table_format_start, EventManager.DISPATCH_SYNC)
         # 订阅术语提取任务事件
-        self.subscribe(Base.EVENT.TERM_EXTRACTION_START, self.handle_term_extraction_start)
+        self.subscribe(Base.EVENT.TERM_EXTRACTION_START, self.handle_term_extraction_start, EventManager.DISPATCH_SYNC)
         # 订阅术语提取翻译事件
-        self.subscribe(Base.EVENT.TERM_TRANSLATE_SAVE_START, self.handle_term_translate_save_start)
+        self.subscribe(Base.EVENT.TERM_TRANSLATE_SAVE_START, self.handle_term_translate_save_start, EventManager.DISPATCH_SYNC)
 
     # 响应接口测试开始事件
     def api_test_start(self, event: int, data: dict):
@@ -637,20 +639,34 @@ class SimpleExecutor(Base):
         self.info(f"开始处理术语提取任务... 参数: {params}")
         self.info(f"共收到 {len(items_data)} 条待处理数据。")
 
-        # 实例化独立的处理器
-        processor = NERProcessor()
-        
-        # 调用处理器的方法，传入正确的参数
-        results = processor.extract_terms(
-            items_data=items_data,
-            model_name=params.get("model_name"), # 使用 model_name
-            entity_types=params.get("entity_types")
-        )
-        
-        self.info(f"术语提取完成，共找到 {len(results)} 个术语。")
-
-        # 工作完成后，发射完成事件将结果传回UI线程
-        self.emit(Base.EVENT.TERM_EXTRACTION_DONE, {"results": results})
+        # 无论提取是否成功都要发射完成事件，否则界面的进度提示不会关闭
+        results = []
+        error = ""
+        try:
+            # 实例化独立的处理器
+            processor = NERProcessor()
+            
+            # 调用处理器的方法，传入正确的参数
+            results = processor.extract_terms(
+                items_data=items_data,
+                model_name=params.get("model_name"), # 使用 model_name
+                entity_types=params.get("entity_types"),
+                batch_size=params.get("batch_size"),
+                n_process=params.get("n_process"),
+                on_progress=lambda processed, total, found: self.emit(Base.EVENT.TERM_EXTRACTION_UPDATE, {
+                    "processed": processed,
+                    "total": total,
+                    "found": found,
+                }),
+            )
+            
+            self.info(f"术语提取完成，共找到 {len(results)} 个术语。")
+        except Exception as e:
+            self.error(f"术语提取任务错误 ... {e}", e if self.is_debug() else None)
+            error = str(e)
+        finally:
+            # 工作完成后，发射完成事件将结果传回UI线程
+            self.emit(Base.EVENT.TERM_EXTRACTION_DONE, {"results": results, "error": error})
 
 
     # 响应翻译并保存术语表的事件，启动新线程
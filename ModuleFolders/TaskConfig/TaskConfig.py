@@ -7,6 +7,8 @@ import rapidjson as json
 
 from Base.Base import Base
 from ModuleFolders.TaskConfig.TaskType import TaskType
+from ModuleFolders.RequestLimiter.ApiKeyPool import ApiKeyPool
+from ModuleFolders.RequestLimiter.RequestLimiter import RequestLimiter
 
 
 # 接口请求器
@@ -25,6 +27,9 @@ class TaskConfig(Base):
         self.apikey_index = 0
         self.apikey_list = []
 
+        # 密钥池，按密钥分别限额并跳过冷却中的密钥
+        self.apikey_pool = ApiKeyPool()
+
 
     def __repr__(self) -> str:
         return (
@@ -41,8 +46,13 @@ class TaskConfig(Base):
 
     def get_next_apikey(self) -> str:
         """
-        线程安全的轮询获取 API Key
+        线程安全地获取 API Key
+        优先从密钥池中选择负载最低的健康密钥，密钥池不可用时退回轮询
         """
+        key = self.apikey_pool.select()
+        if key is not None:
+            return key
+
         with self._api_key_lock:
             if not self.apikey_list:
                 return "no_key_required"
@@ -61,8 +71,8 @@ class TaskConfig(Base):
 
     # 读取配置文件
     def initialize(self) -> None:
-        # 读取配置文件
-        config = self.load_config()
+        # 读取配置文件，并记录其版本号，依赖配置的缓存以此判断是否需要重建
+        config, self.config_version = self.load_config_with_version()
 
         # 将字典中的每一项赋值到类中的同名属性
         for key, value in config.items():
@@ -110,10 +120,16 @@ class TaskConfig(Base):
         # 获取接口限额
         self.rpm_limit = self.platforms.get(self.target_platform).get("rpm_limit", 4096)    # 当取不到账号类型对应的预设值，则使用该值
         self.tpm_limit = self.platforms.get(self.target_platform).get("tpm_limit", 10000000)    # 当取不到账号类型对应的预设值，则使用该值
+        # 单次请求允许的最大 Token 数，预设接口均已配置，旧版配置文件中缺少该项的接口使用限流器的默认值
+        self.request_tokens_limit = self.platforms.get(self.target_platform).get("request_tokens_limit", RequestLimiter.DEFAULT_MAX_TOKENS)
+
+        # 每个密钥使用独立的 RPM 和 TPM 限额
+        self.apikey_pool.configure(self.apikey_list, self.rpm_limit, self.tpm_limit, self.request_tokens_limit)
 
-        # 根据密钥数量给 RPM 和 TPM 限额翻倍
-        self.rpm_limit = self.rpm_limit * len(self.apikey_list)
-        self.tpm_limit = self.tpm_limit * len(self.apikey_list)
+        # 总限额为各密钥限额之和，用于计算同时执行的任务数量，重复的密钥在密钥池中只算一个
+        key_count = max(1, len(set(self.apikey_list)))
+        self.rpm_limit = self.rpm_limit * key_count
+        self.tpm_limit = self.tpm_limit * key_count
 
         # 如果开启自动设置输出文件夹功能，设置为输入文件夹的平级目录
         if self.auto_set_output_path == True:
@@ -138,6 +154,11 @@ class TaskConfig(Base):
         # 计算实际线程数
         self.actual_thread_counts = self.thread_counts_setting(self.user_thread_counts,self.target_platform,self.rpm_limit)
 
+        # 开启自适应并发时，线程池按并发上限创建，实际同时进行的请求数量由控制器动态调整
+        if self.adaptive_concurrency_switch:
+            self.adaptive_concurrency_min = max(1, self.adaptive_concurrency_min)
+            self.adaptive_concurrency_max = max(self.adaptive_concurrency_min, self.adaptive_concurrency_max or self.actual_thread_counts * 2)
+
 
     # 自动计算实际请求线程数
     def thread_counts_setting(self,user_thread_counts,target_platform,rpm_limit) -> None:
@@ -197,7 +218,7 @@ class TaskConfig(Base):
 
 
     # 获取接口配置信息包
-    def get_platform_configuration(self,platform_type):
+    def get_platform_configuration(self,platform_type, api_key: str = None):
 
         if platform_type == "translationReq":
             target_platform = self.api_settings["translate"]
@@ -207,7 +228,7 @@ class TaskConfig(Base):
             target_platform = self.api_settings["format"]
 
         api_url = self.base_url
-        api_key = self.get_next_apikey()
+        api_key = api_key or self.get_next_apikey()
         api_format = self.platforms.get(target_platform).get("api_format")
         model_name = self.model
         region = self.platforms.get(target_platform).get("region",'')
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import concurrent.futures
+from typing import Coroutine
+
+
+class AsyncRequestEngine:
+    """
+    异步请求引擎
+    在后台线程中常驻一个 asyncio 事件循环，异步模式下的翻译与润色任务都在该循环中执行，
+    大量并发请求只占用少量线程，异步客户端与连接池也在多轮任务之间复用
+    """
+
+    # 不支持异步客户端的接口在线程中执行同步请求，该值为这部分请求可用的线程数上限
+    FALLBACK_WORKERS = 100
+
+    def __init__(self) -> None:
+        self.loop = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    # 启动事件循环（已启动时直接返回）
+    def start(self) -> None:
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+
+            ready = threading.Event()
+            self.loop = asyncio.new_event_loop()
+            self.loop.set_default_executor(
+                concurrent.futures.ThreadPoolExecutor(max_workers = self.FALLBACK_WORKERS, thread_name_prefix = "async_fallback")
+            )
+
+            def run() -> None:
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(ready.set)
+                self.loop.run_forever()
+
+            self.thread = threading.Thread(target = run, name = "async_request_engine", daemon = True)
+            self.thread.start()
+            ready.wait()
+
+    # 提交协程，返回可在其他线程中等待的 Future
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
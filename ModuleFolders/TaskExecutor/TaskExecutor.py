@@ -1,16 +1,19 @@
+import os
 import time
+import queue
 import threading
 import concurrent.futures
 import opencc
-from tqdm import tqdm
 
 from Base.Base import Base
 from ModuleFolders.Cache.CacheItem import TranslationStatus
 from ModuleFolders.Cache.CacheManager import CacheManager
 from ModuleFolders.Cache.CacheProject import CacheProjectStatistics
+from ModuleFolders.Cache.TranslationMemory import TranslationMemory, TranslationMemorySession
 from ModuleFolders.TaskConfig.TaskType import TaskType
 from ModuleFolders.TaskExecutor.TranslatorTask import TranslatorTask
 from ModuleFolders.TaskExecutor.PolisherTask import PolisherTask
+from ModuleFolders.TaskExecutor.AsyncRequestEngine import AsyncRequestEngine
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.PromptBuilder.PromptBuilder import PromptBuilder
 from ModuleFolders.PromptBuilder.PromptBuilderPolishing import PromptBuilderPolishing
@@ -23,6 +26,9 @@ from ModuleFolders.TaskExecutor.TranslatorUtil import get_source_language_for_fi
 # 翻译器
 class TaskExecutor(Base):
 
+    # 预处理队列容量相对于并发任务数量的倍数
+    PREPARE_QUEUE_FACTOR = 2
+
     def __init__(self, plugin_manager,cache_manager, file_reader, file_writer) -> None:
         super().__init__()
 
@@ -34,6 +40,9 @@ class TaskExecutor(Base):
         self.config = TaskConfig()
         self.request_limiter = RequestLimiter()
         self.executor = None  # 用于保存线程池执行器的引用
+        self.async_engine = AsyncRequestEngine()  # 异步模式下执行请求任务的事件循环
+        self.translation_memory = TranslationMemory()  # 持久化翻译记忆
+        self.memory_session = None  # 本次翻译任务的翻译记忆会话，未开启时为空
 
     # 任务停止事件
     def task_stop(self, event: int, data: dict) -> None:
@@ -111,8 +120,13 @@ class TaskExecutor(Base):
         # 配置翻译平台信息
         self.config.prepare_for_translation(TaskType.TRANSLATION)
 
-        # 配置请求限制器
-        self.request_limiter.set_limit(self.config.tpm_limit, self.config.rpm_limit)
+        # 配置自适应并发控制器，RPM 和 TPM 限额已在密钥池中按密钥分别配置
+        self.request_limiter.concurrency.configure(
+            self.config.adaptive_concurrency_switch,
+            self.config.actual_thread_counts,
+            self.config.adaptive_concurrency_min,
+            self.config.adaptive_concurrency_max,
+        )
 
         # 初开始翻译时，生成监控数据
         if continue_status == False:
@@ -132,6 +146,14 @@ class TaskExecutor(Base):
         # 触发插件事件
         self.plugin_manager.broadcast_event("text_filter", self.config, self.cache_manager.project)
         self.plugin_manager.broadcast_event("preproces_text", self.config, self.cache_manager.project)
+        self.cache_manager.search_index.invalidate()
+
+        # 开启翻译记忆时，切分片段前先用记忆预填条目，并对重复原文去重
+        if self.config.translation_memory_switch:
+            self.memory_session = TranslationMemorySession(self.translation_memory, self.config, self.memory_filled_callback)
+            self.translation_memory.reset_stats()
+        else:
+            self.memory_session = None
 
         # 根据最大轮次循环
         for current_round in range(self.config.round_limit + 1):
@@ -139,6 +161,8 @@ class TaskExecutor(Base):
             if Base.work_status == Base.STATUS.STOPING:
                 # 循环次数比实际最大轮次要多一轮，当触发停止翻译的事件时，最后都会从这里退出任务
                 # 执行到这里说明停止任意的任务已经执行完毕，可以重置内部状态了
+                # 将停止前的变更合并为全量缓存文件
+                self.cache_manager.compact_to_file(self.config.label_output_path)
                 Base.work_status = Base.STATUS.TASKSTOPPED
                 self.print("")
                 self.info("翻译任务已停止 ...")
@@ -172,30 +196,20 @@ class TaskExecutor(Base):
                 self.config.lines_limit = max(1, int(self.config.lines_limit / 2))
                 self.config.tokens_limit = max(1, int(self.config.tokens_limit / 2))
 
-            # 生成缓存数据条目片段的合集列表，原文列表与上文列表一一对应
-            chunks, previous_chunks, file_paths = self.cache_manager.generate_item_chunks(
+            # 逐个生成缓存数据条目片段，原文片段与上文片段一一对应，翻译任务在线程空闲时按需生成
+            if self.memory_session is not None:
+                self.memory_session.begin_round()
+            chunk_iter = self.cache_manager.iter_item_chunks(
                 "line" if self.config.tokens_limit_switch == False else "token",
                 self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
                 self.config.pre_line_counts,
-                TaskType.TRANSLATION
+                TaskType.TRANSLATION,
+                self.memory_session.filter_items if self.memory_session is not None else None,
+            )
+            tasks_iter = self.iter_prepared_tasks(
+                self.iter_translation_tasks(chunk_iter),
+                lambda task: task.prepare(self.config.target_platform),
             )
-
-            # 生成翻译任务合集列表
-            tasks_list = []
-            print("")
-            self.info(f"正在生成翻译任务 ...")
-            for chunk, previous_chunk, file_path in tqdm(zip(chunks, previous_chunks, file_paths),desc="生成翻译任务", total=len(chunks)):
-                # 确定该任务的主语言
-                language_stats = self.cache_manager.project.get_file(file_path).language_stats # 获取该文件的语言检测数据
-                file_source_lang = get_source_language_for_file(self.config.source_language,self.config.target_language,language_stats)
-
-                task = TranslatorTask(self.config, self.plugin_manager, self.request_limiter, file_source_lang)  # 实例化
-                task.set_items(chunk)  # 传入该任务待翻译原文
-                task.set_previous_items(previous_chunk)  # 传入该任务待翻译原文的上文
-                task.prepare(self.config.target_platform)  # 预先构建消息列表
-                tasks_list.append(task)
-            self.info(f"已经生成全部翻译任务 ...")
-            self.print("")
 
             # 输出开始翻译的日志
             self.print("")
@@ -228,40 +242,36 @@ class TaskExecutor(Base):
             if system:
                 self.info(f"本次任务使用以下基础提示词：\n{system}\n") 
 
-            self.info(f"即将开始执行翻译任务，预计任务总数为 {len(tasks_list)}, 同时执行的任务数量为 {self.config.actual_thread_counts}，请注意保持网络通畅 ...")
-            time.sleep(3)
+            self.info(f"即将开始执行翻译任务，待翻译条目数为 {item_count_status_untranslated}, 同时执行的任务数量为 {self.config.actual_thread_counts}，请注意保持网络通畅 ...")
             self.print("")
 
-            # 开始执行翻译任务,构建异步线程池
-            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.config.actual_thread_counts, thread_name_prefix = "translator")
-            try:
-                futures = []
-                for task in tasks_list:
-                    # 检测是否需要停止任务
-                    if Base.work_status == Base.STATUS.STOPING:
-                        break
-                    future = self.executor.submit(task.start)
-                    future.add_done_callback(self.task_done_callback)  # 为future对象添加一个回调函数，当任务完成时会被调用，更新数据
-                    futures.append(future)
-                
-                # 等待所有任务完成或被取消
-                for future in futures:
-                    # 检测是否需要停止任务
-                    if Base.work_status == Base.STATUS.STOPING:
-                        break
-                    try:
-                        future.result()  # 等待任务完成
-                    except Exception as e:
-                        self.error(f"任务执行出错: {e}", e if self.is_debug() else None)
-            finally:
-                self.executor.shutdown(wait=False)  # 关闭线程池
-                self.executor = None
+            # 开始执行翻译任务
+            self.execute_tasks(tasks_iter)
+
+        # 输出翻译记忆的复用统计
+        if self.memory_session is not None:
+            stats = self.memory_session.get_stats()
+            self.memory_session = None
+            self.print("")
+            self.info(
+                f"翻译记忆 - 记忆复用 {stats['memory_filled']} 条，重复原文复用 {stats['duplicate_filled']} 条，"
+                f"查询命中率 {stats['hit_rate']:.1%}（内存 {stats['memory_hits']} / 数据库 {stats['db_hits']}），"
+                f"约节省原文 {stats['tokens_saved']} tokens"
+            )
+            self.print("")
+
+        # 输出各密钥的请求统计
+        self.log_apikey_stats()
 
         # 等待可能存在的缓存文件写入请求处理完毕
         time.sleep(CacheManager.SAVE_INTERVAL)
 
-        # 触发插件事件
+        # 将增量日志合并为全量缓存文件
+        self.cache_manager.compact_to_file(self.config.label_output_path)
+
+        # 触发插件事件，插件直接修改条目文本，需使搜索索引失效
         self.plugin_manager.broadcast_event("postprocess_text", self.config, self.cache_manager.project)
+        self.cache_manager.search_index.invalidate()
 
         # 如果开启了转换简繁开关功能，则进行文本转换
         if self.config.response_conversion_toggle:
@@ -278,6 +288,9 @@ class TaskExecutor(Base):
                 if item.translation_status == TranslationStatus.POLISHED:
                     item.polished_text = converter.convert(item.polished_text)
 
+            # 转换直接修改了条目文本，需使搜索索引失效
+            self.cache_manager.search_index.invalidate()
+
         # 输出配置包
         output_config = {
              "translated_suffix": self.config.output_filename_suffix,
@@ -312,14 +325,22 @@ class TaskExecutor(Base):
         # 设置翻译状态为正在翻译状态
         Base.work_status = Base.STATUS.TASKING
 
+        # 翻译记忆只用于翻译任务
+        self.memory_session = None
+
         # 读取配置文件，并保存到该类中
         self.config.initialize()
 
         # 配置翻译平台信息
         self.config.prepare_for_translation(TaskType.POLISH)
 
-        # 配置请求限制器
-        self.request_limiter.set_limit(self.config.tpm_limit, self.config.rpm_limit)
+        # 配置自适应并发控制器，RPM 和 TPM 限额已在密钥池中按密钥分别配置
+        self.request_limiter.concurrency.configure(
+            self.config.adaptive_concurrency_switch,
+            self.config.actual_thread_counts,
+            self.config.adaptive_concurrency_min,
+            self.config.adaptive_concurrency_max,
+        )
 
         # 初开始任务时，生成监控数据
         if continue_status == False:
@@ -344,6 +365,8 @@ class TaskExecutor(Base):
             if Base.work_status == Base.STATUS.STOPING:
                 # 循环次数比实际最大轮次要多一轮，当触发停止翻译的事件时，最后都会从这里退出任务
                 # 执行到这里说明停止任意的任务已经执行完毕，可以重置内部状态了
+                # 将停止前的变更合并为全量缓存文件
+                self.cache_manager.compact_to_file(self.config.label_output_path)
                 Base.work_status = Base.STATUS.TASKSTOPPED
                 self.print("")
                 self.info("润色任务已停止 ...")
@@ -380,34 +403,26 @@ class TaskExecutor(Base):
                 self.config.lines_limit = max(1, int(self.config.lines_limit / 2))
                 self.config.tokens_limit = max(1, int(self.config.tokens_limit / 2))
 
-            # 生成缓存数据条目片段的合集列表
+            # 逐个生成缓存数据条目片段，润色任务在线程空闲时按需生成
             if self.config.polishing_mode_selection == "source_text_polish":
-                chunks, previous_chunks, file_paths = self.cache_manager.generate_item_chunks(
+                chunk_iter = self.cache_manager.iter_item_chunks(
                     "line" if self.config.tokens_limit_switch == False else "token",
                     self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
                     self.config.polishing_pre_line_counts,
                     TaskType.TRANSLATION
                 )
             elif self.config.polishing_mode_selection == "translated_text_polish":
-                chunks, previous_chunks, file_paths = self.cache_manager.generate_item_chunks(
+                chunk_iter = self.cache_manager.iter_item_chunks(
                     "line" if self.config.tokens_limit_switch == False else "token",
                     self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
                     self.config.polishing_pre_line_counts,
                     TaskType.POLISH
                 )
 
-            # 生成润色任务合集列表
-            tasks_list = []
-            print("")
-            self.info(f"正在生成润色任务 ...")
-            for chunk, previous_chunk, file_path in tqdm(zip(chunks, previous_chunks, file_paths),desc="生成润色任务", total=len(chunks)):
-                task = PolisherTask(self.config, self.plugin_manager, self.request_limiter)  # 实例化
-                task.set_items(chunk)  # 传入该任务待润色文
-                task.set_previous_items(previous_chunk)  # 传入该任务待润色文的上文
-                task.prepare()  # 预先构建消息列表
-                tasks_list.append(task)
-            self.info(f"已经生成全部润色任务 ...")
-            self.print("")
+            tasks_iter = self.iter_prepared_tasks(
+                self.iter_polish_tasks(chunk_iter),
+                lambda task: task.prepare(),
+            )
 
             # 输出开始翻译的日志
             self.print("")
@@ -433,38 +448,21 @@ class TaskExecutor(Base):
             if system:
                 self.info(f"本次任务使用以下基础提示词：\n{system}\n") 
 
-            self.info(f"即将开始执行润色任务，预计任务总数为 {len(tasks_list)}, 同时执行的任务数量为 {self.config.actual_thread_counts}，请注意保持网络通畅 ...")
-            time.sleep(3)
+            self.info(f"即将开始执行润色任务，待润色条目数为 {item_count_status_unpolishd}, 同时执行的任务数量为 {self.config.actual_thread_counts}，请注意保持网络通畅 ...")
             self.print("")
 
-            # 开始执行润色务,构建异步线程池
-            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.config.actual_thread_counts, thread_name_prefix = "translator")
-            try:
-                futures = []
-                for task in tasks_list:
-                    # 检测是否需要停止任务
-                    if Base.work_status == Base.STATUS.STOPING:
-                        break
-                    future = self.executor.submit(task.start)
-                    future.add_done_callback(self.task_done_callback)  # 为future对象添加一个回调函数，当任务完成时会被调用，更新数据
-                    futures.append(future)
-                
-                # 等待所有任务完成或被取消
-                for future in futures:
-                    # 检测是否需要停止任务
-                    if Base.work_status == Base.STATUS.STOPING:
-                        break
-                    try:
-                        future.result()  # 等待任务完成
-                    except Exception as e:
-                        self.error(f"任务执行出错: {e}", e if self.is_debug() else None)
-            finally:
-                self.executor.shutdown(wait=False)  # 关闭线程池
-                self.executor = None
+            # 开始执行润色任务
+            self.execute_tasks(tasks_iter)
+
+        # 输出各密钥的请求统计
+        self.log_apikey_stats()
 
         # 等待可能存在的缓存文件写入请求处理完毕
         time.sleep(CacheManager.SAVE_INTERVAL)
 
+        # 将增量日志合并为全量缓存文件
+        self.cache_manager.compact_to_file(self.config.label_output_path)
+
         # 输出配置包
         output_config = {
              "translated_suffix": self.config.output_filename_suffix,
@@ -493,12 +491,153 @@ class TaskExecutor(Base):
 
 
 
+    # 按需生成翻译任务
+    def iter_translation_tasks(self, chunk_iter):
+        for chunk, previous_chunk, file_path in chunk_iter:
+            # 确定该任务的主语言
+            language_stats = self.cache_manager.project.get_file(file_path).language_stats # 获取该文件的语言检测数据
+            file_source_lang = get_source_language_for_file(self.config.source_language,self.config.target_language,language_stats)
+
+            task = TranslatorTask(self.config, self.plugin_manager, self.request_limiter, file_source_lang)  # 实例化
+            task.set_items(chunk)  # 传入该任务待翻译原文
+            task.set_previous_items(previous_chunk)  # 传入该任务待翻译原文的上文
+            yield task
+
+    # 按需生成润色任务
+    def iter_polish_tasks(self, chunk_iter):
+        for chunk, previous_chunk, file_path in chunk_iter:
+            task = PolisherTask(self.config, self.plugin_manager, self.request_limiter)  # 实例化
+            task.set_items(chunk)  # 传入该任务待润色文
+            task.set_previous_items(previous_chunk)  # 传入该任务待润色文的上文
+            yield task
+
+    # 获取线程池大小，开启自适应并发时按并发上限创建
+    def get_max_workers(self) -> int:
+        if self.config.adaptive_concurrency_switch:
+            return self.config.adaptive_concurrency_max
+        return self.config.actual_thread_counts
+
+    # 流水线预处理任务：后台线程按顺序生成任务并交给预处理线程池构建消息列表，
+    # 预处理结果按顺序放入有界队列，首批任务不必等待后续任务预处理完毕即可发出
+    def iter_prepared_tasks(self, tasks_iter, prepare):
+        max_workers = self.get_max_workers()
+        prepare_workers = max(1, min(max_workers, os.cpu_count() or 1))
+
+        # 已预处理（或正在预处理）但尚未提交的任务数量上限
+        prepared = queue.Queue(maxsize = max(1, max_workers * self.PREPARE_QUEUE_FACTOR))
+        finished = threading.Event()
+        end = object()
+
+        def prepare_task(task):
+            prepare(task)
+            return task
+
+        def put(value) -> bool:
+            while not finished.is_set():
+                try:
+                    prepared.put(value, timeout = 0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed() -> None:
+            try:
+                for task in tasks_iter:
+                    if Base.work_status == Base.STATUS.STOPING:
+                        break
+                    if not put(prepare_executor.submit(prepare_task, task)):
+                        break
+            except Exception as e:
+                self.error(f"生成任务时出现错误 ... {e}", e if self.is_debug() else None)
+            finally:
+                put(end)
+
+        prepare_executor = concurrent.futures.ThreadPoolExecutor(max_workers = prepare_workers, thread_name_prefix = "preparer")
+        threading.Thread(target = feed, daemon = True).start()
+        try:
+            while True:
+                try:
+                    value = prepared.get(timeout = 0.5)
+                except queue.Empty:
+                    # 检测是否需要停止任务
+                    if Base.work_status == Base.STATUS.STOPING:
+                        return
+                    continue
+
+                if value is end:
+                    return
+
+                try:
+                    yield value.result()
+                except Exception as e:
+                    # 预处理失败的任务跳过，条目保持原状态，由下一轮重新处理
+                    self.error(f"任务预处理错误 ... {e}", e if self.is_debug() else None)
+        finally:
+            finished.set()
+            prepare_executor.shutdown(wait = False, cancel_futures = True)
+
+    # 执行任务，线程池有空闲时才生成并提交下一个任务，避免预先生成全部任务
+    def execute_tasks(self, tasks_iter) -> None:
+        max_workers = self.get_max_workers()
+
+        # 已提交但未完成的任务数量上限，留出少量余量让线程池不空转
+        slots = threading.BoundedSemaphore(max_workers * 2)
+        pending = set()
+        pending_lock = threading.Lock()
+
+        def release(future: concurrent.futures.Future) -> None:
+            with pending_lock:
+                pending.discard(future)
+            slots.release()
+
+        # 异步模式下任务在请求引擎的事件循环中执行，否则每个任务占用线程池中的一个线程
+        if self.config.async_request_switch:
+            submit = lambda task: self.async_engine.submit(task.start_async())
+        else:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "translator")
+            submit = lambda task: self.executor.submit(task.start)
+        try:
+            submitted = 0
+            for task in tasks_iter:
+                # 等待空闲位置，同时检测是否需要停止任务
+                while not slots.acquire(timeout = 0.5):
+                    if Base.work_status == Base.STATUS.STOPING:
+                        break
+                if Base.work_status == Base.STATUS.STOPING:
+                    break
+
+                future = submit(task)
+                with pending_lock:
+                    pending.add(future)
+                future.add_done_callback(self.task_done_callback)  # 为future对象添加一个回调函数，当任务完成时会被调用，更新数据
+                future.add_done_callback(release)
+                submitted += 1
+
+            self.info(f"本轮任务已全部提交，任务总数为 {submitted} ...")
+
+            # 等待剩余任务完成或被取消
+            while True:
+                # 检测是否需要停止任务
+                if Base.work_status == Base.STATUS.STOPING:
+                    break
+                with pending_lock:
+                    remaining = list(pending)
+                if not remaining:
+                    break
+                # 任务结果与异常由 task_done_callback 处理
+                concurrent.futures.wait(remaining, timeout = 0.5)
+        finally:
+            # 关闭任务生成流水线
+            close = getattr(tasks_iter, "close", None)
+            if close:
+                close()
+            if self.executor:
+                self.executor.shutdown(wait=False)  # 关闭线程池
+                self.executor = None
+
     # 单个翻译任务完成时,更新项目进度状态   
     def task_done_callback(self, future: concurrent.futures.Future) -> None:
-        # 检测是否需要停止任务
-        if Base.work_status == Base.STATUS.STOPING:
-            return
-            
         try:
             # 获取结果
             result = future.result()
@@ -507,17 +646,33 @@ class TaskExecutor(Base):
             if result == None or len(result) == 0:
                 return
 
+            # 停止过程中完成的任务不再更新进度，但已写回的条目仍需记录，保证写入缓存文件
+            if Base.work_status == Base.STATUS.STOPING:
+                self.cache_manager.record_item_changes(result.get("updated_items", []))
+                self.cache_manager.require_save_to_file(self.config.label_output_path)
+                return
+
+            # 写入翻译记忆，并把译文分发给重复条目
+            updated_items = result.get("updated_items", [])
+            memory_session = self.memory_session
+            if memory_session is not None and updated_items:
+                fanned_items = memory_session.complete(updated_items)
+                updated_items = updated_items + fanned_items
+            else:
+                fanned_items = []
+
             # 更新翻译进度到缓存数据
             with self.project_status_data.atomic_scope():
                 self.project_status_data.total_requests += 1
                 self.project_status_data.error_requests += 0 if result.get("check_result") else 1
-                self.project_status_data.line += result.get("row_count", 0)
+                self.project_status_data.line += result.get("row_count", 0) + len(fanned_items)
                 self.project_status_data.token += result.get("prompt_tokens", 0) + result.get("completion_tokens", 0)
                 self.project_status_data.total_completion_tokens += result.get("completion_tokens", 0)
                 self.project_status_data.time = time.time() - self.project_status_data.start_time
                 stats_dict = self.project_status_data.to_dict()
 
-            # 请求保存缓存文件
+            # 记录变更条目，并请求保存缓存文件
+            self.cache_manager.record_item_changes(updated_items)
             self.cache_manager.require_save_to_file(self.config.label_output_path)
 
             # 触发翻译进度更新事件
@@ -525,3 +680,31 @@ class TaskExecutor(Base):
         except Exception as e:
             self.error(f"翻译任务错误 ... {e}", e if self.is_debug() else None)
 
+    # 输出各密钥的请求统计，只有一个密钥时不输出
+    def log_apikey_stats(self) -> None:
+        stats_list = self.config.apikey_pool.get_stats()
+        if len(stats_list) <= 1:
+            return
+
+        self.print("")
+        for stats in stats_list:
+            key = stats["key"]
+            masked_key = f"{key[:6]}...{key[-4:]}" if len(key) > 12 else key
+            self.info(
+                f"密钥 {masked_key} - 请求 {stats['requests']} 次，成功 {stats['successes']} 次，"
+                f"限流 {stats['rate_limits']} 次，鉴权失败 {stats['auth_errors']} 次，平均耗时 {stats['avg_latency']:.2f}s"
+                + (f"，冷却中（剩余 {stats['cooldown']:.0f}s）" if stats["cooldown"] > 0 else "")
+            )
+        self.print("")
+
+    # 条目由翻译记忆预填时，更新项目进度状态
+    def memory_filled_callback(self, items: list) -> None:
+        with self.project_status_data.atomic_scope():
+            self.project_status_data.line += len(items)
+            self.project_status_data.time = time.time() - self.project_status_data.start_time
+            stats_dict = self.project_status_data.to_dict()
+
+        self.cache_manager.record_item_changes(items)
+        self.cache_manager.require_save_to_file(self.config.label_output_path)
+        self.emit(Base.EVENT.TASK_UPDATE, stats_dict)
+
@@ -1,5 +1,6 @@
 import copy
 import re
+import asyncio
 import time
 import itertools
 
@@ -12,11 +13,13 @@ from Base.PluginManager import PluginManager
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.LLMRequester.LLMRequester import LLMRequester
+from ModuleFolders.LLMRequester.RequestErrorType import RequestErrorType
 from ModuleFolders.PromptBuilder.PromptBuilder import PromptBuilder
 from ModuleFolders.PromptBuilder.PromptBuilderLocal import PromptBuilderLocal
 from ModuleFolders.PromptBuilder.PromptBuilderSakura import PromptBuilderSakura
 from ModuleFolders.ResponseExtractor.ResponseExtractor import ResponseExtractor
 from ModuleFolders.ResponseChecker.ResponseChecker import ResponseChecker
+from ModuleFolders.ResponseChecker.StreamChecker import StreamChecker
 from ModuleFolders.RequestLimiter.RequestLimiter import RequestLimiter
 
 from ModuleFolders.TextProcessor.TextProcessor import TextProcessor
@@ -82,6 +85,7 @@ class TranslatorTask(Base):
             )
         
         # 生成请求指令
+        system_tokens = None
         if target_platform == "sakura":
             self.messages, self.system_prompt, self.extra_log = PromptBuilderSakura.generate_prompt_sakura(
                 self.config,
@@ -103,55 +107,122 @@ class TranslatorTask(Base):
                 self.previous_text_list,
                 self.source_lang,
             )
+            # 系统提示词的静态部分使用缓存的 Token 数量
+            system_tokens = PromptBuilder.count_system_tokens(self.config, self.source_lang, self.system_prompt)
 
         # 预估 Token 消费
-        self.request_tokens_consume = self.request_limiter.calculate_tokens(self.messages,self.system_prompt,)
+        self.request_tokens_consume = self.request_limiter.calculate_tokens(self.messages, self.system_prompt, system_tokens)
 
 
     # 启动任务
     def start(self) -> dict:
         return self.unit_translation_task()
 
+    # 在异步请求引擎中启动任务
+    async def start_async(self) -> dict:
+        return await self.unit_translation_task_async()
+
 
     # 单请求翻译任务
     def unit_translation_task(self) -> dict:
         # 任务开始的时间
         task_start_time = time.time()
 
-        while True:
-            # 检测是否收到停止翻译事件
-            if Base.work_status == Base.STATUS.STOPING:
+        # 等待并发名额，收到停止事件或超时则直接跳过当前任务
+        if not self.request_limiter.concurrency.acquire(timeout = self.config.request_timeout, should_stop = self.should_stop):
+            return {}
+
+        requester = LLMRequester()
+        api_key = None
+        try:
+            # 从密钥池中选择健康的密钥并等待其 RPM 和 TPM 额度，收到停止事件或超时则直接跳过当前任务
+            api_key = self.config.apikey_pool.acquire(
+                self.request_tokens_consume,
+                timeout = self.get_remaining_timeout(task_start_time),
+                should_stop = self.should_stop,
+            )
+            if api_key is None:
                 return {}
 
-            # 检查是否超时，超时则直接跳过当前任务，以避免死循环
-            if time.time() - task_start_time >= self.config.request_timeout:
+            # 发起请求
+            response = requester.sent_request(*self.get_request_args(api_key))
+        finally:
+            self.release_request(requester, api_key)
+
+        return self.handle_response(task_start_time, *response)
+
+    # 单请求翻译任务（异步模式），在异步请求引擎的事件循环中执行，等待期间不占用线程
+    async def unit_translation_task_async(self) -> dict:
+        # 任务开始的时间
+        task_start_time = time.time()
+
+        # 等待并发名额，收到停止事件或超时则直接跳过当前任务
+        if not await self.request_limiter.concurrency.acquire_async(timeout = self.config.request_timeout, should_stop = self.should_stop):
+            return {}
+
+        requester = LLMRequester()
+        api_key = None
+        try:
+            # 从密钥池中选择健康的密钥并等待其 RPM 和 TPM 额度，收到停止事件或超时则直接跳过当前任务
+            api_key = await self.config.apikey_pool.acquire_async(
+                self.request_tokens_consume,
+                timeout = self.get_remaining_timeout(task_start_time),
+                should_stop = self.should_stop,
+            )
+            if api_key is None:
                 return {}
 
-            # 检查 RPM 和 TPM 限制，如果符合条件，则继续
-            if self.request_limiter.check_limiter(self.request_tokens_consume):
-                break
+            # 发起请求
+            response = await requester.sent_request_async(*self.get_request_args(api_key))
+        finally:
+            self.release_request(requester, api_key)
+
+        # 回复的解析与检查较为耗时，放到线程中执行，避免阻塞事件循环中的其他请求
+        return await asyncio.to_thread(self.handle_response, task_start_time, *response)
 
-            # 如果以上条件都不符合，则间隔 1 秒再次检查
-            time.sleep(1)
+    # 是否收到停止事件
+    @staticmethod
+    def should_stop() -> bool:
+        return Base.work_status == Base.STATUS.STOPING
 
+    # 获取等待密钥额度的剩余时间
+    def get_remaining_timeout(self, task_start_time: float) -> float:
+        return max(0, self.config.request_timeout - (time.time() - task_start_time))
+
+    # 生成请求参数
+    def get_request_args(self, api_key: str) -> tuple:
         # 获取接口配置信息包
-        platform_config = self.config.get_platform_configuration("translationReq")
+        platform_config = self.config.get_platform_configuration("translationReq", api_key)
+        return self.messages, self.system_prompt, platform_config, self.create_stream_checker()
+
+    # 请求结束后释放密钥与并发名额
+    def release_request(self, requester: LLMRequester, api_key: str | None) -> None:
+        # 将请求结果反馈给密钥池，限流或鉴权失败的密钥会暂时冷却
+        if api_key is not None:
+            self.config.apikey_pool.release(api_key, requester.last_latency, requester.last_error_type)
+
+        # 将请求耗时与错误类型反馈给自适应并发控制器，等待密钥额度超时说明请求量已超出接口额度，按拥塞处理
+        if api_key is None and not self.should_stop():
+            error_type = RequestErrorType.TIMEOUT
+        else:
+            error_type = requester.last_error_type
+        self.request_limiter.concurrency.release(requester.last_latency, error_type)
 
-        # 发起请求
-        requester = LLMRequester()
-        skip, response_think, response_content, prompt_tokens, completion_tokens = requester.sent_request(
-            self.messages,
-            self.system_prompt,
-            platform_config
-        )
+    # 开启流式请求时创建流式检查器，回复行数异常或出现重复循环时提前中止请求
+    def create_stream_checker(self) -> StreamChecker | None:
+        if not self.config.stream_request_switch:
+            return None
+        return StreamChecker(len(self.source_text_dict))
 
+    # 处理请求结果
+    def handle_response(self, task_start_time: float, skip: bool, response_think: str, response_content: str, prompt_tokens: int, completion_tokens: int) -> dict:
         # 如果请求结果标记为 skip，即有运行错误发生，则直接返回错误信息，停止后续任务
         if skip == True:
             return {
                 "check_result": False,
                 "row_count": 0,
-                "prompt_tokens": self.request_tokens_consume,
-                "completion_tokens": 0,
+                "prompt_tokens": prompt_tokens or self.request_tokens_consume,
+                "completion_tokens": completion_tokens or 0,
             }
 
         # 返空判断
@@ -262,6 +333,7 @@ class TranslatorTask(Base):
                 "row_count": self.row_count,
                 "prompt_tokens": prompt_tokens,
                 "completion_tokens": completion_tokens,
+                "updated_items": self.items,
             }
 
 
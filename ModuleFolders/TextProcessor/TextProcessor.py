@@ -1,6 +1,8 @@
+import hashlib
 import json
 import os
 import re
+import threading
 from typing import List, Dict, Tuple, Any, Optional
 
 class TextProcessor():
@@ -24,11 +26,18 @@ class TextProcessor():
     RE_DIGITAL_SEQ_REC_STR = r'^【(\d+)】'
     RE_WHITESPACE_AFFIX_STR = r'^(\s*)(.*?)(\s*)$'
 
+    # 编译后规则集的共享缓存，所有任务复用同一份，配置或正则库变化时按指纹重新编译
+    _RULE_SET_CACHE: Dict[str, Dict[str, Any]] = {}
+    _RULE_SET_CACHE_SIZE = 8
+    _RULE_SET_LOCK = threading.Lock()
+
+    # 最近一次使用的配置数据与其指纹，持有引用以保证 id 不会被复用
+    _last_rule_data: Optional[Tuple[Any, ...]] = None
+    _last_rule_data_fingerprint: str = ""
+
     def __init__(self, config: Any):
         super().__init__()
 
-        current_regex_dir = self.DEFAULT_REGEX_DIR
-
         # 预编译固定处理的正则表达式
         self.RE_DIGITAL_SEQ_PRE = re.compile(self.RE_DIGITAL_SEQ_PRE_STR)
         self.RE_DIGITAL_SEQ_REC = re.compile(self.RE_DIGITAL_SEQ_REC_STR)
@@ -44,27 +53,75 @@ class TextProcessor():
         )
         self.RE_JA_AFFIX = re.compile(ja_affix_pattern_str, re.MULTILINE)
 
+        # 获取共享的预编译规则（文本前后替换正则与自动处理正则）
+        rule_set = self.get_compiled_rule_set(config)
+        self.pre_translation_rules_compiled = rule_set["pre_translation_rules_compiled"]
+        self.post_translation_rules_compiled = rule_set["post_translation_rules_compiled"]
+        self.auto_compiled_patterns = rule_set["auto_compiled_patterns"]
+
+    @classmethod
+    def get_compiled_rule_set(cls, config: Any) -> Dict[str, Any]:
+        """获取与当前配置和正则库对应的预编译规则集，线程安全"""
+        with cls._RULE_SET_LOCK:
+            fingerprint = cls._get_rule_fingerprint(config, cls.DEFAULT_REGEX_DIR)
+            rule_set = cls._RULE_SET_CACHE.get(fingerprint)
+            if rule_set is None:
+                rule_set = cls._build_rule_set(config, cls.DEFAULT_REGEX_DIR)
+                if len(cls._RULE_SET_CACHE) >= cls._RULE_SET_CACHE_SIZE:
+                    del cls._RULE_SET_CACHE[next(iter(cls._RULE_SET_CACHE))]
+                cls._RULE_SET_CACHE[fingerprint] = rule_set
+            return rule_set
+
+    @classmethod
+    def clear_compiled_rule_set(cls) -> None:
+        """清空预编译规则缓存"""
+        with cls._RULE_SET_LOCK:
+            cls._RULE_SET_CACHE.clear()
+            cls._last_rule_data = None
+            cls._last_rule_data_fingerprint = ""
+
+    @classmethod
+    def _get_rule_fingerprint(cls, config: Any, regex_dir_path: str) -> str:
+        """规则指纹由 替换表、禁翻表 的内容与正则库文件的修改时间、大小组成"""
+        rule_data = (config.pre_translation_data, config.post_translation_data, config.exclusion_list_data)
+
+        # 同一次任务中各个子任务共享同一组配置对象，只需要计算一次内容指纹
+        if cls._last_rule_data is None or any(a is not b for a, b in zip(cls._last_rule_data, rule_data)):
+            content = json.dumps(rule_data, ensure_ascii=False, sort_keys=True, default=str)
+            cls._last_rule_data = rule_data
+            cls._last_rule_data_fingerprint = hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+        try:
+            stat = os.stat(regex_dir_path)
+            regex_stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+        except OSError:
+            regex_stamp = ""
+
+        return f"{cls._last_rule_data_fingerprint}:{regex_stamp}"
+
+    @classmethod
+    def _build_rule_set(cls, config: Any, regex_dir_path: str) -> Dict[str, Any]:
         # 预编译文本前后替换正则
-        self.pre_translation_rules_compiled = self._compile_translation_rules(
-            config.pre_translation_data
-        )
-        self.post_translation_rules_compiled = self._compile_translation_rules(
-            config.post_translation_data
-        )
+        pre_translation_rules_compiled = cls._compile_translation_rules(config.pre_translation_data)
+        post_translation_rules_compiled = cls._compile_translation_rules(config.post_translation_data)
 
         # 预编译自动处理正则
-        code_pattern_strings = self._prepare_code_pattern_strings(
-            config.exclusion_list_data, current_regex_dir
-        )
+        code_pattern_strings = cls._prepare_code_pattern_strings(config.exclusion_list_data, regex_dir_path)
 
-        special_placeholder_pattern_strings = self._build_dynamic_pattern_strings(
+        special_placeholder_pattern_strings = cls._build_dynamic_pattern_strings(
             code_pattern_strings, r"\s*{p}\s*"
         )
-        self.auto_compiled_patterns = [
+        auto_compiled_patterns = [
             re.compile(p_str, re.IGNORECASE | re.MULTILINE)
             for p_str in special_placeholder_pattern_strings if p_str
         ]
 
+        return {
+            "pre_translation_rules_compiled": pre_translation_rules_compiled,
+            "post_translation_rules_compiled": post_translation_rules_compiled,
+            "auto_compiled_patterns": auto_compiled_patterns,
+        }
+
     def _normalize_line_endings(self, text: str) -> Tuple[str, List[Tuple[int, str]]]:
         """
         统一换行符为 \n，并记录每个换行符的原始类型和位置
@@ -292,7 +349,8 @@ class TextProcessor():
         restored_text = '\n'.join(restored_lines)
         return self._restore_line_endings(restored_text, line_endings)
 
-    def _compile_translation_rules(self, rules_data: Optional[List[Dict]]) -> List[Dict]:
+    @staticmethod
+    def _compile_translation_rules(rules_data: Optional[List[Dict]]) -> List[Dict]:
         compiled_rules = []
         if not rules_data:
             return compiled_rules
@@ -308,7 +366,8 @@ class TextProcessor():
             compiled_rules.append(new_rule)
         return compiled_rules
 
-    def _prepare_code_pattern_strings(self, exclusion_list_data: Optional[List[Dict]], regex_dir_path: str) -> List[str]:
+    @staticmethod
+    def _prepare_code_pattern_strings(exclusion_list_data: Optional[List[Dict]], regex_dir_path: str) -> List[str]:
         patterns: List[str] = []
 
         # 读取正则库内容
@@ -327,7 +386,8 @@ class TextProcessor():
                     if markers: patterns.append(re.escape(markers))
         return patterns
 
-    def _build_dynamic_pattern_strings(self, base_patterns: List[str], format_string: str) -> List[str]:
+    @staticmethod
+    def _build_dynamic_pattern_strings(base_patterns: List[str], format_string: str) -> List[str]:
         """辅助函数，用于基于基础模式列表和格式化字符串构建增强的模式字符串(例如，在模式两侧添加空白匹配)"""
         enhanced_patterns = []
         if base_patterns:
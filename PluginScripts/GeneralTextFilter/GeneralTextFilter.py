@@ -1,4 +1,4 @@
-from ModuleFolders.Cache.CacheItem import TranslationStatus
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Cache.CacheProject import CacheProject
 from PluginScripts.PluginBase import PluginBase
 
@@ -18,67 +18,58 @@ class GeneralTextFilter(PluginBase):
         pass
 
 
-    def on_event(self, event_name, config, event_data: CacheProject):
-
-        # 文本预处理事件触发
+    # 文本预处理事件触发，逐条目过滤，与其他插件合并为一次遍历
+    def get_item_filter(self, event_name, config, event_data: CacheProject):
         if event_name == "text_filter":
-
-            self.filter_text(event_data)
+            return lambda file: self.filter_item
 
     # 忽视空值内容和将整数型，浮点型数字变换为字符型数字函数，且改变翻译状态为7,因为T++读取到整数型数字时，会报错，明明是自己导出来的...
-    def filter_text(self, event_data: CacheProject):
-        for entry in event_data.items_iter():
+    def filter_item(self, entry: CacheItem):
+        source_text = entry.source_text
 
-            source_text = entry.source_text
+        # 检查文本是否为数值变量
+        if isinstance(source_text, (int, float)):
+            entry.source_text = str(source_text)
+            entry.translation_status = TranslationStatus.EXCLUDED
+            return
 
-            # 检查文本是否为数值变量
-            if isinstance(source_text, (int, float)):
-                entry.source_text = str(source_text)
-                entry.translation_status = TranslationStatus.EXCLUDED
-                continue
+        if source_text is None:
+            entry.translation_status = TranslationStatus.EXCLUDED
+            return
 
+        stripped_text = source_text.strip()
+        if (
             # 检查文本是否为字符型数字
-            if (isinstance(source_text, str) and source_text.isdigit()):
-                entry.translation_status = TranslationStatus.EXCLUDED
-                continue
-
+            source_text.isdigit()
             # 检查文本是否为空
-            if source_text is None or source_text.strip() == "":
-                entry.translation_status = TranslationStatus.EXCLUDED
-                continue
-
+            or stripped_text == ""
             # 检查文本是仅换行符
-            if source_text.strip() in ("\n", "\\n", "\r", "\\r"):
-                entry.translation_status = TranslationStatus.EXCLUDED
-                continue
-
+            or stripped_text in self.NEWLINE_TEXTS
             # 检查是否仅含标点符号的文本组合
-            if isinstance(source_text, str) and self.is_punctuation_string(source_text):
-                entry.translation_status = TranslationStatus.EXCLUDED
-                continue
-
+            or self.PUNCTUATION.issuperset(source_text)
             #加个检测后缀为MP3，wav，png，这些文件名的文本，都是纯代码文本，所以忽略掉
-            if isinstance(source_text, str) and self._get_file_suffix(source_text.rstrip()) in self.EXCLUDE_FILE_SUFFIX:
-                entry.translation_status = TranslationStatus.EXCLUDED
-                continue
-
+            or self._get_file_suffix(source_text.rstrip()) in self.EXCLUDE_FILE_SUFFIX
             # 检查开头的
-            if isinstance(source_text, str) and any(source_text.startswith(ext) for ext in self.EXCLUDE_PREFIX):
-                entry.translation_status = TranslationStatus.EXCLUDED
-                continue
+            or source_text.startswith(self.EXCLUDE_PREFIX)
+        ):
+            entry.translation_status = TranslationStatus.EXCLUDED
 
     # 检查字符串是否只包含常见的标点符号
     def is_punctuation_string(self,s: str) -> bool:
         """检查字符串是否只是标点符号与双种空格组合"""
-        punctuation = set(" " " " "!" '"' "#" "$" "%" "&" "'" "(" ")" "*" "+" "," "-" "." "/" "，" "。"
-                        ":" ";" "<" "=" ">" "?" "@" "[" "\\" "]" "^" "_" "`" "{" "|" "}" "~" "—" "・" "？" "↑" "←" "↓" "→" "「" "」" "『" "』" "【" "】" "《" "》"
-                        "！" "＂" "＃" "＄" "％" "＆" "＇" "（" "）" "＊" "＋" "，" "－" "．" "／" "：" "；" "＜" "＝" "＞" "？" "＠" )
-        return all(char in punctuation for char in s)
+        return self.PUNCTUATION.issuperset(s)
 
     def _get_file_suffix(self, text: str):
         split = text.rsplit(".", 1)
         return f".{split[1]}" if len(split) == 2 else split[0]
 
+    # 常见的标点符号与双种空格
+    PUNCTUATION = frozenset(" " " " "!" '"' "#" "$" "%" "&" "'" "(" ")" "*" "+" "," "-" "." "/" "，" "。"
+                            ":" ";" "<" "=" ">" "?" "@" "[" "\\" "]" "^" "_" "`" "{" "|" "}" "~" "—" "・" "？" "↑" "←" "↓" "→" "「" "」" "『" "』" "【" "】" "《" "》"
+                            "！" "＂" "＃" "＄" "％" "＆" "＇" "（" "）" "＊" "＋" "，" "－" "．" "／" "：" "；" "＜" "＝" "＞" "？" "＠" )
+
+    NEWLINE_TEXTS = frozenset(("\n", "\\n", "\r", "\\r"))
+
     EXCLUDE_PREFIX = ('MapData/', 'SE/', 'BGS', '0=', 'BGM/', 'FIcon/', '<input type=', 'width:', '<div ', 'EV0', '\\img')
 
     EXCLUDE_FILE_SUFFIX = frozenset([
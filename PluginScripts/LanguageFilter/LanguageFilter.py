@@ -1,10 +1,13 @@
-from tqdm import tqdm
+import re
+from typing import Callable
+
 from rich import print
 
+from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheProject import CacheProject
 from ModuleFolders.TaskExecutor import TranslatorUtil
 from PluginScripts.PluginBase import PluginBase
-from ModuleFolders.Cache.CacheItem import TranslationStatus
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 
 
@@ -74,6 +77,24 @@ class LanguageFilter(PluginBase):
     CYRILLIC_SUPPLEMENTAL_EXTRA = ("\u2DE0", "\u2DFF")  # 其他扩展字符（例如：斯拉夫语言的一些符号）
     CYRILLIC_OTHER = ("\u0500", "\u050F")  # 其他字符区块（包括斯拉夫语系其他语言的字符，甚至一些特殊符号）
 
+    # 由字符范围构建的预编译字符类，用于一次扫描判断文本中是否包含某种文字
+    def _build_pattern(*ranges: tuple[str, str]) -> re.Pattern:
+        return re.compile("[" + "".join(f"{re.escape(start)}-{re.escape(end)}" for start, end in ranges) + "]")
+
+    CJK_PATTERN = _build_pattern(CJK)
+    LATIN_PATTERN = _build_pattern(LATIN_1, LATIN_2, LATIN_EXTENDED_A, LATIN_EXTENDED_B, LATIN_SUPPLEMENTAL)
+    KOREAN_PATTERN = _build_pattern(
+        CJK, HANGUL_JAMO, HANGUL_JAMO_EXTENDED_A, HANGUL_JAMO_EXTENDED_B, HANGUL_SYLLABLES, HANGUL_COMPATIBILITY_JAMO
+    )
+    RUSSIAN_PATTERN = _build_pattern(
+        CYRILLIC_BASIC, CYRILLIC_SUPPLEMENT, CYRILLIC_EXTENDED_A, CYRILLIC_EXTENDED_B,
+        CYRILLIC_SUPPLEMENTAL, CYRILLIC_SUPPLEMENTAL_EXTRA, CYRILLIC_OTHER
+    )
+    JAPANESE_PATTERN = _build_pattern(
+        CJK, KATAKANA, HIRAGANA, KATAKANA_HALF_WIDTH, KATAKANA_PHONETIC_EXTENSIONS, VOICED_SOUND_MARKS
+    )
+    del _build_pattern
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -89,17 +110,17 @@ class LanguageFilter(PluginBase):
 
         self.add_event("text_filter", PluginBase.PRIORITY.NORMAL)
 
-    def on_event(self, event: str, config: TaskConfig, data: CacheProject) -> None:
-
+    # 文本预处理事件，逐条目过滤，与其他插件合并为一次遍历
+    def get_item_filter(self, event: str, config: TaskConfig, data: CacheProject):
         if event == "text_filter":
-            self.on_text_filter(event, config, data)
+            return self.on_text_filter(event, config, data)
 
     # 文本后处理事件
-    def on_text_filter(self, event: str, config: TaskConfig, data: CacheProject) -> None:
+    def on_text_filter(self, event: str, config: TaskConfig, data: CacheProject):
         print("")
         print("[LanguageFilter] 开始执行预处理 ...")
 
-        target = []  # 存储需要排除的条目
+        self.filtered_count = 0  # 需要排除的条目数量
 
         # 自动检测语言模式
         if config.source_language == "auto":
@@ -112,11 +133,10 @@ class LanguageFilter(PluginBase):
             print(f"[LanguageFilter] 项目主要使用语言: {most_common_language} - {en_source_lang}/{source_language}")
 
             # 处理每个文件中的条目
-            for path, file in data.files.items():
+            def get_file_filter(file: CacheFile):
+                path = file.storage_path
                 # 获取语言信息
                 language_stats = file.language_stats
-                # 原文片段列表
-                file_items = file.items
 
                 # 确定使用的语言
                 if not language_stats:
@@ -133,30 +153,36 @@ class LanguageFilter(PluginBase):
 
                 # 根据不同情况分别处理
                 if TranslatorUtil.map_language_code_to_name(first_language) == config.target_language:
-                    target.extend(self._filter_target_language_match(path, file_items, first_language))
+                    should_filter = self._filter_target_language_match(path, first_language)
                 elif first_language == 'un':
-                    target.extend(self._filter_unknown_language(path, file_items))
+                    should_filter = self._filter_unknown_language(path)
                 else:
-                    target.extend(self._filter_normal_language(file, file_items, first_language))
+                    should_filter = self._filter_normal_language(file, first_language)
+                return self._make_item_filter(should_filter)
 
         # 指定原文语言模式
         else:
             print("[LanguageFilter] 使用指定语言模式...")
             print(f"[LanguageFilter] 项目主要使用语言: {config.source_language}")
-            for path, file in data.files.items():
-                # 原文片段列表
-                file_items = file.items
 
-                # 原有的非自动检测模式，优化为使用统一的函数
-                #target.extend(self._filter_normal_language(file, data.items_iter(), config.source_language)) # 性能更好
-                target.extend(self._filter_normal_language(file, file_items, config.source_language))
+            def get_file_filter(file: CacheFile):
+                return self._make_item_filter(self._filter_normal_language(file, config.source_language))
 
-        print("")
-        for item in tqdm(target):
-            item.translation_status = TranslationStatus.EXCLUDED
+        return get_file_filter
+
+    # 将条目判断函数包装为过滤函数，需要过滤的条目标记为已排除
+    def _make_item_filter(self, should_filter: Callable[[CacheItem], bool]) -> Callable[[CacheItem], None]:
+        def filter_item(item: CacheItem) -> None:
+            if should_filter(item):
+                item.translation_status = TranslationStatus.EXCLUDED
+                self.filtered_count += 1
 
-        # 输出结果
-        print(f"[LanguageFilter] 语言过滤已完成，共过滤 {len(target)} 个不包含目标语言的条目 ...")
+        return filter_item
+
+    # 输出结果
+    def on_item_filter_finished(self, event: str, config: TaskConfig, data: CacheProject) -> None:
+        print("")
+        print(f"[LanguageFilter] 语言过滤已完成，共过滤 {self.filtered_count} 个不包含目标语言的条目 ...")
         print("")
 
     # 判断字符是否为汉字（中文）字符
@@ -211,23 +237,23 @@ class LanguageFilter(PluginBase):
 
     # 检查字符串是否包含至少一个汉字（中文）字符
     def has_any_cjk(self, text: str) -> bool:
-        return any(self.is_cjk(char) for char in text)
+        return LanguageFilter.CJK_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个拉丁字符
     def has_any_latin(self, text: str) -> bool:
-        return any(self.is_latin(char) for char in text)
+        return LanguageFilter.LATIN_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个韩文（含汉字）字符
     def has_any_korean(self, text: str) -> bool:
-        return any(self.is_korean(char) for char in text)
+        return LanguageFilter.KOREAN_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个俄文字符
     def has_any_russian(self, text: str) -> bool:
-        return any(self.is_russian(char) for char in text)
+        return LanguageFilter.RUSSIAN_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个日文（含汉字）字符
     def has_any_japanese(self, text: str) -> bool:
-        return any(self.is_japanese(char) for char in text)
+        return LanguageFilter.JAPANESE_PATTERN.search(text) is not None
 
     def get_filter_function(self, language_code: str, path: str):
         """根据语言代码获取相应的语言过滤函数"""
@@ -263,39 +289,36 @@ class LanguageFilter(PluginBase):
         print(f"[[red]WARNING[/]] [LanguageFilter] 文件 {path} 未知的语言代码 {language_code}，无法使用内置语言过滤函数")
         return None
 
-    def _filter_target_language_match(self, path, file_items, language):
+    def _filter_target_language_match(self, path, language):
         """处理检测语言与目标语言相同的情况"""
         print(f"[LanguageFilter] 文件 {path} 检测到的主要语言 {language} 与译文语言相同，将只翻译不符合该语言特征的文本")
 
         has_any = self.get_filter_function(language, path)
         if has_any is not None:
-            return [item for item in file_items
-                    if item.translation_status == TranslationStatus.EXCLUDED or
-                    not isinstance(item.source_text, str) or
-                    not item.lang_code or
-                    (has_any(item.source_text) and
-                     item.lang_code[0] == language and
-                     item.lang_code[1] > 0.92)]
+            return lambda item: (item.translation_status == TranslationStatus.EXCLUDED or
+                                 not isinstance(item.source_text, str) or
+                                 not item.lang_code or
+                                 (has_any(item.source_text) and
+                                  item.lang_code[0] == language and
+                                  item.lang_code[1] > 0.92))
         else:
             # 过滤原文检测语言与行语言相同的行
-            return [item for item in file_items
-                    if item.translation_status == TranslationStatus.EXCLUDED or
-                    not isinstance(item.source_text, str) or
-                    not item.lang_code or
-                    (item.lang_code[0] == language and
-                     item.lang_code[1] > 0.92)]
-
-    def _filter_unknown_language(self, path, file_items):
+            return lambda item: (item.translation_status == TranslationStatus.EXCLUDED or
+                                 not isinstance(item.source_text, str) or
+                                 not item.lang_code or
+                                 (item.lang_code[0] == language and
+                                  item.lang_code[1] > 0.92))
+
+    def _filter_unknown_language(self, path):
         """处理未知语言的文件"""
         print(f"[LanguageFilter] 文件 {path} 未检测到具体语言，将只翻译置信度较高（大于0.82）的文本行")
 
-        return [item for item in file_items
-                if item.translation_status == TranslationStatus.EXCLUDED or
-                not isinstance(item.source_text, str) or
-                not item.lang_code or
-                item.lang_code[1] < 0.82]
+        return lambda item: (item.translation_status == TranslationStatus.EXCLUDED or
+                             not isinstance(item.source_text, str) or
+                             not item.lang_code or
+                             item.lang_code[1] < 0.82)
 
-    def _filter_normal_language(self, file, file_items, language):
+    def _filter_normal_language(self, file, language):
         """处理一般语言情况"""
         # 将Ainiee内置语言代码映射为ISO标准语言代码
         main_source_lang = TranslatorUtil.map_language_name_to_code(language)
@@ -310,16 +333,13 @@ class LanguageFilter(PluginBase):
         if file.lc_language_stats:
             lc_languages = {lang for lang, _, _ in file.lc_language_stats}
 
-        filtered_items = []
-        for item in file_items:
+        def should_filter(item) -> bool:
             # 如果item已经被标记为排除，直接添加
             if item.translation_status == TranslationStatus.EXCLUDED:
-                filtered_items.append(item)
-                continue
+                return True
 
             if not isinstance(item.source_text, str):
-                filtered_items.append(item)
-                continue
+                return True
 
             lang_info = item.get_lang_code(default_lang=main_source_lang)
             detected_lang, confidence = lang_info[0], lang_info[1]
@@ -336,14 +356,12 @@ class LanguageFilter(PluginBase):
             )
 
             if not_filter_for_lc:
-                continue
+                return False
 
             # 原有的过滤逻辑
             if has_any is not None:
-                if not has_any(item.source_text) or (detected_lang != main_source_lang and confidence > 0.92):
-                    filtered_items.append(item)
+                return not has_any(item.source_text) or (detected_lang != main_source_lang and confidence > 0.92)
             else:
-                if detected_lang != main_source_lang and confidence > 0.92:
-                    filtered_items.append(item)
+                return detected_lang != main_source_lang and confidence > 0.92
 
-        return filtered_items
+        return should_filter
@@ -1,3 +1,7 @@
+from typing import Callable
+
+from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem
 from ModuleFolders.Cache.CacheProject import CacheProject
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 
@@ -34,6 +38,16 @@ class PluginBase:
     def on_event(self, event: str, config: TaskConfig, event_data: CacheProject | dict) -> None:
         pass
 
+    # 构建逐条目过滤函数，文本预过滤事件中各插件的过滤函数会合并为一次遍历执行
+    # 返回值为按文件构建过滤函数的函数，不处理该文件时返回 None；返回 None 时仍调用 on_event 处理整个项目
+    # 构建时不应依赖条目的翻译状态，排在前面的插件此时尚未开始过滤
+    def get_item_filter(self, event: str, config: TaskConfig, event_data: CacheProject) -> Callable[[CacheFile], Callable[[CacheItem], None] | None] | None:
+        return None
+
+    # 合并遍历结束后调用，可用于输出统计信息
+    def on_item_filter_finished(self, event: str, config: TaskConfig, event_data: CacheProject) -> None:
+        pass
+
     # 添加事件
     def add_event(self, event: str, priority: int) -> None:
         self.events.append(
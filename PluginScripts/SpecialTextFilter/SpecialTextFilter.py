@@ -1,6 +1,6 @@
 import re
-from typing import Iterator
 
+from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Cache.CacheProject import CacheProject, ProjectType
 from ..PluginBase import PluginBase
@@ -20,31 +20,30 @@ class SpecialTextFilter(PluginBase):
         pass
 
 
-    def on_event(self, event_name, config, event_data: CacheProject):
+    # MD项目中需要排除的图片与链接定义
+    MD_EXCLUDE_REGEXS = (
+        # 1.  ![...](http://...) and ![...](data:image...)
+        re.compile(r"^\s*!\[[^\]]*\]\([^)]*\)\s*$"),
+        # 2.  ![alt][id]
+        re.compile(r"^\s*!\[[^\]]*\]\[[^\]]+\]\s*$"),
+        # 3.  [id]: url "title" or [id]: <url> "title"
+        re.compile(r"^\s*\[[^\]]+\]:\s*<?.*>?\s*(?:(?:\".*\")|(?:'.*'))?\s*$"),
+    )
 
-        # 文本预处理事件触发
+    # 文本预处理事件触发，逐条目过滤，与其他插件合并为一次遍历
+    def get_item_filter(self, event_name, config, event_data: CacheProject):
         if event_name == "text_filter":
+            return self.get_file_filter
 
-            MD_EXCLUDE_REGEXS = (
-                # 1.  ![...](http://...) and ![...](data:image...)
-                re.compile(r"^\s*!\[[^\]]*\]\([^)]*\)\s*$"),
-                # 2.  ![alt][id]
-                re.compile(r"^\s*!\[[^\]]*\]\[[^\]]+\]\s*$"),
-                # 3.  [id]: url "title" or [id]: <url> "title"
-                re.compile(r"^\s*\[[^\]]+\]:\s*<?.*>?\s*(?:(?:\".*\")|(?:'.*'))?\s*$"),
-            )
-
-            # 针对MD项目的处理
-            if ProjectType.MD in event_data.file_project_types:
-
-                SpecialTextFilter.filter_md_text(self, event_data.items_iter(ProjectType.MD),MD_EXCLUDE_REGEXS)
-
+    # 针对MD项目的处理
+    def get_file_filter(self, file: CacheFile):
+        if file.file_project_type == ProjectType.MD:
+            return self.filter_md_item
+        return None
 
     # 特殊文本过滤器——md项目
-    def filter_md_text(self, cache_list: Iterator[CacheItem],MD_EXCLUDE_REGEXS):
-
-        for entry in cache_list:
-            source_text = entry.source_text
+    def filter_md_item(self, entry: CacheItem):
+        source_text = entry.source_text
 
-            if any(regex.match(source_text) for regex in MD_EXCLUDE_REGEXS):
-                entry.translation_status = TranslationStatus.EXCLUDED
+        if any(regex.match(source_text) for regex in self.MD_EXCLUDE_REGEXS):
+            entry.translation_status = TranslationStatus.EXCLUDED
@@ -1,11 +1,11 @@
 from PyQt5.QtCore import QPoint, Qt
-from PyQt5.QtGui import QBrush, QColor
-from PyQt5.QtWidgets import (QAbstractItemView, QHeaderView, QTableWidgetItem,
-                             QWidget, QVBoxLayout)
-from qfluentwidgets import (Action, FluentIcon as FIF, MessageBox, RoundMenu, TableWidget)
+from PyQt5.QtWidgets import (QAbstractItemView, QHeaderView, QWidget, QVBoxLayout)
+from qfluentwidgets import (Action, FluentIcon as FIF, MessageBox, RoundMenu)
 
 from Base.Base import Base
 from ModuleFolders.Cache.CacheProject import ProjectType
+from UserInterface.EditView.CacheItemTableModel import CacheItemTableModel
+from UserInterface.EditView.CacheItemTableView import CacheItemTableView
 
 # 基础表格页
 class BasicTablePage(Base,QWidget):
@@ -25,9 +25,6 @@ class BasicTablePage(Base,QWidget):
     def __init__(self, file_path: str, file_items: list, cache_manager, parent=None):
         super().__init__(parent)
         self.setObjectName('BasicTablePage')
-        
-        # 初始化 _on_item_changed 方法的处理开关
-        self._item_changed_handler_enabled = True
 
         self.file_path = file_path          # 当前表格对应的文件路径
         self.cache_manager = cache_manager  # 缓存管理器实例
@@ -36,7 +33,7 @@ class BasicTablePage(Base,QWidget):
         self.layout.setContentsMargins(5, 0, 0, 0)
         self.layout.setSpacing(0)
 
-        self.table = TableWidget(self)
+        self.table = CacheItemTableView(self)
         self._init_table()
         self.layout.addWidget(self.table)
         
@@ -44,7 +41,7 @@ class BasicTablePage(Base,QWidget):
         self._populate_real_data(file_items)
 
         # 连接单元格修改信号
-        self.table.itemChanged.connect(self._on_item_changed)
+        self.model.textEdited.connect(self._on_item_changed)
         # 订阅来自执行器的通用表格更新事件
         self.subscribe(Base.EVENT.TABLE_UPDATE, self._on_table_update)
         # 订阅排版完成后的表格重建事件
@@ -53,8 +50,22 @@ class BasicTablePage(Base,QWidget):
     # 表格属性
     def _init_table(self):
         self.headers = [self.tra("行"), self.tra("原文"), self.tra("译文"), self.tra("润文")]
-        self.table.setColumnCount(len(self.headers))
-        self.table.setHorizontalHeaderLabels(self.headers)
+        self.model = CacheItemTableModel(
+            columns = [
+                CacheItemTableModel.COLUMN_ROW,
+                CacheItemTableModel.COLUMN_SOURCE,
+                CacheItemTableModel.COLUMN_TRANS,
+                CacheItemTableModel.COLUMN_POLISH,
+            ],
+            headers = self.headers,
+            editable_columns = {
+                CacheItemTableModel.COLUMN_SOURCE,
+                CacheItemTableModel.COLUMN_TRANS,
+                CacheItemTableModel.COLUMN_POLISH,
+            },
+            parent = self,
+        )
+        self.table.setModel(self.model)
         self.table.verticalHeader().hide()
         self.table.setAlternatingRowColors(True)
         
@@ -73,76 +84,19 @@ class BasicTablePage(Base,QWidget):
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self._show_context_menu)
 
-    # 获取数据并填充表格
+    # 获取数据并填充表格，模型直接引用缓存条目，只在显示时读取文本
     def _populate_real_data(self, items: list):
-        # 在批量填充数据前，关闭 _on_item_changed 的处理逻辑
-        self._item_changed_handler_enabled = False
-        try:
-            # 定义高亮颜色：半透明浅绿色
-            highlight_brush = QBrush(QColor(144, 238, 144, 100))
-            
-            self.table.setRowCount(len(items))
-            for row_idx, item_data in enumerate(items):
-                # 行号列 (第0列)
-                num_item = QTableWidgetItem(str(row_idx + 1))
-                num_item.setTextAlignment(Qt.AlignCenter)
-                num_item.setFlags(num_item.flags() & ~Qt.ItemIsEditable)
-                num_item.setData(Qt.UserRole, item_data.text_index)
-                self.table.setItem(row_idx, 0, num_item)
-
-                # 原文列
-                source_item = QTableWidgetItem(item_data.source_text)
-                self.table.setItem(row_idx, 1, source_item)
-                
-                # 译文、润文列 (可编辑)
-                trans_item = QTableWidgetItem(item_data.translated_text)
-                polish_item = QTableWidgetItem(item_data.polished_text or '')
-                self.table.setItem(row_idx, 2, trans_item)
-                self.table.setItem(row_idx, 3, polish_item)
-
-                # 检查是否存在 extra 字典以及对应的标记
-                if item_data.extra:
-                    # 如果翻译文本被标记，则高亮第2列（译文）
-                    if item_data.extra.get('language_mismatch_translation', False):
-                        trans_item.setBackground(highlight_brush)
-                    
-                    # 如果润色文本被标记，则高亮第3列（润文）
-                    if item_data.extra.get('language_mismatch_polish', False):
-                        polish_item.setBackground(highlight_brush)
-
-        finally:
-            # 无论是否发生异常，都确保在操作结束后重新打开开关
-            self._item_changed_handler_enabled = True
-
-    # 监听用户编辑单元格
-    def _on_item_changed(self, item: QTableWidgetItem):
-        # 检查开关状态，如果为关闭，则不执行任何操作
-        if not self._item_changed_handler_enabled:
-            return
+        index_dict = None
+        cache_file = self.cache_manager.project.get_file(self.file_path)
+        if cache_file is not None and cache_file.items is items:
+            index_dict = cache_file.items_index_dict
 
-        row = item.row()
-        col = item.column()
+        self.model.set_file(self.file_path, items, index_dict)
 
-        if col not in [self.COL_SOURCE, self.COL_TRANS, self.COL_POLISH]:
-            return
-            
-        text_index_item = self.table.item(row, 0)
-        if not text_index_item:
-            return 
-        text_index = text_index_item.data(Qt.UserRole)
-
-        new_text = item.text()
-        
-        field_name = ''
-        if col == self.COL_TRANS:
-            field_name = 'translated_text'
-        elif col == self.COL_POLISH:
-            field_name = 'polished_text'
-        elif col == self.COL_SOURCE:
-            field_name = 'source_text'
-        
+    # 监听用户编辑单元格
+    def _on_item_changed(self, file_path: str, text_index: int, field_name: str, new_text: str):
         self.cache_manager.update_item_text(
-            storage_path=self.file_path,
+            storage_path=file_path,
             text_index=text_index,
             field_name=field_name,
             new_text=new_text
@@ -161,7 +115,7 @@ class BasicTablePage(Base,QWidget):
             menu.addAction(Action(FIF.DELETE, self.tra("清空翻译"), triggered=self._clear_translation))
             menu.addAction(Action(FIF.DELETE, self.tra("清空润色"), triggered=self._clear_polishing))
             menu.addSeparator()
-        row_count = self.table.rowCount()
+        row_count = self.model.rowCount()
         row_count_action = Action(FIF.LEAF, self.tra("行数: {}").format(row_count))
         row_count_action.setEnabled(False)
         menu.addAction(row_count_action)
@@ -193,32 +147,23 @@ class BasicTablePage(Base,QWidget):
             self.warning(f"无效的目标列索引: {target_column_index}")
             return
 
-        # 在批量更新前关闭开关，操作结束后再打开
-        self._item_changed_handler_enabled = False
-        try:
-            index_to_row_map = {
-                self.table.item(row, self.COL_NUM).data(Qt.UserRole): row 
-                for row in range(self.table.rowCount()) if self.table.item(row, self.COL_NUM)
-            }
-
-            for text_index, new_text in updated_items.items():
-                if text_index in index_to_row_map:
-                    row = index_to_row_map[text_index]
-                    
-                    # 更新UI表格
-                    self.table.setItem(row, target_column_index, QTableWidgetItem(new_text))
-
-                    # 更新CacheManager中的数据模型
-                    self.cache_manager.update_item_text(
-                        storage_path=self.file_path,
-                        text_index=text_index,
-                        field_name=field_name,
-                        new_text=new_text
-                    )
-            
-            self.table.resizeRowsToContents()
-        finally:
-            self._item_changed_handler_enabled = True
+        # 更新CacheManager中的数据，表格直接读取缓存条目，只需按行刷新
+        changed_rows = []
+        for text_index, new_text in updated_items.items():
+            row = self.model.find_row(self.file_path, text_index)
+            if row < 0:
+                continue
+
+            self.cache_manager.update_item_text(
+                storage_path=self.file_path,
+                text_index=text_index,
+                field_name=field_name,
+                new_text=new_text
+            )
+            changed_rows.append(row)
+
+        self.model.notify_rows_changed(changed_rows)
+        self.table.fit_rows_to_contents()
 
     # 表格重编排方法
     def _on_format_and_rebuild_table(self, event, data: dict):
@@ -247,15 +192,13 @@ class BasicTablePage(Base,QWidget):
             self.error("缓存拼接更新失败，表格更新中止。")
             return
             
-        # 此方法调用 _populate_real_data，开关逻辑已在该方法中处理，所以这里无需额外操作
+        row_count_change = len(updated_full_item_list) - self.model.rowCount()
         self._populate_real_data(updated_full_item_list)
-        
-        row_count_change = len(updated_full_item_list) - self.table.rowCount()
         self.info_toast(self.tra("排版完成"), self.tra("表格已成功更新，行数变化: {:+}").format(row_count_change))
 
     def _get_selected_rows_indices(self):
         """获取所有被选中行的索引列表"""
-        return sorted(list(set(index.row() for index in self.table.selectedIndexes())))
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
 
     def _translate_text(self):
         """处理右键菜单的“翻译文本”操作"""
@@ -271,13 +214,11 @@ class BasicTablePage(Base,QWidget):
 
         items_to_translate = []
         for row in selected_rows:
-            text_index_item = self.table.item(row, self.COL_NUM)
-            source_text_item = self.table.item(row, self.COL_SOURCE)
-            if text_index_item and source_text_item:
-                items_to_translate.append({
-                    "text_index": text_index_item.data(Qt.UserRole),
-                    "source_text": source_text_item.text()
-                })
+            item = self.model.get_item(row)
+            items_to_translate.append({
+                "text_index": item.text_index,
+                "source_text": item.source_text
+            })
         
         if not items_to_translate:
             return
@@ -305,15 +246,12 @@ class BasicTablePage(Base,QWidget):
 
         items_to_polish = []
         for row in selected_rows:
-            text_index_item = self.table.item(row, self.COL_NUM)
-            source_text_item = self.table.item(row, self.COL_SOURCE)
-            translation_text_item = self.table.item(row, self.COL_TRANS)
-            if text_index_item and source_text_item:
-                items_to_polish.append({
-                    "text_index": text_index_item.data(Qt.UserRole),
-                    "source_text": source_text_item.text(),
-                    "translation_text": translation_text_item.text()
-                })
+            item = self.model.get_item(row)
+            items_to_polish.append({
+                "text_index": item.text_index,
+                "source_text": item.source_text,
+                "translation_text": item.translated_text or ""
+            })
         
         if not items_to_polish:
             return
@@ -347,15 +285,12 @@ class BasicTablePage(Base,QWidget):
         items_to_format = []
         selected_item_indices = []
         for row in selected_rows:
-            text_index_item = self.table.item(row, self.COL_NUM)
-            source_text_item = self.table.item(row, self.COL_SOURCE)
-            if text_index_item and source_text_item:
-                text_index = text_index_item.data(Qt.UserRole)
-                items_to_format.append({
-                    "text_index": text_index,
-                    "source_text": source_text_item.text(),
-                })
-                selected_item_indices.append(text_index)
+            item = self.model.get_item(row)
+            items_to_format.append({
+                "text_index": item.text_index,
+                "source_text": item.source_text,
+            })
+            selected_item_indices.append(item.text_index)
 
         if not items_to_format:
             return
@@ -374,31 +309,20 @@ class BasicTablePage(Base,QWidget):
             return
         
         for row in selected_rows:
-            source_item = self.table.item(row, self.COL_SOURCE)
-            if source_item:
-                source_text = source_item.text()
-                trans_item = self.table.item(row, self.COL_TRANS)
-                if trans_item:
-                    trans_item.setText(source_text)
-                else:
-                    self.table.setItem(row, self.COL_TRANS, QTableWidgetItem(source_text))
+            item = self.model.get_item(row)
+            self._on_item_changed(self.file_path, item.text_index, 'translated_text', item.source_text)
+        self.model.notify_rows_changed(selected_rows)
         
         self.info_toast(self.tra("操作完成"), self.tra("已将 {} 行的原文复制到译文。").format(len(selected_rows)))
 
     def _clear_translation(self):
         selected_rows = self._get_selected_rows_indices()
         for row in selected_rows:
-            item = self.table.item(row, self.COL_TRANS)
-            if item:
-                item.setText("")
-            else:
-                self.table.setItem(row, self.COL_TRANS, QTableWidgetItem(""))
+            self._on_item_changed(self.file_path, self.model.get_item(row).text_index, 'translated_text', "")
+        self.model.notify_rows_changed(selected_rows)
 
     def _clear_polishing(self):
         selected_rows = self._get_selected_rows_indices()
         for row in selected_rows:
-            item = self.table.item(row, self.COL_POLISH)
-            if item:
-                item.setText("")
-            else:
-                self.table.setItem(row, self.COL_POLISH, QTableWidgetItem(""))
\ No newline at end of file
+            self._on_item_changed(self.file_path, self.model.get_item(row).text_index, 'polished_text', "")
+        self.model.notify_rows_changed(selected_rows)
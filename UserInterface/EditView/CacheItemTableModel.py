@@ -0,0 +1,180 @@
+import os
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+
+from ModuleFolders.Cache.CacheItem import CacheItem
+
+
+# 缓存条目表格模型
+class CacheItemTableModel(QAbstractTableModel):
+    """
+    直接以缓存条目列表作为数据源的表格模型，视图只向模型请求可见单元格的内容，不再为每个单元格创建表格项
+    单文件模式下行号即条目在文件中的位置，搜索结果模式下每行对应 (文件路径, 行号, 条目)
+    单元格编辑通过 textEdited 信号交由页面写回缓存，批量修改后调用 notify_rows_changed 按连续区间刷新
+    """
+
+    # 列类型
+    COLUMN_FILE = "file"                    # 文件名
+    COLUMN_ROW = "row"                      # 行号
+    COLUMN_SOURCE = "source_text"           # 原文
+    COLUMN_TRANS = "translated_text"        # 译文
+    COLUMN_POLISH = "polished_text"         # 润文
+
+    # 语言不匹配标记对应的列
+    MISMATCH_FLAGS = {
+        COLUMN_TRANS: "language_mismatch_translation",
+        COLUMN_POLISH: "language_mismatch_polish",
+    }
+
+    # 高亮颜色：半透明浅绿色
+    HIGHLIGHT_BRUSH = QBrush(QColor(144, 238, 144, 100))
+
+    # 单元格被用户编辑，参数为 (文件路径, 文本索引, 字段名, 新文本)
+    textEdited = pyqtSignal(str, int, str, str)
+
+    def __init__(self, columns: list[str], headers: list[str], editable_columns: set[str], parent = None):
+        super().__init__(parent)
+        self.columns = columns
+        self.headers = headers
+        self.editable_columns = editable_columns
+
+        self.items = []                     # 每行对应的缓存条目
+        self.file_path = ""                 # 单文件模式下的文件路径
+        self.file_paths = None              # 搜索结果模式下每行的文件路径
+        self.row_numbers = None             # 搜索结果模式下每行的原始行号
+        self.index_dict = None              # (文件路径, 文本索引) 或 文本索引 -> 行
+
+    # 单文件模式，index_dict 为文本索引到列表下标的映射，通常为 CacheFile.items_index_dict
+    def set_file(self, file_path: str, items: list[CacheItem], index_dict: dict[int, int] = None) -> None:
+        self.beginResetModel()
+        self.items = items
+        self.file_path = file_path
+        self.file_paths = None
+        self.row_numbers = None
+        self.index_dict = index_dict
+        self.endResetModel()
+
+    # 搜索结果模式，results 的格式为 [(文件路径, 行号, 条目)]
+    def set_results(self, results: list[tuple[str, int, CacheItem]]) -> None:
+        self.beginResetModel()
+        self.items = [item for _, _, item in results]
+        self.file_path = ""
+        self.file_paths = [file_path for file_path, _, _ in results]
+        self.row_numbers = [row_num for _, row_num, _ in results]
+        self.index_dict = None
+        self.endResetModel()
+
+    # 搜索结果模式下追加结果
+    def append_results(self, results: list[tuple[str, int, CacheItem]]) -> None:
+        if not results:
+            return
+
+        first = len(self.items)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self.items.extend(item for _, _, item in results)
+        self.file_paths.extend(file_path for file_path, _, _ in results)
+        self.row_numbers.extend(row_num for _, row_num, _ in results)
+        if self.index_dict is not None:
+            for row, (file_path, _, item) in enumerate(results, first):
+                self.index_dict[(file_path, item.text_index)] = row
+        self.endInsertRows()
+
+    # 获取行对应的条目
+    def get_item(self, row: int) -> CacheItem:
+        return self.items[row]
+
+    # 获取行对应的文件路径
+    def get_file_path(self, row: int) -> str:
+        return self.file_path if self.file_paths is None else self.file_paths[row]
+
+    # 获取行对应的原始行号
+    def get_row_number(self, row: int) -> int:
+        return row + 1 if self.row_numbers is None else self.row_numbers[row]
+
+    # 根据文件路径与文本索引查找行，找不到时返回 -1
+    def find_row(self, file_path: str, text_index: int) -> int:
+        if self.file_paths is None:
+            if file_path != self.file_path:
+                return -1
+            if self.index_dict is None:
+                self.index_dict = {item.text_index: row for row, item in enumerate(self.items)}
+            return self.index_dict.get(text_index, -1)
+        else:
+            if self.index_dict is None:
+                self.index_dict = {
+                    (path, item.text_index): row
+                    for row, (path, item) in enumerate(zip(self.file_paths, self.items))
+                }
+            return self.index_dict.get((file_path, text_index), -1)
+
+    # 通知视图指定行的内容已变化，连续的行合并为一次刷新
+    def notify_rows_changed(self, rows) -> None:
+        rows = sorted(set(rows))
+        if not rows:
+            return
+
+        last_column = len(self.columns) - 1
+        start = end = rows[0]
+        for row in rows[1:]:
+            if row != end + 1:
+                self.dataChanged.emit(self.index(start, 0), self.index(end, last_column))
+                start = row
+            end = row
+        self.dataChanged.emit(self.index(start, 0), self.index(end, last_column))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.headers):
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = self.columns[index.column()]
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == self.COLUMN_FILE:
+                return os.path.basename(self.get_file_path(row))
+            elif column == self.COLUMN_ROW:
+                return str(self.get_row_number(row))
+            else:
+                return getattr(self.items[row], column) or ""
+        elif role == Qt.TextAlignmentRole:
+            if column == self.COLUMN_ROW:
+                return Qt.AlignCenter
+        elif role == Qt.BackgroundRole:
+            flag = self.MISMATCH_FLAGS.get(column)
+            extra = self.items[row].extra
+            if flag is not None and extra and extra.get(flag, False):
+                return self.HIGHLIGHT_BRUSH
+
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        flags = super().flags(index)
+        if index.isValid() and self.columns[index.column()] in self.editable_columns:
+            flags = flags | Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+
+        row = index.row()
+        column = self.columns[index.column()]
+        if column not in self.editable_columns:
+            return False
+
+        # 由页面写回缓存，缓存中的条目即为模型的数据源，写回后刷新整行
+        self.textEdited.emit(self.get_file_path(row), self.items[row].text_index, column, str(value))
+        self.notify_rows_changed((row,))
+        return True
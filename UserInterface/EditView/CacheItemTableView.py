@@ -0,0 +1,55 @@
+from PyQt5.QtCore import QTimer
+from qfluentwidgets import TableView
+
+
+# 缓存条目表格视图
+class CacheItemTableView(TableView):
+    """
+    按需调整行高的表格视图
+    resizeRowsToContents 会测量所有行的文本，大文件时会卡住界面，这里只调整进入可见区域的行
+    """
+
+    def __init__(self, parent = None):
+        super().__init__(parent)
+
+        # 是否按内容调整行高，开启后滚动时调整新进入可见区域的行
+        self.fit_rows = False
+
+        # 合并短时间内的多次调整
+        self.fit_timer = QTimer(self)
+        self.fit_timer.setSingleShot(True)
+        self.fit_timer.setInterval(0)
+        self.fit_timer.timeout.connect(self.resize_visible_rows)
+
+        self.verticalScrollBar().valueChanged.connect(self.schedule_fit_rows)
+
+    def setModel(self, model) -> None:
+        super().setModel(model)
+        model.dataChanged.connect(self.schedule_fit_rows)
+        model.modelReset.connect(self.schedule_fit_rows)
+
+    # 按内容调整行高，只处理可见行，其余行在滚动到可见区域时调整
+    def fit_rows_to_contents(self) -> None:
+        self.fit_rows = True
+        self.fit_timer.start()
+
+    # 滚动或数据变化后调整可见行
+    def schedule_fit_rows(self, *args) -> None:
+        if self.fit_rows:
+            self.fit_timer.start()
+
+    # 调整可见行的行高
+    def resize_visible_rows(self) -> None:
+        model = self.model()
+        if model is None:
+            return
+
+        row = self.rowAt(0)
+        if row < 0:
+            return
+
+        height = self.viewport().height()
+        row_count = model.rowCount()
+        while row < row_count and self.rowViewportPosition(row) < height:
+            self.resizeRowToContents(row)
+            row += 1
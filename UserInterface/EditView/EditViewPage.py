@@ -7,7 +7,7 @@ from PyQt5.QtWidgets import ( QFileDialog, QFrame, QTreeWidgetItem,
                              QWidget, QHBoxLayout, QVBoxLayout, 
                              QSplitter, QStackedWidget, QGridLayout)
 from qfluentwidgets import (Action,  CaptionLabel, MessageBox, PrimarySplitPushButton, PushButton, RoundMenu,  ToggleToolButton, TransparentPushButton, TransparentToolButton,
-                            TreeWidget, TabBar, FluentIcon as FIF, CardWidget, Action, RoundMenu, ProgressBar)
+                            TreeWidget, TabBar, FluentIcon as FIF, CardWidget, Action, RoundMenu, ProgressBar, StateToolTip)
 from qframelesswindow import QTimer
 
 from Base.Base import Base
@@ -415,7 +415,9 @@ class NavigationCard(Base,CardWidget):
             # 用户点击了“开始提取”
             params = {
                 "model_name": dialog.selected_model,
-                "entity_types": dialog.selected_types
+                "entity_types": dialog.selected_types,
+                "batch_size": dialog.selected_batch_size,
+                "n_process": dialog.selected_n_process
             }
             self.termExtractionRequested.emit(params)
 
@@ -534,21 +536,17 @@ class PageCard(Base,CardWidget):
             return
 
         table_page = current_tab.tableView
-        table = table_page.table
+        model = table_page.model
 
         # 提取所有文本
         all_text_data = []
-        for row in range(table.rowCount()):
-            row_num_item = table.item(row, BasicTablePage.COL_NUM)
-            source_item = table.item(row, BasicTablePage.COL_SOURCE)
-            trans_item = table.item(row, BasicTablePage.COL_TRANS)
-            polish_item = table.item(row, BasicTablePage.COL_POLISH)
-
+        for row in range(model.rowCount()):
+            item = model.get_item(row)
             all_text_data.append({
-                "row": row_num_item.text() if row_num_item else str(row + 1),
-                "source": source_item.text() if source_item else "",
-                "translation": trans_item.text() if trans_item else "",
-                "polish": polish_item.text() if polish_item else ""
+                "row": str(model.get_row_number(row)),
+                "source": item.source_text or "",
+                "translation": item.translated_text or "",
+                "polish": item.polished_text or ""
             })
 
         # 生成新的视图标签页
@@ -594,6 +592,8 @@ class TabInterface(QWidget):
 class EditViewPage(Base,QFrame):
 
     languageCheckFinished = pyqtSignal(tuple)    
+    searchResultsFound = pyqtSignal(tuple)      # (搜索编号, 一批搜索结果)
+    searchFinished = pyqtSignal(tuple)          # (搜索编号, 结果总数)
 
     def __init__(self, text: str, window, plugin_manager, cache_manager, file_reader) -> None:
         super().__init__(window)
@@ -602,6 +602,13 @@ class EditViewPage(Base,QFrame):
         self.cache_manager = cache_manager  # 缓存管理器
         self.file_reader = file_reader  # 文件读取器
 
+        # 进行中的搜索，新的搜索开始时取消上一次搜索
+        self.search_id = 0
+        self.search_state = None
+
+        # 术语提取的进度提示
+        self.term_state_tooltip = None
+
         # 创建主布局
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)  # 四周边距归零
@@ -675,10 +682,13 @@ class EditViewPage(Base,QFrame):
         self.nav_card.termExtractionRequested.connect(self.perform_term_extraction) # 开始术语提取信号
 
         self.languageCheckFinished.connect(self._on_language_check_finished) #连接检查完成信号到槽函数
+        self.searchResultsFound.connect(self._on_search_results_found) # 搜索结果分批显示
+        self.searchFinished.connect(self._on_search_finished) # 搜索完成
 
 
         # 订阅事件
         self.subscribe(Base.EVENT.TASK_CONTINUE_CHECK, self.task_continue_check)
+        self.subscribe(Base.EVENT.TERM_EXTRACTION_UPDATE, self._on_term_extraction_update)
         self.subscribe(Base.EVENT.TERM_EXTRACTION_DONE, self._on_term_extraction_finished)
               
         
@@ -916,6 +926,10 @@ class EditViewPage(Base,QFrame):
         # 确保 widget 存在再移除
         widget_to_remove = self.page_card.stacked_widget.widget(index)
         if widget_to_remove:
+            # 关闭正在接收结果的搜索页时取消搜索
+            if self.search_state is not None and self.search_state["page"] is widget_to_remove:
+                self.cancel_search()
+
             self.page_card.stacked_widget.removeWidget(widget_to_remove)
             # Qt 会在稍后安全地删除 widget
             widget_to_remove.deleteLater()
@@ -924,25 +938,14 @@ class EditViewPage(Base,QFrame):
 
     # 执行搜索事件
     def perform_search(self, params: dict):
-        """执行搜索并显示结果"""
+        """在后台线程中执行搜索，结果分批显示在新的标签页中"""
         query = params["query"]
         scope = params["scope"]
         is_regex = params["is_regex"]
         search_flagged = params["search_flagged"]
 
-        self.info(f"正在搜索: '{query}' (范围: {scope}, 正则: {is_regex}, 标记行: {search_flagged})")
-        
-        # 调用 CacheManager 执行搜索
-        results = self.cache_manager.search_items(query, scope, is_regex, search_flagged)
-
-        if not results:
-            MessageBox(self.tra("未找到结果"), self.tra("未能找到与 '{}' 匹配的内容。").format(query), self.window()).exec() # M
-            return
-        
         # 创建搜索结果标签页
         tab_name = f"Search - {query[:20]}..."
-        # 使用时间戳确保路由键唯一
-        route_key = f"search_{int(time.time())}"
 
         # 检查是否已存在完全相同的搜索结果页（简单检查名称）
         for i in range(self.page_card.tab_bar.count()):
@@ -952,13 +955,62 @@ class EditViewPage(Base,QFrame):
                 self.page_card.stacked_widget.setCurrentIndex(i)
                 return
 
+        self.info(f"正在搜索: '{query}' (范围: {scope}, 正则: {is_regex}, 标记行: {search_flagged})")
+
+        # 取消上一次搜索
+        self.cancel_search()
+        self.search_id += 1
+        cancel_event = threading.Event()
+        self.search_state = {
+            "id": self.search_id,
+            "params": params,
+            "tab_name": tab_name,
+            "cancel_event": cancel_event,
+            "page": None,
+        }
+
+        # 使用线程避免UI冻结
+        thread = threading.Thread(
+            target=self._search_worker,
+            args=(self.search_id, query, scope, is_regex, search_flagged, cancel_event),
+            daemon=True,
+        )
+        thread.start()
+
+    def cancel_search(self):
+        """取消进行中的搜索"""
+        if self.search_state is not None:
+            self.search_state["cancel_event"].set()
+            self.search_state = None
+
+    def _search_worker(self, search_id: int, query: str, scope: str, is_regex: bool, search_flagged: bool, cancel_event: threading.Event):
+        """工作线程，调用 CacheManager 执行搜索并分批发出结果"""
+        results = self.cache_manager.search_items(
+            query, scope, is_regex, search_flagged,
+            cancel_event=cancel_event,
+            on_results=lambda batch: self.searchResultsFound.emit((search_id, batch)),
+        )
+        self.searchFinished.emit((search_id, len(results)))
+
+    def _on_search_results_found(self, data: tuple):
+        """在主线程中显示一批搜索结果，第一批结果到达时创建标签页"""
+        search_id, results = data
+        state = self.search_state
+        if state is None or state["id"] != search_id:
+            return
+
+        if state["page"] is not None:
+            state["page"].append_results(results)
+            return
+
         # 创建新的搜索结果页面实例
-        search_page = SearchResultPage(results, self.cache_manager, params)
-        search_page.setObjectName(route_key)
+        search_page = SearchResultPage(results, self.cache_manager, state["params"])
+        search_page.setObjectName(f"search_{int(time.time())}_{search_id}") # 使用时间戳确保路由键唯一
+        state["page"] = search_page
 
         # 添加新标签页
         self.page_card.stacked_widget.addWidget(search_page)
-        self.page_card.tab_bar.addTab(routeKey=route_key, text=tab_name)
+        self.page_card.tab_bar.addTab(routeKey=search_page.objectName(), text=state["tab_name"])
 
         # 获取新标签页的索引
         new_index = self.page_card.tab_bar.count() - 1
@@ -968,6 +1020,18 @@ class EditViewPage(Base,QFrame):
         self.page_card.tab_bar.setCurrentIndex(new_index)
         self.page_card.stacked_widget.setCurrentIndex(new_index)
 
+    def _on_search_finished(self, data: tuple):
+        """搜索结束，没有任何结果时提示用户"""
+        search_id, total = data
+        state = self.search_state
+        if state is None or state["id"] != search_id:
+            return
+        self.search_state = None
+
+        if total == 0:
+            query = state["params"]["query"]
+            MessageBox(self.tra("未找到结果"), self.tra("未能找到与 '{}' 匹配的内容。").format(query), self.window()).exec() # M
+
 
     # 执行语言检查
     def perform_language_check(self, mode: str):
@@ -1025,6 +1089,14 @@ class EditViewPage(Base,QFrame):
         all_items_to_process = self.cache_manager.get_all_source_items()
         
         self.info(f"数据收集完毕，共 {len(all_items_to_process)} 条。正在发送提取事件...")
+
+        # 显示进度提示，识别过程中持续更新
+        if self.term_state_tooltip:
+            self.term_state_tooltip.close()
+        self.term_state_tooltip = StateToolTip(self.tra('正在提取术语...'), self.tra('正在加载模型'), self.window())
+        x = self.window().width() // 2 - self.term_state_tooltip.width() // 2
+        self.term_state_tooltip.move(x, 32)
+        self.term_state_tooltip.show()
         
         # 发送开始事件，将参数和数据传递给 SimpleExecutor
         self.emit(Base.EVENT.TERM_EXTRACTION_START, {
@@ -1032,12 +1104,34 @@ class EditViewPage(Base,QFrame):
             "items_data": all_items_to_process
         })
 
+    # 术语提取进度更新事件
+    def _on_term_extraction_update(self, event: int, data: dict):
+        if self.term_state_tooltip:
+            content = self.tra("已识别 {} / {} 条文本，找到 {} 个实体").format(
+                data.get("processed", 0), data.get("total", 0), data.get("found", 0)
+            )
+            self.term_state_tooltip.setContent(content)
+
     # 术语提取结束事件
     def _on_term_extraction_finished(self, event: int, data: dict):
         """
         此槽函数在主线程中执行，用于接收 TERM_EXTRACTION_DONE 事件并安全地更新UI。
         """
         results = data.get("results", [])
+        error = data.get("error", "")
+
+        if self.term_state_tooltip:
+            if error:
+                # 失败时直接关闭，setState(False) 会让提示一直保持加载状态
+                self.term_state_tooltip.close()
+            else:
+                self.term_state_tooltip.setContent(self.tra("术语提取完成"))
+                self.term_state_tooltip.setState(True)
+            self.term_state_tooltip = None
+
+        if error:
+            MessageBox(self.tra("提取失败"), self.tra("术语提取过程中出现错误：") + error, self.window()).exec()
+            return
 
         if not results:
             MessageBox(self.tra("未找到"), self.tra("未能提取到任何符合条件的术语。"), self.window()).exec()
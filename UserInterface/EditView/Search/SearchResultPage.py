@@ -1,13 +1,12 @@
-import os
 import re 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QBrush, QColor
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTableWidgetItem, 
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, 
                              QAbstractItemView, QHeaderView, QHBoxLayout, QSpacerItem, QSizePolicy)
 
-from qfluentwidgets import (TableWidget, PrimaryPushButton, LineEdit, StrongBodyLabel,
+from qfluentwidgets import (PrimaryPushButton, LineEdit, StrongBodyLabel,
                             CheckBox)
 from Base.Base import Base
+from UserInterface.EditView.CacheItemTableModel import CacheItemTableModel
+from UserInterface.EditView.CacheItemTableView import CacheItemTableView
 
 
 class SearchResultPage(Base, QWidget):
@@ -42,7 +41,7 @@ class SearchResultPage(Base, QWidget):
         self._init_replace_panel()
 
         # 初始化表格组件
-        self.table = TableWidget(self)
+        self.table = CacheItemTableView(self)
         self._init_table()
         self.layout.addWidget(self.table)
         
@@ -50,7 +49,7 @@ class SearchResultPage(Base, QWidget):
         self._populate_data(search_results)
 
         # 连接表格内容变更信号
-        self.table.itemChanged.connect(self._on_item_changed)
+        self.model.textEdited.connect(self._on_item_changed)
 
     def _init_replace_panel(self):
         """初始化批量替换面板（包含查找/替换输入框、选项和操作按钮）"""
@@ -143,8 +142,19 @@ class SearchResultPage(Base, QWidget):
             self.tra("译文"), 
             self.tra("润文")
         ]
-        self.table.setColumnCount(len(self.headers))
-        self.table.setHorizontalHeaderLabels(self.headers)
+        self.model = CacheItemTableModel(
+            columns = [
+                CacheItemTableModel.COLUMN_FILE,
+                CacheItemTableModel.COLUMN_ROW,
+                CacheItemTableModel.COLUMN_SOURCE,
+                CacheItemTableModel.COLUMN_TRANS,
+                CacheItemTableModel.COLUMN_POLISH,
+            ],
+            headers = self.headers,
+            editable_columns = {CacheItemTableModel.COLUMN_TRANS, CacheItemTableModel.COLUMN_POLISH},
+            parent = self,
+        )
+        self.table.setModel(self.model)
         self.table.verticalHeader().hide()  # 隐藏行号列
         self.table.setAlternatingRowColors(True)  # 启用斑马纹
         self.table.setWordWrap(True)  # 允许文本换行
@@ -169,83 +179,19 @@ class SearchResultPage(Base, QWidget):
         Args:
             search_results: 搜索结果列表，格式为[(文件路径, 行号, 文本项)]
         """
-        # 阻塞信号防止频繁触发itemChanged
-        self.table.blockSignals(True)
-
-        # 定义高亮颜色
-        highlight_brush = QBrush(QColor(144, 238, 144, 100))
-        
-        # 设置表格行数
-        self.table.setRowCount(len(search_results))
-
-        # 遍历所有搜索结果
-        for row_idx, result_info in enumerate(search_results):
-            file_path, original_row_num, item = result_info
-
-            # 文件名项（不可编辑）
-            file_item = QTableWidgetItem(os.path.basename(file_path))
-            file_item.setFlags(file_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row_idx, self.COL_FILE, file_item)
-
-            # 行号项（不可编辑，存储原始数据）
-            row_num_item = QTableWidgetItem(str(original_row_num))
-            row_num_item.setTextAlignment(Qt.AlignCenter)  # 居中对齐
-            row_num_item.setFlags(row_num_item.flags() & ~Qt.ItemIsEditable)
-            # 存储元数据：(文件路径, 文本索引)
-            row_num_item.setData(Qt.UserRole, (file_path, item.text_index))
-            self.table.setItem(row_idx, self.COL_ROW, row_num_item)
-
-            # 原文项（不可编辑）
-            source_item = QTableWidgetItem(item.source_text)
-            source_item.setFlags(source_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row_idx, self.COL_SOURCE, source_item)
-
-            # 译文项（可编辑）
-            trans_item = QTableWidgetItem(item.translated_text)
-            self.table.setItem(row_idx, self.COL_TRANS, trans_item)
-            # 润文项（可编辑）
-            polish_item = QTableWidgetItem(item.polished_text or '')
-            self.table.setItem(row_idx, self.COL_POLISH, polish_item)
-
-            # 检查并应用高亮
-            if item.extra:
-                if item.extra.get('language_mismatch_translation', False):
-                    trans_item.setBackground(highlight_brush)
-                if item.extra.get('language_mismatch_polish', False):
-                    polish_item.setBackground(highlight_brush)
-        
-        # 自动调整行高以适应内容
-        self.table.resizeRowsToContents()
-        # 恢复信号连接
-        self.table.blockSignals(False)
-
-    def _on_item_changed(self, item: QTableWidgetItem):
-        """处理表格内容变更事件（用户编辑译文/润文列时触发）
-        
-        1. 获取被修改的单元格位置
-        2. 通过关联的行号项获取元数据
-        3. 更新缓存管理器中的对应数据
-        """
-        row = item.row()
-        col = item.column()
+        # 模型直接引用搜索到的缓存条目，只在显示时读取文本
+        self.model.set_results(search_results)
 
-        # 仅处理译文列(3)和润文列(4)的变更
-        if col not in [self.COL_TRANS, self.COL_POLISH]:
-            return
+        # 自动调整行高以适应内容，只处理可见行
+        self.table.fit_rows_to_contents()
 
-        # 获取关联的行号项（存储元数据）
-        ref_item = self.table.item(row, self.COL_ROW)
-        if not ref_item:
-            return
-        
-        # 解析元数据：(文件路径, 文本索引)
-        file_path, text_index = ref_item.data(Qt.UserRole)
-        new_text = item.text()  # 获取修改后的文本
+    def append_results(self, search_results: list):
+        """追加后台搜索陆续找到的结果"""
+        self.model.append_results(search_results)
+        self.table.fit_rows_to_contents()
 
-        # 确定修改的是译文还是润文
-        field_name = 'translated_text' if col == self.COL_TRANS else 'polished_text'
-        
-        # 更新缓存数据
+    def _on_item_changed(self, file_path: str, text_index: int, field_name: str, new_text: str):
+        """处理表格内容变更事件（用户编辑译文/润文列时触发），更新缓存管理器中的对应数据"""
         self.cache_manager.update_item_text(
             storage_path=file_path,
             text_index=text_index,
@@ -290,39 +236,35 @@ class SearchResultPage(Base, QWidget):
                 self.error_toast(self.tra("替换失败"), self.tra(f"无效的正则表达式：{e}"))
                 return
 
-        # 确定目标列索引
-        target_cols = []
+        # 确定目标字段
+        target_fields = []
         if in_trans_col:
-            target_cols.append(self.COL_TRANS)
+            target_fields.append('translated_text')
         if in_polish_col:
-            target_cols.append(self.COL_POLISH)
+            target_fields.append('polished_text')
 
-        # 阻塞表格信号
-        self.table.blockSignals(True)
-        
         replacement_count = 0  # 替换计数器
-        # 遍历所有行和目标列
-        for row in range(self.table.rowCount()):
-            for col in target_cols:
-                item = self.table.item(row, col)
-                if not item:
-                    continue
-                
-                original_text = item.text()
+        changed_rows = []
+        # 遍历所有行和目标字段
+        for row in range(self.model.rowCount()):
+            item = self.model.get_item(row)
+            for field_name in target_fields:
+                original_text = getattr(item, field_name) or ''
                 # 执行实际替换操作
                 new_text = self._perform_replace(
                     original_text, find_text, replace_text, 
                     is_case_sensitive, is_whole_word, is_regex
                 )
 
-                # 更新发生变化的单元格
+                # 写回发生变化的文本
                 if original_text != new_text:
-                    item.setText(new_text)
+                    self._on_item_changed(self.model.get_file_path(row), item.text_index, field_name, new_text)
                     replacement_count += 1
+                    changed_rows.append(row)
         
-        # 恢复信号连接并更新UI
-        self.table.blockSignals(False)
-        self.table.resizeRowsToContents()  # 重新调整行高
+        # 按行刷新表格并重新调整行高
+        self.model.notify_rows_changed(changed_rows)
+        self.table.fit_rows_to_contents()
 
         # 显示操作结果
         self.success_toast(
@@ -144,13 +144,15 @@ class StartupPage(Base, QWidget):
             translation_project = config.get("translation_project", "AutoType")
             label_input_path = config.get("label_input_path", "./input")
             label_input_exclude_rule = config.get("label_input_exclude_rule", "")
+            label_input_process_count = config.get("label_input_process_count", 0)
             label_output_path = config.get("label_output_path", "./output")
 
             if mode == "new":
                 CacheProject = self.file_reader.read_files(
                     translation_project,
                     label_input_path,
-                    label_input_exclude_rule
+                    label_input_exclude_rule,
+                    label_input_process_count
                 )
                 self.cache_manager.load_from_project(CacheProject)
             else:  # "continue"
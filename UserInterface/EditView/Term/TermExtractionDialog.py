@@ -1,8 +1,9 @@
 import os
 from qfluentwidgets import (ComboBox, CheckBox, MessageBoxBase, StrongBodyLabel, 
-                            InfoBar, InfoBarPosition, CaptionLabel, HyperlinkButton)
+                            InfoBar, InfoBarPosition, CaptionLabel, HyperlinkButton, SpinBox, BodyLabel)
 from PyQt5.QtWidgets import QGroupBox, QWidget, QVBoxLayout, QGridLayout, QHBoxLayout
 from Base.Base import Base
+from ModuleFolders.NERProcessor.NERProcessor import NERProcessor
 
 class TermExtractionDialog(Base, MessageBoxBase):
     """
@@ -50,6 +51,24 @@ class TermExtractionDialog(Base, MessageBoxBase):
         self.entity_checkboxes = {} # 用于存储复选框的字典
         layout.addWidget(self.entity_group)
 
+        # --- 识别设置：批大小与进程数 ---
+        self.performance_group = QGroupBox(self.tra("识别设置"))
+        performance_layout = QGridLayout(self.performance_group)
+        performance_layout.setSpacing(10)
+
+        self.batch_size_spin = SpinBox(self)
+        self.batch_size_spin.setRange(1, 10000)
+        self.batch_size_spin.setValue(NERProcessor.BATCH_SIZE)
+        performance_layout.addWidget(BodyLabel(self.tra("每批文本数"), self), 0, 0)
+        performance_layout.addWidget(self.batch_size_spin, 0, 1)
+
+        self.n_process_spin = SpinBox(self)
+        self.n_process_spin.setRange(1, os.cpu_count() or 1)
+        self.n_process_spin.setValue(NERProcessor.N_PROCESS)
+        performance_layout.addWidget(BodyLabel(self.tra("识别进程数"), self), 1, 0)
+        performance_layout.addWidget(self.n_process_spin, 1, 1)
+        layout.addWidget(self.performance_group)
+
         # --- 2. 连接信号，当模型选择变化时更新复选框 ---
         self.model_combo.currentTextChanged.connect(self._update_entity_checkboxes)
 
@@ -65,6 +84,8 @@ class TermExtractionDialog(Base, MessageBoxBase):
 
         self.selected_model = None
         self.selected_types = []
+        self.selected_batch_size = NERProcessor.BATCH_SIZE
+        self.selected_n_process = NERProcessor.N_PROCESS
 
     def _clear_layout(self, layout):
         """辅助函数，用于清空布局中的所有小部件"""
@@ -134,6 +155,8 @@ class TermExtractionDialog(Base, MessageBoxBase):
         self.selected_types = [
             text for text, cb in self.entity_checkboxes.items() if cb.isChecked()
         ]
+        self.selected_batch_size = self.batch_size_spin.value()
+        self.selected_n_process = self.n_process_spin.value()
 
         if not self.selected_model or not self.model_combo.isEnabled() or "未找到" in self.selected_model or "无可用" in self.selected_model:
             InfoBar.error(
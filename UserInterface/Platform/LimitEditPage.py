@@ -44,6 +44,7 @@ class LimitEditPage(MessageBoxBase, Base):
         # 添加控件
         self.add_widget_rpm(self.vbox, config)
         self.add_widget_tpm(self.vbox, config)
+        self.add_widget_request_tokens(self.vbox, config)
 
         # 填充
         self.vbox.addStretch(1)
@@ -87,3 +88,23 @@ class LimitEditPage(MessageBoxBase, Base):
                 value_changed = value_changed,
             )
         )
+
+    # 单次请求最大 Token 数
+    def add_widget_request_tokens(self, parent, config):
+        def init(widget):
+            widget.set_range(1, 9999999)
+            widget.set_value(config.get("platforms").get(self.key).get("request_tokens_limit", 32000))
+
+        def value_changed(widget, value: str):
+            config = self.load_config()
+            config["platforms"][self.key]["request_tokens_limit"] = value
+            self.save_config(config)
+
+        parent.addWidget(
+            SpinCard(
+                self.tra("单次请求最大 Token 数"),
+                self.tra("单个请求允许发送的最大 Token 数量，应与模型的上下文长度相匹配，超过该值的任务将拆分到下一轮处理"),
+                init = init,
+                value_changed = value_changed,
+            )
+        )
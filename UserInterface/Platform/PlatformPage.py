@@ -147,6 +147,7 @@ class PlatformPage(QFrame, Base):
         "api_format": "OpenAI",
         "rpm_limit": 4096,
         "tpm_limit": 8000000,
+        "request_tokens_limit": 32000,
         "model": "gpt-4o",
         "top_p": 1.0,
         "temperature": 1.0,
@@ -175,6 +176,7 @@ class PlatformPage(QFrame, Base):
             "api_format",
             "rpm_limit",
             "tpm_limit",
+            "request_tokens_limit",
             "model",
             "auto_complete",
             "top_p",
@@ -16,6 +16,7 @@ from qfluentwidgets import SwitchButton
 from qfluentwidgets import SingleDirectionScrollArea
 
 from Base.Base import Base
+from Widget.SpinCard import SpinCard
 from Widget.EmptyCard import EmptyCard
 from Widget.ComboBoxCard import ComboBoxCard
 from Widget.LineEditCard import LineEditCard
@@ -34,6 +35,7 @@ class AppSettingsPage(QWidget, Base):
             "interface_language_setting": "简中",
             "auto_check_update": True,
             "label_input_exclude_rule": "",
+            "label_input_process_count": 0,
         }
 
         # 载入并保存默认配置
@@ -64,6 +66,7 @@ class AppSettingsPage(QWidget, Base):
         self.add_widget_scale_factor(self.vbox, config)
         self.add_widget_interface_language_setting(self.vbox, config)
         self.add_widget_exclude_rule(self.vbox, config)
+        self.add_widget_process_count(self.vbox, config)
         self.add_widget_app_profile(self.vbox, config, window)
 
         # 填充
@@ -196,6 +199,26 @@ class AppSettingsPage(QWidget, Base):
             )
         )
 
+    # 文件读取进程数
+    def add_widget_process_count(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_range(0, 64)
+            widget.set_value(config.get("label_input_process_count"))
+
+        def value_changed(widget, value: int) -> None:
+            config = self.load_config()
+            config["label_input_process_count"] = value
+            self.save_config(config)
+
+        parent.addWidget(
+            SpinCard(
+                self.tra("文件读取进程数"),
+                self.tra("加载项目时同时读取文件并检测语言的进程数，适合文件数量较多的项目，设置为 0 时根据文件数量与处理器核心数自动设置，设置为 1 时使用单进程读取"),
+                init = init,
+                value_changed = value_changed,
+            )
+        )
+
     # 应用配置切换
     def add_widget_app_profile(self, parent, config, window) -> None:
 
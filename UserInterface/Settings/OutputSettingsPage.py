@@ -26,6 +26,7 @@ class OutputSettingsPage(QFrame, Base):
             "response_conversion_toggle": False,
             "opencc_preset": "s2t",
             "keep_original_encoding": False,
+            "cache_storage_sqlite_switch": False,
         }
 
         # 载入并保存默认配置
@@ -44,6 +45,7 @@ class OutputSettingsPage(QFrame, Base):
         self.add_widget_filename_suffix(self.container, config)
         self.add_widget_bilingual_text_order(self.container, config)
         self.add_widget_encoding(self.container, config)
+        self.add_widget_cache_storage(self.container, config)
         self.container.addWidget(HorizontalSeparator())
         self.add_widget_opencc(self.container, config)
         self.add_widget_opencc_preset(self.container, config)
@@ -187,6 +189,25 @@ class OutputSettingsPage(QFrame, Base):
             )
         )
 
+    # SQLite 缓存存储
+    def add_widget_cache_storage(self, parent, config) -> None:
+        def widget_init(widget) -> None:
+            widget.set_checked(config.get("cache_storage_sqlite_switch"))
+
+        def widget_callback(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["cache_storage_sqlite_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("使用 SQLite 缓存存储"),
+                self.tra("启用此功能后，缓存将保存为输出文件夹中的 SQLite 数据库，保存时只写入变更的条目，状态统计与搜索使用索引查询（项目仍会完整加载到内存中）"),
+                widget_init,
+                widget_callback,
+            )
+        )
+
     # 自动简繁转换
     def add_widget_opencc(self, parent, config) -> None:
         def widget_init(widget) -> None:
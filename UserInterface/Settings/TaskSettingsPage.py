@@ -5,6 +5,7 @@ from qfluentwidgets import HorizontalSeparator
 from Base.Base import Base
 from Widget.SpinCard import SpinCard
 from Widget.ComboBoxCard import ComboBoxCard
+from Widget.SwitchButtonCard import SwitchButtonCard
 
 class TaskSettingsPage(QFrame, Base):
 
@@ -19,8 +20,14 @@ class TaskSettingsPage(QFrame, Base):
             "lines_limit": 10,
             "tokens_limit": 512,
             "user_thread_counts": 0,
+            "adaptive_concurrency_switch": False,
+            "adaptive_concurrency_min": 1,
+            "adaptive_concurrency_max": 0,
+            "async_request_switch": False,
+            "stream_request_switch": False,
             "request_timeout": 120,
             "round_limit": 10,
+            "translation_memory_switch": False,
         }
 
         # 载入并保存默认配置
@@ -42,9 +49,15 @@ class TaskSettingsPage(QFrame, Base):
         self.add_widget_03(self.vbox, config)
         self.vbox.addWidget(HorizontalSeparator())
         self.add_widget_04(self.vbox, config)
+        self.add_widget_adaptive_concurrency(self.vbox, config)
+        self.add_widget_adaptive_concurrency_min(self.vbox, config)
+        self.add_widget_adaptive_concurrency_max(self.vbox, config)
+        self.add_widget_async_request(self.vbox, config)
+        self.add_widget_stream_request(self.vbox, config)
         self.vbox.addWidget(HorizontalSeparator())
         self.add_widget_request_timeout(self.vbox, config)
         self.add_widget_06(self.vbox, config)
+        self.add_widget_translation_memory(self.vbox, config)
 
         # 根据初始模式设置可见性
         self.update_limit_cards_visibility(config)
@@ -179,6 +192,103 @@ class TaskSettingsPage(QFrame, Base):
         )
 
 
+    # 自适应并发
+    def add_widget_adaptive_concurrency(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("adaptive_concurrency_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["adaptive_concurrency_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("自适应并发"),
+                self.tra("启用此功能后，将以并发任务数为起点，根据接口的响应延迟与限流、超时错误自动增减同时进行的请求数量"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 自适应并发的最小并发数
+    def add_widget_adaptive_concurrency_min(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_range(1, 9999999)
+            widget.set_value(config.get("adaptive_concurrency_min"))
+
+        def value_changed(widget, value: int) -> None:
+            config = self.load_config()
+            config["adaptive_concurrency_min"] = value
+            self.save_config(config)
+
+        parent.addWidget(
+            SpinCard(
+                self.tra("自适应并发下限"),
+                self.tra("自适应并发模式下，同时进行的请求数量的最小值"),
+                init = init,
+                value_changed = value_changed,
+            )
+        )
+
+    # 自适应并发的最大并发数
+    def add_widget_adaptive_concurrency_max(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_range(0, 9999999)
+            widget.set_value(config.get("adaptive_concurrency_max"))
+
+        def value_changed(widget, value: int) -> None:
+            config = self.load_config()
+            config["adaptive_concurrency_max"] = value
+            self.save_config(config)
+
+        parent.addWidget(
+            SpinCard(
+                self.tra("自适应并发上限"),
+                self.tra("自适应并发模式下，同时进行的请求数量的最大值，设置为 0 时为并发任务数的两倍"),
+                init = init,
+                value_changed = value_changed,
+            )
+        )
+
+    # 异步请求模式
+    def add_widget_async_request(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("async_request_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["async_request_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("异步请求模式"),
+                self.tra("启用此功能后，请求任务将在单个事件循环中异步执行，高并发时只占用少量线程与内存（适合本地 vLLM、llama.cpp 等高并发接口）"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 流式请求
+    def add_widget_stream_request(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("stream_request_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["stream_request_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("流式请求"),
+                self.tra("启用此功能后，OpenAI 兼容接口将以流式方式接收回复，并在接收过程中检查译文行号，出现行数错误或重复循环时立即中止请求，节省时间与 Token"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
     # 请求超时时间
     def add_widget_request_timeout(self, parent, config) -> None:
         def init(widget) -> None:
@@ -219,3 +329,21 @@ class TaskSettingsPage(QFrame, Base):
             )
         )
 
+    # 翻译记忆
+    def add_widget_translation_memory(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("translation_memory_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["translation_memory_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("翻译记忆"),
+                self.tra("启用此功能后，将保存已翻译的原文与译文，相同配置下再次遇到相同原文时直接复用译文，同一任务中的重复原文也只会发送一次"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
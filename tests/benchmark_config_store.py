@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rapidjson as json
+
+from Base.ConfigStore import ConfigStore
+
+
+CONFIG_FILE_LOCK = threading.Lock()
+
+
+def load_config_from_file(path: str) -> dict:
+    """原有方式：每次读取都加锁并重新解析配置文件"""
+    with CONFIG_FILE_LOCK:
+        with open(path, "r", encoding = "utf-8") as reader:
+            return json.load(reader)
+
+
+def build_config() -> dict:
+    """生成测试用配置，包含较大的术语表与翻译示例"""
+    return {
+        "proxy_enable": False,
+        "proxy_url": "",
+        "cache_storage_sqlite_switch": True,
+        "label_output_path": "./output",
+        "prompt_dictionary_data": [{"src": f"用語{i}", "dst": f"术语{i}", "info": ""} for i in range(2000)],
+        "translation_example_data": [{"src": f"例文{i}", "dst": f"示例{i}"} for i in range(200)],
+    }
+
+
+def benchmark_config_store(read_count: int = 500):
+    print("=== 配置读取基准测试 ===\n")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "config.json")
+        with open(path, "w", encoding = "utf-8") as writer:
+            writer.write(json.dumps(build_config(), indent = 4, ensure_ascii = False))
+        print(f"配置文件大小: {os.path.getsize(path) / 1024:.1f} KB, 读取次数: {read_count}")
+
+        start = time.perf_counter()
+        expected = [load_config_from_file(path).get("cache_storage_sqlite_switch") for _ in range(read_count)]
+        file_cost = time.perf_counter() - start
+
+        store = ConfigStore.get(path)
+        start = time.perf_counter()
+        actual = [store.get_snapshot().get("cache_storage_sqlite_switch") for _ in range(read_count)]
+        snapshot_cost = time.perf_counter() - start
+
+        print(f"每次读取并解析文件: {file_cost * 1000:.1f} ms")
+        print(f"读取内存快照: {snapshot_cost * 1000:.1f} ms")
+        print(f"加速比: {file_cost / max(snapshot_cost, 1e-9):.1f}x")
+
+        # 保存后快照与版本号同步更新
+        version = store.get_version()
+        store.save({"cache_storage_sqlite_switch": False})
+        saved = store.get_snapshot().get("cache_storage_sqlite_switch") is False and store.get_version() == version + 1
+        saved = saved and load_config_from_file(path) == store.load()
+
+    if expected == actual and saved:
+        print("\n[OK] 快照内容与配置文件一致，保存后快照已更新")
+        return True
+    else:
+        print("\n[ERROR] 快照内容与配置文件不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_config_store()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.Cache.CacheItem import TranslationStatus
+from ModuleFolders.FileAccessor.EpubAccessor import EpubAccessor
+from ModuleFolders.FileOutputer.BaseWriter import BilingualOrder
+from ModuleFolders.FileOutputer.EpubWriter import EpubWriter
+from ModuleFolders.FileReader.EpubReader import EpubReader
+
+
+def build_epub(epub_path: Path, chapter_count: int, paragraph_count: int) -> None:
+    """生成测试用 EPUB，每章包含标题与带行内标签的段落"""
+    manifest = []
+    with zipfile.ZipFile(epub_path, 'w') as zipf:
+        zipf.writestr("mimetype", "application/epub+zip")
+        zipf.writestr(
+            "META-INF/container.xml",
+            '<?xml version="1.0"?><container><rootfiles>'
+            '<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+            '</rootfiles></container>'
+        )
+        for c in range(chapter_count):
+            body = "\n".join(
+                f'<div><h2>第{c}章 标题{i}</h2></div>' if i % 20 == 0 else
+                f'<p class="c{i % 3}" id="p{i}">　　第{c}章第{i}段，<span>内容</span>&amp;文本。</p>'
+                for i in range(paragraph_count)
+            )
+            zipf.writestr(
+                f"OEBPS/text/{c}.xhtml",
+                '<?xml version="1.0" encoding="utf-8"?>\n<html xmlns="http://www.w3.org/1999/xhtml">'
+                f'<head><title>{c}</title></head><body>\n{body}\n</body></html>'
+            )
+            manifest.append(f'<item id="c{c}" href="text/{c}.xhtml" media-type="application/xhtml+xml"/>')
+        zipf.writestr("OEBPS/content.opf", f'<?xml version="1.0"?><package><manifest>{"".join(manifest)}</manifest></package>')
+
+
+def benchmark_epub_extract(chapter_count: int = 200, paragraph_count: int = 100):
+    print("=== EPUB 文本提取与写入基准测试 ===\n")
+    reader = EpubReader.__new__(EpubReader)
+    reader.file_accessor = EpubAccessor()
+    writer = EpubWriter.__new__(EpubWriter)
+    writer.file_accessor = EpubAccessor()
+    writer.source_content_cache = None
+    writer.output_config = SimpleNamespace(bilingual_order=BilingualOrder.TRANSLATION_FIRST)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        epub_path = temp_dir / "source.epub"
+        build_epub(epub_path, chapter_count, paragraph_count)
+
+        start = time.perf_counter()
+        cache_file = reader.on_read_source(epub_path, None)
+        read_cost = time.perf_counter() - start
+        print(f"提取 {chapter_count} 章共 {len(cache_file.items)} 条文本: {read_cost * 1000:.1f} ms")
+
+        for item in cache_file.items:
+            item.translated_text = "译" + item.source_text
+            item.translation_status = TranslationStatus.TRANSLATED
+
+        # 按位置拼接译文
+        start = time.perf_counter()
+        writer._write_translation_file(temp_dir / "splice.epub", cache_file, epub_path, writer._rebuild_bilingual_tag)
+        splice_cost = time.perf_counter() - start
+
+        # 旧版本缓存没有位置信息，逐条重新解析标签并替换
+        offsets = [item.extra.pop("html_offsets") for item in cache_file.items]
+        start = time.perf_counter()
+        writer._write_translation_file(temp_dir / "replace.epub", cache_file, epub_path, writer._rebuild_bilingual_tag)
+        replace_cost = time.perf_counter() - start
+        for item, item_offsets in zip(cache_file.items, offsets):
+            item.extra["html_offsets"] = item_offsets
+
+        print(f"逐条解析并替换写入: {replace_cost * 1000:.1f} ms")
+        print(f"按位置拼接写入: {splice_cost * 1000:.1f} ms")
+        print(f"加速比: {replace_cost / max(splice_cost, 1e-9):.1f}x")
+
+        with zipfile.ZipFile(temp_dir / "splice.epub") as splice, zipfile.ZipFile(temp_dir / "replace.epub") as replace:
+            valid = (
+                len(cache_file.items) == chapter_count * paragraph_count
+                and all(splice.read(name) == replace.read(name) for name in replace.namelist())
+            )
+
+    if valid:
+        print("\n[OK] 提取条目数正确，两种写入方式输出一致")
+        return True
+    else:
+        print("\n[ERROR] 提取或写入结果与预期不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_epub_extract()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtCore import QCoreApplication
+
+from Base.Base import Base
+from Base.EventManager import EventManager
+
+
+def benchmark_event_bus(object_count: int = 50000, update_count: int = 100000):
+    print("=== 事件总线基准测试 ===\n")
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    print(f"创建对象数: {object_count}, 进度更新事件数: {update_count}")
+
+    # 原有方式：每个对象创建时都会新建一个事件管理器
+    start = time.perf_counter()
+    managers = []
+    for _ in range(object_count):
+        managers.append((Base(), EventManager()))
+    per_object_cost = time.perf_counter() - start
+    del managers
+
+    start = time.perf_counter()
+    objects = [Base() for _ in range(object_count)]
+    shared_cost = time.perf_counter() - start
+    del objects
+
+    print(f"每个对象新建事件管理器: {per_object_cost * 1000:.1f} ms")
+    print(f"共享事件管理器: {shared_cost * 1000:.1f} ms")
+
+    # 子线程中连续触发进度更新事件，界面订阅者只收到合并后的数据
+    received = []
+    base = Base()
+    base.subscribe(Base.EVENT.TASK_UPDATE, lambda event, data: received.append(data))
+
+    def target() -> None:
+        for i in range(update_count):
+            base.emit(Base.EVENT.TASK_UPDATE, {"line": i + 1, "total_line": update_count})
+
+    thread = threading.Thread(target = target)
+    thread.start()
+    while thread.is_alive():
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+    print(f"界面实际处理的进度更新次数: {len(received)}")
+
+    if received and received[-1]["line"] == update_count and len(received) < update_count:
+        print("\n[OK] 进度更新已合并，界面收到最新的进度")
+        return True
+    else:
+        print("\n[ERROR] 进度更新未按预期合并")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_event_bus()
+    sys.exit(0 if success else 1)
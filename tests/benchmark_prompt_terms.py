@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import random
+import time
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.PromptBuilder.PromptTermMatcher import PromptTermMatcher
+
+
+CHARS = "アイウエオカキクケコサシスセソ魔法剣士村人勇者ABCDabcd"
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(CHARS) for _ in range(length))
+
+
+def build_config(rng: random.Random, glossary_count: int, marker_count: int, character_count: int) -> SimpleNamespace:
+    """生成测试用配置，包含术语表、禁翻表与角色设定"""
+    return SimpleNamespace(
+        prompt_dictionary_data=[{"src": random_text(rng, rng.randint(2, 4)), "dst": "译", "info": ""} for _ in range(glossary_count)],
+        exclusion_list_data=[{"markers": random_text(rng, 3), "regex": "", "info": ""} for _ in range(marker_count)],
+        characterization_data=[{"original_name": random_text(rng, 3)} for _ in range(character_count)],
+    )
+
+
+def match_by_loop(config: SimpleNamespace, lines: list[str]) -> tuple:
+    """原有方式：逐条术语遍历每一行原文"""
+    glossary = [
+        v for v in config.prompt_dictionary_data
+        if any(v["src"].lower() in line.lower() for line in lines)
+    ]
+    # 重复的标记符与角色名只保留一个
+    markers = list(dict.fromkeys(
+        v["markers"] for v in config.exclusion_list_data
+        if any(v["markers"] in line for line in lines)
+    ))
+    characters = list(dict.fromkeys(
+        v["original_name"] for v in config.characterization_data
+        if any(v["original_name"] in line for line in lines)
+    ))
+    return glossary, markers, characters
+
+
+def match_by_automaton(config: SimpleNamespace, lines: list[str]) -> tuple:
+    matcher = PromptTermMatcher.get(config)
+    glossary = matcher.match_glossary(lines)
+    markers = list(matcher.match_exclusions(lines).keys())
+    characters = list(matcher.match_characters(lines).keys())
+    return glossary, markers, characters
+
+
+def benchmark_prompt_terms(glossary_count: int = 5000, marker_count: int = 500, character_count: int = 500, task_count: int = 100):
+    print("=== 提示词术语匹配基准测试 ===\n")
+    rng = random.Random(0)
+    config = build_config(rng, glossary_count, marker_count, character_count)
+    tasks = [[random_text(rng, rng.randint(10, 60)) for _ in range(20)] for _ in range(task_count)]
+    print(f"术语表: {glossary_count} 条, 禁翻表: {marker_count} 条, 角色: {character_count} 个, 模拟任务数: {task_count}")
+
+    start = time.perf_counter()
+    expected = [match_by_loop(config, lines) for lines in tasks]
+    loop_cost = (time.perf_counter() - start) / task_count
+
+    # 包含首次构建自动机的耗时
+    start = time.perf_counter()
+    actual = [match_by_automaton(config, lines) for lines in tasks]
+    automaton_cost = (time.perf_counter() - start) / task_count
+
+    print(f"逐条遍历匹配: {loop_cost * 1000:.3f} ms/任务")
+    print(f"多模式自动机匹配: {automaton_cost * 1000:.3f} ms/任务")
+    print(f"加速比: {loop_cost / max(automaton_cost, 1e-9):.1f}x")
+
+    if expected == actual:
+        print("\n[OK] 两种方式匹配到的条目一致")
+        return True
+    else:
+        print("\n[ERROR] 匹配结果不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_prompt_terms()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem
+from ModuleFolders.Cache.CacheManager import CacheManager
+from ModuleFolders.Cache.CacheProject import CacheProject
+
+
+WORDS = ["魔法", "剣", "スライム", "勇者", "村", "の", "を", "に", "城", "王様", "Lv", "HP", "回復", "アイテム", "宝箱"]
+FIELDS = ["source_text", "translated_text", "polished_text"]
+
+
+def build_project(file_count: int, item_count: int) -> CacheProject:
+    """生成测试用项目，原文与译文由常见词随机组合"""
+    rng = random.Random(0)
+    project = CacheProject()
+    for f in range(file_count):
+        file = CacheFile(storage_path=f"{f}.json")
+        file.items = [
+            CacheItem(
+                text_index=f * item_count + i,
+                source_text="".join(rng.choice(WORDS) for _ in range(rng.randint(2, 12))),
+                translated_text="".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))),
+            )
+            for i in range(item_count)
+        ]
+        project.add_file(file)
+    return project
+
+
+def search_by_scan(project: CacheProject, query: str) -> list:
+    """原有方式：逐条检查每个条目的每个字段"""
+    results = []
+    for file_path, cache_file in project.files.items():
+        for item_index, item in enumerate(cache_file.items):
+            for field_name in FIELDS:
+                text_to_check = getattr(item, field_name, None)
+                if text_to_check and query in text_to_check:
+                    results.append((file_path, item_index + 1, item))
+                    break
+    return results
+
+
+def benchmark_search_index(file_count: int = 10, item_count: int = 20000):
+    print("=== 缓存全文搜索基准测试 ===\n")
+    project = build_project(file_count, item_count)
+    queries = ["王様の宝箱", "スライムを回復", "Lv城", "勇者に魔法剣"]
+    print(f"条目数: {file_count * item_count}, 查询数: {len(queries)}")
+
+    start = time.perf_counter()
+    expected = [search_by_scan(project, query) for query in queries]
+    scan_cost = time.perf_counter() - start
+
+    cache_manager = CacheManager()
+    cache_manager.project = project
+    start = time.perf_counter()
+    cache_manager.search_index.build(project)
+    build_cost = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [cache_manager.search_items(query, "all", False, False) for query in queries]
+    index_cost = time.perf_counter() - start
+
+    # 修改部分译文后，索引增量更新
+    changed = []
+    for i, item in enumerate(project.items_iter()):
+        if i % 100 == 0:
+            item.translated_text = "王様の宝箱を開けた"
+            changed.append(item)
+    cache_manager.record_item_changes(changed)
+    expected.append(search_by_scan(project, "王様の宝箱"))
+    actual.append(cache_manager.search_items("王様の宝箱", "all", False, False))
+
+    print(f"逐条检查: {scan_cost * 1000:.1f} ms")
+    print(f"建立索引（后台一次）: {build_cost * 1000:.1f} ms")
+    print(f"使用索引: {index_cost * 1000:.1f} ms")
+    print(f"加速比: {scan_cost / max(index_cost, 1e-9):.1f}x")
+
+    if expected == actual:
+        print("\n[OK] 两种方式搜索结果一致")
+        return True
+    else:
+        print("\n[ERROR] 搜索结果不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_search_index()
+    sys.exit(0 if success else 1)
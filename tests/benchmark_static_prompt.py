@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from ModuleFolders.PromptBuilder.PromptBuilder import PromptBuilder
+from ModuleFolders.PromptBuilder.PromptBuilderEnum import PromptBuilderEnum
+from ModuleFolders.RequestLimiter.RequestLimiter import RequestLimiter
+
+
+def build_config(example_count: int) -> SimpleNamespace:
+    """生成测试用配置，开启背景设定、翻译风格与翻译示例"""
+    return SimpleNamespace(
+        target_language="chinese_simplified",
+        translation_prompt_selection={"last_selected_id": PromptBuilderEnum.COMMON, "prompt_content": ""},
+        prompt_dictionary_switch=True,
+        prompt_dictionary_data=[{"src": f"魔法{i}", "dst": f"magic{i}", "info": ""} for i in range(50)],
+        exclusion_list_switch=False,
+        exclusion_list_data=[],
+        characterization_switch=False,
+        characterization_data=[],
+        world_building_switch=True,
+        world_building_content="剑与魔法的异世界，" * 200,
+        writing_style_switch=True,
+        writing_style_content="轻小说风格，对话简洁自然。" * 50,
+        translation_example_switch=True,
+        translation_example_data=[{"src": f"原文示例{i}" * 5, "dst": f"译文示例{i}" * 5} for i in range(example_count)],
+        few_shot_and_example_switch=False,
+        pre_line_counts=0,
+    )
+
+
+def benchmark_static_prompt(example_count: int = 50, task_count: int = 500):
+    print("=== 静态提示词缓存基准测试 ===\n")
+
+    # 提示词模板使用相对路径读取
+    os.chdir(ROOT_DIR)
+    config = build_config(example_count)
+    limiter = RequestLimiter()
+    tasks = [{str(j): f"第{i}段第{j}行，魔法{j}的文本。" for j in range(20)} for i in range(task_count)]
+    print(f"翻译示例: {example_count} 条, 模拟任务数: {task_count}")
+
+    # 每个任务都重新构建静态部分并计算完整系统提示词的 Token（原有方式）
+    start = time.perf_counter()
+    expected = []
+    for source_text_dict in tasks:
+        PromptBuilder._static_prompt_cache.clear()
+        messages, system, _ = PromptBuilder.generate_prompt(config, source_text_dict, [], "ja")
+        expected.append((messages, system, limiter.calculate_tokens(messages, system)))
+    rebuild_cost = (time.perf_counter() - start) / task_count
+
+    # 复用静态部分与其 Token 数量
+    PromptBuilder._static_prompt_cache.clear()
+    start = time.perf_counter()
+    actual = []
+    for source_text_dict in tasks:
+        messages, system, _ = PromptBuilder.generate_prompt(config, source_text_dict, [], "ja")
+        system_tokens = PromptBuilder.count_system_tokens(config, "ja", system)
+        actual.append((messages, system, limiter.calculate_tokens(messages, system, system_tokens)))
+    cached_cost = (time.perf_counter() - start) / task_count
+
+    print(f"每任务重新构建: {rebuild_cost * 1000:.3f} ms/任务")
+    print(f"复用静态部分: {cached_cost * 1000:.3f} ms/任务")
+    print(f"加速比: {rebuild_cost / max(cached_cost, 1e-9):.1f}x")
+
+    # 分段计算的 Token 数量只在段落边界处可能与整体计算有少量差异
+    same_prompts = all(e[:2] == a[:2] for e, a in zip(expected, actual))
+    max_diff = max(abs(e[2] - a[2]) for e, a in zip(expected, actual))
+    print(f"Token 预估最大差异: {max_diff}")
+
+    # 配置变化后应重新构建
+    config.writing_style_content = "严肃的文学风格。"
+    _, changed_system, _ = PromptBuilder.generate_prompt(config, tasks[0], [], "ja")
+
+    if same_prompts and max_diff <= 2 and "严肃的文学风格。" in changed_system:
+        print("\n[OK] 复用静态部分生成的提示词一致，配置变化时已重新构建")
+        return True
+    else:
+        print("\n[ERROR] 复用静态部分生成的提示词与预期不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_static_prompt()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.Cache.CacheProject import CacheProject
+
+
+def build_project(file_count: int, items_per_file: int) -> CacheProject:
+    """生成测试用项目，状态按 未翻译/已翻译/已排除 交替分布"""
+    statuses = (TranslationStatus.UNTRANSLATED, TranslationStatus.TRANSLATED, TranslationStatus.EXCLUDED)
+    project = CacheProject()
+    text_index = 0
+    for file_index in range(file_count):
+        items = []
+        for i in range(items_per_file):
+            items.append(CacheItem(text_index=text_index, translation_status=statuses[i % 3], source_text=f"line {i}"))
+            text_index += 1
+        project.add_file(CacheFile(storage_path=f"file_{file_index}.txt", items=items))
+    return project
+
+
+def full_scan_count(project: CacheProject, status: int) -> int:
+    """原有的完整遍历计数方式"""
+    return sum(1 for item in project.items_iter() if item.translation_status == status)
+
+
+def benchmark_status_counts(file_count: int = 200, items_per_file: int = 2000, repeat: int = 20):
+    print("=== 条目状态计数基准测试 ===\n")
+    project = build_project(file_count, items_per_file)
+    print(f"项目规模: {file_count} 个文件, 共 {project.count_items()} 条")
+
+    # 首次查询会建立计数
+    start = time.perf_counter()
+    project.count_items(TranslationStatus.UNTRANSLATED)
+    print(f"建立状态计数: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        expected = full_scan_count(project, TranslationStatus.UNTRANSLATED)
+    scan_cost = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        counted = project.count_items(TranslationStatus.UNTRANSLATED)
+    count_cost = (time.perf_counter() - start) / repeat
+
+    print(f"完整遍历计数: {scan_cost * 1000:.3f} ms/次")
+    print(f"状态计数查询: {count_cost * 1000:.3f} ms/次")
+    print(f"加速比: {scan_cost / max(count_cost, 1e-9):.1f}x")
+
+    # 模拟任务写回后再次校验
+    for item in project.files["file_0.txt"].items[:500]:
+        with item.atomic_scope():
+            item.translation_status = TranslationStatus.TRANSLATED
+
+    start = time.perf_counter()
+    mismatched = project.check_status_counts()
+    print(f"一致性校验: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    if counted == expected and not mismatched \
+            and project.count_items(TranslationStatus.TRANSLATED) == full_scan_count(project, TranslationStatus.TRANSLATED):
+        print("\n[OK] 状态计数与完整遍历结果一致")
+        return True
+    else:
+        print(f"\n[ERROR] 状态计数不一致: {mismatched}")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_status_counts()
+    sys.exit(0 if success else 1)
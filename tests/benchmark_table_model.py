@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from ModuleFolders.Cache.CacheItem import CacheItem
+from UserInterface.EditView.CacheItemTableModel import CacheItemTableModel
+from UserInterface.EditView.CacheItemTableView import CacheItemTableView
+
+
+COLUMNS = [
+    CacheItemTableModel.COLUMN_ROW,
+    CacheItemTableModel.COLUMN_SOURCE,
+    CacheItemTableModel.COLUMN_TRANS,
+    CacheItemTableModel.COLUMN_POLISH,
+]
+
+
+def populate_table_widget(table: QTableWidget, items: list[CacheItem]) -> None:
+    """原有方式：为每一行创建四个表格项"""
+    table.setRowCount(len(items))
+    for row_idx, item_data in enumerate(items):
+        num_item = QTableWidgetItem(str(row_idx + 1))
+        num_item.setData(Qt.UserRole, item_data.text_index)
+        table.setItem(row_idx, 0, num_item)
+        table.setItem(row_idx, 1, QTableWidgetItem(item_data.source_text))
+        table.setItem(row_idx, 2, QTableWidgetItem(item_data.translated_text))
+        table.setItem(row_idx, 3, QTableWidgetItem(item_data.polished_text or ''))
+
+
+def update_table_widget(table: QTableWidget, updated_items: dict[int, str]) -> None:
+    """原有方式：每次更新都遍历所有行建立文本索引到行的映射"""
+    index_to_row_map = {
+        table.item(row, 0).data(Qt.UserRole): row
+        for row in range(table.rowCount()) if table.item(row, 0)
+    }
+    for text_index, new_text in updated_items.items():
+        if text_index in index_to_row_map:
+            table.setItem(index_to_row_map[text_index], 2, QTableWidgetItem(new_text))
+
+
+def benchmark_table_model(item_count: int = 100000, update_count: int = 20):
+    print("=== 编辑页表格基准测试 ===\n")
+    app = QApplication.instance() or QApplication(sys.argv)
+    items = [CacheItem(text_index = i, source_text = f"第{i}行的原文テキスト", translated_text = f"第{i}行的译文") for i in range(item_count)]
+    updates = [{i * 997 % item_count: f"更新{i}-{j}" for j in range(i, i + 50)} for i in range(update_count)]
+    print(f"条目数: {item_count}, 批量更新次数: {update_count}")
+
+    table = QTableWidget(0, len(COLUMNS))
+    start = time.perf_counter()
+    populate_table_widget(table, items)
+    widget_open_cost = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for updated_items in updates:
+        update_table_widget(table, updated_items)
+    widget_update_cost = time.perf_counter() - start
+
+    view = CacheItemTableView()
+    model = CacheItemTableModel(COLUMNS, ["行", "原文", "译文", "润文"], set(COLUMNS[1:]))
+    view.setModel(model)
+    start = time.perf_counter()
+    model.set_file("a.txt", items)
+    model_open_cost = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for updated_items in updates:
+        rows = []
+        for text_index, new_text in updated_items.items():
+            row = model.find_row("a.txt", text_index)
+            items[row].translated_text = new_text
+            rows.append(row)
+        model.notify_rows_changed(rows)
+    model_update_cost = time.perf_counter() - start
+
+    print(f"逐行创建表格项: 打开 {widget_open_cost * 1000:.1f} ms, 批量更新 {widget_update_cost * 1000:.1f} ms")
+    print(f"表格模型直接读取条目: 打开 {model_open_cost * 1000:.1f} ms, 批量更新 {model_update_cost * 1000:.1f} ms")
+
+    consistent = all(
+        model.data(model.index(row, column)) == (table.item(row, column).text() if table.item(row, column) else "")
+        for row in range(0, item_count, max(1, item_count // 1000))
+        for column in range(len(COLUMNS))
+    )
+
+    if consistent:
+        print("\n[OK] 两种方式显示的内容一致")
+        return True
+    else:
+        print("\n[ERROR] 显示内容不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_table_model()
+    sys.exit(0 if success else 1)
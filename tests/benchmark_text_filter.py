@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import io
+import random
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from types import SimpleNamespace
+
+from tqdm import tqdm
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Base.PluginManager import PluginManager
+from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.Cache.CacheProject import CacheProject, ProjectType
+from ModuleFolders.TaskExecutor import TranslatorUtil
+from PluginScripts.GeneralTextFilter.GeneralTextFilter import GeneralTextFilter
+from PluginScripts.LanguageFilter.LanguageFilter import LanguageFilter
+from PluginScripts.SpecialTextFilter.SpecialTextFilter import SpecialTextFilter
+
+
+TEXTS = ["こんにちは、世界。", "Hello world", "12345", "", "！？", "BGM/battle", "icon.png", "魔法の剣を手に入れた！", "ｱｲﾃﾑ", "Lv.10 スライム"]
+
+
+def build_project(file_count: int, item_count: int) -> CacheProject:
+    """生成测试用项目，与 MTool 导出的文本结构相同"""
+    rng = random.Random(0)
+    project = CacheProject()
+    for f in range(file_count):
+        file = CacheFile(storage_path=f"{f}.json", file_project_type=ProjectType.MTOOL, language_stats=[("ja", item_count, 0.9)])
+        file.items = [
+            CacheItem(text_index=i, source_text=rng.choice(TEXTS), lang_code=("ja", 0.99, []))
+            for i in range(item_count)
+        ]
+        project.add_file(file)
+    return project
+
+
+class BaselineGeneralTextFilter(GeneralTextFilter):
+    """原有实现：通过 on_event 单独遍历项目，逐项判断过滤条件"""
+
+    def on_event(self, event_name, config, event_data: CacheProject):
+        if event_name == "text_filter":
+            self.filter_text(event_data)
+
+    def filter_text(self, event_data: CacheProject):
+        for entry in event_data.items_iter():
+            source_text = entry.source_text
+            if isinstance(source_text, (int, float)):
+                entry.source_text = str(source_text)
+                entry.translation_status = TranslationStatus.EXCLUDED
+                continue
+            if (isinstance(source_text, str) and source_text.isdigit()):
+                entry.translation_status = TranslationStatus.EXCLUDED
+                continue
+            if source_text is None or source_text.strip() == "":
+                entry.translation_status = TranslationStatus.EXCLUDED
+                continue
+            if source_text.strip() in ("\n", "\\n", "\r", "\\r"):
+                entry.translation_status = TranslationStatus.EXCLUDED
+                continue
+            if isinstance(source_text, str) and self.is_punctuation_string(source_text):
+                entry.translation_status = TranslationStatus.EXCLUDED
+                continue
+            if isinstance(source_text, str) and self._get_file_suffix(source_text.rstrip()) in self.EXCLUDE_FILE_SUFFIX:
+                entry.translation_status = TranslationStatus.EXCLUDED
+                continue
+            if isinstance(source_text, str) and any(source_text.startswith(ext) for ext in self.EXCLUDE_PREFIX):
+                entry.translation_status = TranslationStatus.EXCLUDED
+                continue
+
+    # 原有实现每次调用都重新构建标点符号集合
+    def is_punctuation_string(self, s: str) -> bool:
+        punctuation = set(self.PUNCTUATION)
+        return all(char in punctuation for char in s)
+
+
+class BaselineLanguageFilter(LanguageFilter):
+    """原有实现：通过 on_event 单独遍历项目，逐字符判断文字种类，基准测试只使用指定语言模式"""
+
+    def on_event(self, event: str, config, data: CacheProject) -> None:
+        if event == "text_filter":
+            print("[LanguageFilter] 开始执行预处理 ...")
+            target = []
+            for path, file in data.files.items():
+                target.extend(self._filter_normal_language_items(file, file.items, config.source_language))
+            for item in tqdm(target):
+                item.translation_status = TranslationStatus.EXCLUDED
+            print(f"[LanguageFilter] 语言过滤已完成，共过滤 {len(target)} 个不包含目标语言的条目 ...")
+
+    def has_any_cjk(self, text: str) -> bool:
+        return any(self.is_cjk(char) for char in text)
+
+    def has_any_latin(self, text: str) -> bool:
+        return any(self.is_latin(char) for char in text)
+
+    def has_any_korean(self, text: str) -> bool:
+        return any(self.is_korean(char) for char in text)
+
+    def has_any_russian(self, text: str) -> bool:
+        return any(self.is_russian(char) for char in text)
+
+    def has_any_japanese(self, text: str) -> bool:
+        return any(self.is_japanese(char) for char in text)
+
+    def _filter_normal_language_items(self, file, file_items, language):
+        main_source_lang = TranslatorUtil.map_language_name_to_code(language)
+        if main_source_lang == 'zh-Hant':
+            main_source_lang = 'zh'
+        has_any = self.get_filter_function(main_source_lang, file.file_name)
+
+        lc_languages = set()
+        if file.lc_language_stats:
+            lc_languages = {lang for lang, _, _ in file.lc_language_stats}
+
+        filtered_items = []
+        for item in file_items:
+            if item.translation_status == TranslationStatus.EXCLUDED:
+                filtered_items.append(item)
+                continue
+            if not isinstance(item.source_text, str):
+                filtered_items.append(item)
+                continue
+
+            lang_info = item.get_lang_code(default_lang=main_source_lang)
+            detected_lang, confidence = lang_info[0], lang_info[1]
+            other_langs = lang_info[2] if len(lang_info) > 2 else []
+            not_filter_for_lc = (
+                    detected_lang != main_source_lang and
+                    detected_lang in lc_languages and
+                    main_source_lang in other_langs
+            )
+            if not_filter_for_lc:
+                continue
+
+            if has_any is not None:
+                if not has_any(item.source_text) or (detected_lang != main_source_lang and confidence > 0.92):
+                    filtered_items.append(item)
+            else:
+                if detected_lang != main_source_lang and confidence > 0.92:
+                    filtered_items.append(item)
+        return filtered_items
+
+
+class BaselineSpecialTextFilter(SpecialTextFilter):
+    """原有实现：通过 on_event 单独遍历项目中的 MD 条目"""
+
+    def on_event(self, event_name, config, event_data: CacheProject):
+        if event_name == "text_filter" and ProjectType.MD in event_data.file_project_types:
+            for entry in event_data.items_iter(ProjectType.MD):
+                if any(regex.match(entry.source_text) for regex in self.MD_EXCLUDE_REGEXS):
+                    entry.translation_status = TranslationStatus.EXCLUDED
+
+
+def filter_by_separate_passes(config: SimpleNamespace, project: CacheProject) -> None:
+    """原有方式：按优先级依次触发各插件的 on_event，每个插件各自完整遍历一次项目"""
+    manager = PluginManager()
+    for plugin_class in (BaselineGeneralTextFilter, BaselineLanguageFilter, BaselineSpecialTextFilter):
+        manager.load_plugin(plugin_class)
+    for plugin in manager.get_sorted_plugins("text_filter"):
+        plugin.on_event("text_filter", config, project)
+
+
+def benchmark_text_filter(file_count: int = 10, item_count: int = 50000):
+    print("=== 文本预过滤插件基准测试 ===\n")
+    config = SimpleNamespace(source_language="japanese", target_language="chinese_simplified")
+    manager = PluginManager()
+    for plugin_class in (GeneralTextFilter, LanguageFilter, SpecialTextFilter):
+        manager.load_plugin(plugin_class)
+    print(f"文件数: {file_count}, 总条目数: {file_count * item_count}")
+
+    separate = build_project(file_count, item_count)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        filter_by_separate_passes(config, separate)
+    separate_cost = time.perf_counter() - start
+
+    fused = build_project(file_count, item_count)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        manager.broadcast_event("text_filter", config, fused)
+    fused_cost = time.perf_counter() - start
+
+    print(f"原有实现（逐插件遍历并逐字符判断）: {separate_cost * 1000:.1f} ms")
+    print(f"合并为一次遍历并使用预编译字符类: {fused_cost * 1000:.1f} ms")
+    print(f"加速比: {separate_cost / max(fused_cost, 1e-9):.1f}x")
+
+    expected = [item.translation_status for item in separate.items_iter()]
+    actual = [item.translation_status for item in fused.items_iter()]
+    if expected == actual:
+        print("\n[OK] 两种方式过滤结果一致")
+        return True
+    else:
+        print("\n[ERROR] 过滤结果不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_text_filter()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from ModuleFolders.TextProcessor.TextProcessor import TextProcessor
+
+
+def build_config(exclusion_count: int, rule_count: int) -> SimpleNamespace:
+    """生成测试用配置，包含禁翻表与文本前后替换规则"""
+    exclusion_list_data = []
+    for i in range(exclusion_count):
+        if i % 2:
+            exclusion_list_data.append({"markers": f"<tag_{i}>", "info": "", "regex": ""})
+        else:
+            exclusion_list_data.append({"markers": "", "info": "", "regex": rf"\[code_{i}\]\w*"})
+
+    pre_translation_data = [{"src": f"src_{i}", "dst": f"dst_{i}", "regex": rf"pre_{i}\d+"} for i in range(rule_count)]
+    post_translation_data = [{"src": f"dst_{i}", "dst": f"src_{i}", "regex": ""} for i in range(rule_count)]
+
+    return SimpleNamespace(
+        exclusion_list_data=exclusion_list_data,
+        pre_translation_data=pre_translation_data,
+        post_translation_data=post_translation_data,
+    )
+
+
+def benchmark_text_processor(exclusion_count: int = 500, rule_count: int = 200, task_count: int = 200):
+    print("=== 文本处理器规则编译基准测试 ===\n")
+
+    # 正则库使用相对路径读取
+    os.chdir(ROOT_DIR)
+    config = build_config(exclusion_count, rule_count)
+    print(f"禁翻表: {exclusion_count} 条, 替换规则: {rule_count} 条, 模拟任务数: {task_count}")
+
+    # 每个任务都重新编译（原有方式）
+    start = time.perf_counter()
+    for _ in range(task_count):
+        TextProcessor.clear_compiled_rule_set()
+        uncached = TextProcessor(config)
+    rebuild_cost = (time.perf_counter() - start) / task_count
+
+    # 共享预编译规则
+    TextProcessor.clear_compiled_rule_set()
+    start = time.perf_counter()
+    for _ in range(task_count):
+        cached = TextProcessor(config)
+    cached_cost = (time.perf_counter() - start) / task_count
+
+    print(f"每任务重新编译: {rebuild_cost * 1000:.3f} ms/任务")
+    print(f"共享预编译规则: {cached_cost * 1000:.3f} ms/任务")
+    print(f"加速比: {rebuild_cost / max(cached_cost, 1e-9):.1f}x")
+
+    # 配置变化后应重新编译
+    changed_config = build_config(exclusion_count + 1, rule_count)
+    changed = TextProcessor(changed_config)
+
+    same_patterns = [p.pattern for p in uncached.auto_compiled_patterns] == [p.pattern for p in cached.auto_compiled_patterns]
+    if same_patterns and len(changed.auto_compiled_patterns) == len(cached.auto_compiled_patterns) + 1:
+        print("\n[OK] 共享规则与重新编译结果一致，配置变化时已重新编译")
+        return True
+    else:
+        print("\n[ERROR] 共享规则与重新编译结果不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_text_processor()
+    sys.exit(0 if success else 1)
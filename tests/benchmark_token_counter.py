@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tiktoken
+
+from ModuleFolders.RequestLimiter import TokenCounter
+from ModuleFolders.RequestLimiter.RequestLimiter import RequestLimiter
+
+
+def calculate_tokens_per_call(messages: list[dict], system: str) -> int:
+    """原有方式：每次调用都重新获取编码器，逐条编码消息与系统提示词"""
+    encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+    num_tokens = 0
+    for message in messages:
+        num_tokens += 3
+        for key, value in message.items():
+            if isinstance(value, str):
+                num_tokens += len(encoding.encode(value))
+            if key == "name":
+                num_tokens += 1
+    num_tokens += 3
+
+    encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+    return num_tokens + len(encoding.encode(system))
+
+
+def build_tasks(task_count: int, line_count: int) -> tuple[str, list[list[dict]]]:
+    """生成测试用请求，系统提示词与动态示例在各个任务之间相同，原文各不相同"""
+    system = "你是一位专业的翻译，请将日语翻译为中文。\n" * 100
+    example = [
+        {"role": "user", "content": "###这是你接下来的翻译任务，原文文本如下\n<textarea>\n" + "例文テキスト。" * 50 + "\n</textarea>"},
+        {"role": "assistant", "content": "我完全理解了翻译的要求与原则：\n<textarea>\n" + "示例译文。" * 50 + "\n</textarea>"},
+    ]
+    tasks = []
+    for i in range(task_count):
+        source = "\n".join(f"{j}.第{i}段第{j}行のテキスト、魔法と剣の物語。" for j in range(line_count))
+        tasks.append(example + [
+            {"role": "user", "content": f"###这是你接下来的翻译任务，原文文本如下\n<textarea>\n{source}\n</textarea>"},
+            {"role": "assistant", "content": "我完全理解了翻译的要求与原则，我将遵循您的指示进行翻译，以下是对原文的翻译:"},
+        ])
+    return system, tasks
+
+
+def benchmark_token_counter(task_count: int = 500, line_count: int = 30):
+    print("=== Token 预估基准测试 ===\n")
+    system, tasks = build_tasks(task_count, line_count)
+    limiter = RequestLimiter()
+    print(f"模拟任务数: {task_count}, 每任务原文行数: {line_count}")
+
+    start = time.perf_counter()
+    expected = [calculate_tokens_per_call(messages, system) for messages in tasks]
+    per_call_cost = (time.perf_counter() - start) / task_count
+
+    # 共享编码器，重复出现的系统提示词与示例只编码一次
+    start = time.perf_counter()
+    actual = [
+        limiter.calculate_tokens(messages, system, TokenCounter.count_tokens_cached(system))
+        for messages in tasks
+    ]
+    shared_cost = (time.perf_counter() - start) / task_count
+
+    print(f"每次获取编码器并逐条编码: {per_call_cost * 1000:.3f} ms/任务")
+    print(f"共享编码器并缓存重复内容: {shared_cost * 1000:.3f} ms/任务")
+    print(f"加速比: {per_call_cost / max(shared_cost, 1e-9):.1f}x")
+
+    if expected == actual:
+        print("\n[OK] 两种方式预估的 Token 数量一致")
+        return True
+    else:
+        print("\n[ERROR] Token 数量不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_token_counter()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.Cache.CacheManager import CacheManager
+from ModuleFolders.Cache.CacheProject import CacheProject
+from ModuleFolders.Cache.TranslationMemory import TranslationMemory, TranslationMemorySession
+from ModuleFolders.TaskConfig.TaskType import TaskType
+
+
+def build_project(file_count: int, items_per_file: int, unique_count: int) -> CacheProject:
+    """生成测试用项目，原文在 unique_count 条不同的台词中循环，模拟大量重复的菜单与人名"""
+    project = CacheProject()
+    text_index = 0
+    for file_index in range(file_count):
+        items = []
+        for i in range(items_per_file):
+            items.append(CacheItem(text_index=text_index, source_text=f"台词 {(text_index * 7) % unique_count}"))
+            text_index += 1
+        project.add_file(CacheFile(storage_path=f"file_{file_index}.txt", items=items))
+    return project
+
+
+def run_task(cache_manager: CacheManager, session: TranslationMemorySession) -> int:
+    """模拟一次翻译任务，返回实际发送的条目数"""
+    sent = 0
+    session.begin_round()
+    for chunk, _, _ in cache_manager.iter_item_chunks("line", 10, 0, TaskType.TRANSLATION, session.filter_items):
+        for item in chunk:
+            with item.atomic_scope():
+                item.translated_text = "译:" + item.source_text
+                item.translation_status = TranslationStatus.TRANSLATED
+        sent += len(chunk)
+        session.complete(chunk)
+    return sent
+
+
+def benchmark_translation_memory(file_count: int = 50, items_per_file: int = 1000, unique_count: int = 2000):
+    print("=== 翻译记忆基准测试 ===\n")
+    config = SimpleNamespace(target_language="chinese_simplified", model="test-model", source_language="japanese")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        memory = TranslationMemory(os.path.join(temp_dir, "TranslationMemory.db"))
+        cache_manager = CacheManager()
+        cache_manager.project = build_project(file_count, items_per_file, unique_count)
+        total = cache_manager.project.count_items()
+        print(f"项目规模: {file_count} 个文件, 共 {total} 条, 不同原文 {unique_count} 条")
+
+        # 首次翻译：只有重复原文的去重生效
+        session = TranslationMemorySession(memory, config)
+        start = time.perf_counter()
+        sent = run_task(cache_manager, session)
+        first_cost = time.perf_counter() - start
+        stats = session.get_stats()
+        print(f"首次翻译: 发送 {sent} 条, 去重复用 {stats['duplicate_filled']} 条, 耗时 {first_cost * 1000:.1f} ms")
+
+        # 新项目再次翻译：清空内存热数据，验证数据库持久化
+        memory.lru.clear()
+        memory.reset_stats()
+        cache_manager.project = build_project(file_count, items_per_file, unique_count)
+        session = TranslationMemorySession(memory, config)
+        start = time.perf_counter()
+        sent_again = run_task(cache_manager, session)
+        second_cost = time.perf_counter() - start
+        stats = session.get_stats()
+        print(
+            f"再次翻译: 发送 {sent_again} 条, 记忆复用 {stats['memory_filled']} 条, "
+            f"命中率 {stats['hit_rate']:.1%}（内存 {stats['memory_hits']} / 数据库 {stats['db_hits']}）, "
+            f"耗时 {second_cost * 1000:.1f} ms"
+        )
+        print(f"约节省原文 {stats['tokens_saved']} tokens")
+
+        all_filled = all(
+            item.translation_status == TranslationStatus.TRANSLATED and item.translated_text == "译:" + item.source_text
+            for item in cache_manager.project.items_iter()
+        )
+        memory.close()
+
+    if sent == unique_count and sent_again == 0 and all_filled:
+        print("\n[OK] 重复原文只发送一次，译文已分发到全部条目并可从数据库复用")
+        return True
+    else:
+        print("\n[ERROR] 翻译记忆结果不符合预期")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_translation_memory()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.FileAccessor import ZipUtil
+
+
+def build_archive(zip_path: Path, image_count: int, image_size: int) -> None:
+    """生成测试用压缩包，结构与图片较多的 EPUB 相同"""
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        zipf.writestr("META-INF/container.xml", "<container/>")
+        for i in range(image_count):
+            # 一半随机数据一半重复数据，使压缩有实际开销
+            zipf.writestr(f"OEBPS/images/{i}.png", os.urandom(image_size // 2) + b"\0" * (image_size // 2))
+        zipf.writestr("OEBPS/text/chapter.xhtml", "<p>原文</p>")
+
+
+def rebuild_zip_file(src_zip_path: Path, dst_zip_path: Path, content: dict[str, str]) -> None:
+    """原有方式：逐个解压后重新压缩所有条目"""
+    with zipfile.ZipFile(src_zip_path, 'r') as zin, zipfile.ZipFile(dst_zip_path, 'w') as zout:
+        for item in zin.infolist():
+            if item.filename in content:
+                zout.writestr(item, content[item.filename])
+            else:
+                zout.writestr(item, zin.read(item.filename))
+
+
+def benchmark_zip_rewrite(image_count: int = 40, image_size: int = 4 * 1024 * 1024):
+    print("=== 压缩包替换写入基准测试 ===\n")
+    content = {"OEBPS/text/chapter.xhtml": "<p>译文</p>"}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        src_zip_path = temp_dir / "source.epub"
+        build_archive(src_zip_path, image_count, image_size)
+        print(f"压缩包大小: {src_zip_path.stat().st_size / 1024 / 1024:.1f} MB, 图片 {image_count} 张")
+
+        start = time.perf_counter()
+        rebuild_zip_file(src_zip_path, temp_dir / "rebuild.epub", content)
+        rebuild_cost = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ZipUtil.replace_in_zip_file(src_zip_path, temp_dir / "raw_copy.epub", content)
+        raw_copy_cost = time.perf_counter() - start
+
+        print(f"解压后重新压缩: {rebuild_cost * 1000:.1f} ms")
+        print(f"原样复制压缩数据: {raw_copy_cost * 1000:.1f} ms")
+        print(f"加速比: {rebuild_cost / max(raw_copy_cost, 1e-9):.1f}x")
+
+        with zipfile.ZipFile(src_zip_path) as src, zipfile.ZipFile(temp_dir / "raw_copy.epub") as dst:
+            valid = (
+                dst.testzip() is None
+                and dst.namelist() == src.namelist()
+                and dst.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+                and dst.read("OEBPS/text/chapter.xhtml").decode("utf-8") == content["OEBPS/text/chapter.xhtml"]
+                and all(dst.read(name) == src.read(name) for name in src.namelist() if name not in content)
+            )
+
+    if valid:
+        print("\n[OK] 输出压缩包校验通过，未修改的条目与原文件一致")
+        return True
+    else:
+        print("\n[ERROR] 输出压缩包与预期不一致")
+        return False
+
+
+if __name__ == "__main__":
+    success = benchmark_zip_rewrite()
+    sys.exit(0 if success else 1)